@@ -40,14 +40,32 @@ a = Analysis(
         'gui.main_window',
         'gui.worker',
         'gui.alerts',
+        'gui.blocklist_model',
+        'gui.notifications',
+        'gui.results_model',
+        'core.checkpoint',
         'core.config',
         'core.logger',
+        'core.metrics',
+        'core.netwatch',
+        'core.progress',
+        'core.resources',
+        'core.scan_control',
+        'core.scan_service',
         'core.scanner_engine',
+        'core.settings',
+        'core.sysinfo',
+        'core.traffic_sampler',
         'core.utils',
         'scanner.network_discovery',
         'scanner.tcp_scanner',
         'scanner.udp_scanner',
         'scanner.banner_grabber',
+        'protection.executor',
+        'protection.expiry',
+        'protection.policy',
+        'protection.dns_sinkhole',
+        'protection.domain_trie',
         'protection.firewall_manager',
         'protection.hosts_editor',
     ] + hiddenimports_scapy + hiddenimports_pyqt5,
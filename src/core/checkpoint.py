@@ -0,0 +1,90 @@
+# src/core/checkpoint.py
+
+import json
+import os
+import re
+from datetime import datetime
+
+from core import logger
+
+CHECKPOINT_DIR = os.path.join(logger.LOGS_DIR, "checkpoints")
+
+def checkpoint_path(network_range, settings=None):
+    """
+    Returns the checkpoint file used for a given scan target.
+    Scans of the same target with different settings get separate files.
+    """
+    safe_name = re.sub(r"[^0-9A-Za-z.-]+", "_", network_range.strip())
+    if settings is not None:
+        safe_name = f"{safe_name}_{settings.fingerprint()}"
+    return os.path.join(CHECKPOINT_DIR, f"scan_{safe_name}.json")
+
+def save_checkpoint(network_range, pending_hosts, results, settings=None):
+    """
+    Writes the remaining work queue and the partial results to disk.
+
+    Args:
+        network_range (str): The scan target the checkpoint belongs to.
+        pending_hosts (iterable): Host IPs that still have to be scanned.
+        results (dict): Partial results, {ip: {port: banner}}.
+        settings (ScanSettings): The scan's settings; a checkpoint is only
+            resumed by a scan with the same ports and timeouts.
+
+    The file is written to a temporary name and renamed over the old
+    checkpoint, so an interrupted write never leaves a corrupt checkpoint.
+    """
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = checkpoint_path(network_range, settings)
+    tmp_path = f"{path}.tmp"
+    state = {
+        "network_range": network_range,
+        "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "settings": settings.fingerprint() if settings is not None else None,
+        "pending_hosts": sorted(pending_hosts),
+        "results": {ip: {str(port): banner for port, banner in ports.items()}
+                    for ip, ports in results.items()},
+    }
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except IOError as e:
+        print(f"[!] Error: Could not save scan checkpoint. Reason: {e}")
+
+def load_checkpoint(network_range, settings=None):
+    """
+    Loads the checkpoint for a scan target.
+
+    Returns:
+        A dict with 'pending_hosts' (list) and 'results' ({ip: {port: banner}}),
+        or None if there is no usable checkpoint.
+    """
+    path = checkpoint_path(network_range, settings)
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (IOError, ValueError) as e:
+        print(f"[!] Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+    if state.get("network_range") != network_range:
+        return None
+    if settings is not None and state.get("settings") != settings.fingerprint():
+        return None
+    state["results"] = {ip: {int(port): banner for port, banner in ports.items()}
+                        for ip, ports in state.get("results", {}).items()}
+    state["pending_hosts"] = list(state.get("pending_hosts", []))
+    return state
+
+def clear_checkpoint(network_range, settings=None):
+    """Removes the checkpoint once a scan has finished."""
+    try:
+        os.remove(checkpoint_path(network_range, settings))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[!] Could not remove checkpoint: {e}")
@@ -16,6 +16,64 @@ BANNER_TIMEOUT = 2
 # The IP address to redirect blocked domains to.
 HOSTS_REDIRECT_IP = "127.0.0.1"
 
+# Hosts file edited by the website blocker. None uses the system hosts file.
+HOSTS_FILE_PATH = None
+
+# Seconds to wait for another process to finish writing the hosts file.
+HOSTS_LOCK_TIMEOUT = 10
+
+# Longest remoteip list (in characters) put into one firewall rule; larger
+# address sets are split across several rules created in one netsh run.
+FIREWALL_REMOTEIP_MAX_LENGTH = 4000
+
+# Prefix of the names of the firewall rules created by DoormaNet.
+FIREWALL_RULE_PREFIX = "DoormaNet-Block"
+
+# Firewall backend: "netsh", "nftables", or None for the platform default.
+FIREWALL_BACKEND = None
+
+# nftables table (family inet) that holds DoormaNet's sets and chain.
+NFT_TABLE = "doormanet"
+
+# Seconds the protection executor waits after a request for more to batch with it.
+PROTECTION_COALESCE_WINDOW = 0.05
+
+# Seconds per tick of the timer wheel that lifts temporary blocks; a block
+# is lifted within one tick of its expiry time.
+EXPIRY_TICK = 1
+
+# Seconds before retrying the expiry of blocks that could not be lifted.
+EXPIRY_RETRY_DELAY = 60
+
+# Durations offered for temporary blocks: (label, seconds); None is permanent.
+BLOCK_DURATIONS = [
+    ("Permanently", None),
+    ("For 1 hour", 60 * 60),
+    ("For 8 hours", 8 * 60 * 60),
+    ("For 1 day", 24 * 60 * 60),
+    ("For 1 week", 7 * 24 * 60 * 60),
+]
+
+# --- DNS Sinkhole Settings ---
+# Run the local DNS sinkhole (protection/dns_sinkhole.py) alongside the GUI.
+# Point the system resolver at DNS_SINKHOLE_LISTEN to use it.
+DNS_SINKHOLE_ENABLED = False
+DNS_SINKHOLE_LISTEN = ("127.0.0.1", 53)
+
+# Resolver that non-blocked queries are forwarded to.
+DNS_UPSTREAM = ("1.1.1.1", 53)
+
+# Answer blocked names with "redirect" (HOSTS_REDIRECT_IP) or "nxdomain".
+DNS_BLOCK_RESPONSE = "redirect"
+
+# Forwarded answers kept in the LRU cache, and the bounds on their cache TTL.
+DNS_CACHE_SIZE = 10000
+DNS_CACHE_MIN_TTL = 5
+DNS_CACHE_MAX_TTL = 3600
+
+# Seconds to wait for the upstream resolver.
+DNS_UPSTREAM_TIMEOUT = 2.0
+
 # --- Alert Settings ---
 # Dictionary of known high-risk ports and their services.
 CRITICAL_PORTS = {
@@ -26,4 +84,77 @@ CRITICAL_PORTS = {
     143: "IMAP (Unencrypted email receiving)",
     445: "SMB (Direct file sharing, often targeted by ransomware)",
     3389: "RDP (Remote Desktop, common attack vector)"
-}
\ No newline at end of file
+}
+
+# Notifications kept in the Notifications tab; the oldest are dropped beyond this.
+MAX_NOTIFICATIONS = 5000
+
+# --- Response Policy Settings ---
+# Rules applied automatically to scan findings as they stream in. Each rule
+# is a dict with:
+#   "name":     label shown in notifications,
+#   "ports":    ports the rule applies to, as for --ports ("23", "21,23,2323");
+#               omit to match any port,
+#   "banner":   optional regex the service banner must match,
+#   "networks": optional CIDRs the rule is limited to,
+#   "allow":    optional hosts or CIDRs the rule never acts on,
+#   "action":   "block" (firewall block of the host) or "alert",
+#   "ttl":      optional seconds after which a block is lifted.
+# Example: [{"name": "Exposed Telnet", "ports": "23", "action": "block",
+#            "allow": ["192.168.1.1"]}]
+RESPONSE_POLICY = []
+
+# Hosts and networks no rule ever acts on.
+POLICY_ALLOWLIST = []
+
+# Optional JSON file {"rules": [...], "allowlist": [...]} used instead of the two settings above.
+POLICY_FILE = None
+
+# Report what the policy would block without changing the firewall.
+POLICY_DRY_RUN = True
+
+# Seconds between batches of policy blocks sent to the firewall.
+POLICY_FLUSH_INTERVAL = 2
+
+# Most hosts blocked in one batch, and per minute overall.
+POLICY_BATCH_SIZE = 256
+POLICY_MAX_BLOCKS_PER_MINUTE = 2000
+
+# --- Metrics Settings ---
+# Collect scan engine counters, histograms and stage timings.
+# When disabled, the instrumentation reduces to a flag check per call site.
+METRICS_ENABLED = False
+
+# Optional Prometheus textfile-collector path written at the end of each scan.
+METRICS_TEXTFILE = None
+
+# Optional local port for a /metrics HTTP endpoint (e.g. 9464). None disables it.
+METRICS_HTTP_PORT = None
+
+# --- Checkpoint Settings ---
+# Seconds between on-disk checkpoints of a running scan's remaining work.
+CHECKPOINT_INTERVAL = 30
+
+# --- System Info Settings ---
+# Seconds between System Info snapshots taken by the background collector.
+SYSINFO_INTERVAL = 2
+
+# --- Network Monitor Settings ---
+# Seconds without link/address events before the network range is re-read.
+NETWORK_CHANGE_DEBOUNCE = 2.0
+
+# Upper bound on how long a continuous burst of events can delay the re-read.
+NETWORK_CHANGE_MAX_DELAY = 30.0
+
+# Polling interval where rtnetlink events are unavailable (non-Linux systems).
+NETWORK_POLL_INTERVAL = 10
+
+# --- Traffic Sampler Settings ---
+# Seconds between interface counter samples.
+TRAFFIC_SAMPLE_INTERVAL = 1.0
+
+# Samples kept per interface (one hour at 1 Hz).
+TRAFFIC_HISTORY = 3600
+
+# The connection table is costlier to read, so it is sampled every N counter samples.
+CONNECTION_SAMPLE_EVERY = 5
@@ -0,0 +1,384 @@
+# src/core/metrics.py
+
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core import config
+
+# Latency buckets (in seconds) shared by the connect and banner histograms.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+class _NullTimer:
+    """Context manager handed out while metrics are disabled; does nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Observes the elapsed wall time of a `with` block into a histogram."""
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Counter:
+    """A monotonically increasing value."""
+    kind = "counter"
+
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        if self.registry.enabled:
+            with self.registry.lock:
+                self.value += amount
+
+    def state(self):
+        return self.value
+
+    def samples(self):
+        yield self.name, "", self.value
+
+
+class Gauge:
+    """A value that can go up and down (queue depth, in-flight sockets)."""
+    kind = "gauge"
+
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.peak = 0  # Highest value since the process started
+
+    def inc(self, amount=1):
+        if self.registry.enabled:
+            with self.registry.lock:
+                self.value += amount
+                self._update_peaks()
+
+    def dec(self, amount=1):
+        if self.registry.enabled:
+            with self.registry.lock:
+                self.value -= amount
+
+    def set(self, value):
+        if self.registry.enabled:
+            with self.registry.lock:
+                self.value = value
+                self._update_peaks()
+
+    def _update_peaks(self):
+        # Called with the registry lock held
+        if self.value > self.peak:
+            self.peak = self.value
+        for window in self.registry._windows:
+            if self.value > window.peaks.get(self.name, 0):
+                window.peaks[self.name] = self.value
+
+    def state(self):
+        return self.value
+
+    def samples(self):
+        yield self.name, "", self.value
+
+
+class Histogram:
+    """Cumulative bucketed distribution of observed values (Prometheus style)."""
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, buckets=LATENCY_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        if not self.registry.enabled:
+            return
+        with self.registry.lock:
+            self.count += 1
+            self.total += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+
+    def time(self):
+        """Returns a context manager that observes the duration of its block."""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self)
+
+    def state(self):
+        return list(self.bucket_counts), self.count, self.total
+
+    def since(self, state):
+        """Returns a detached histogram of what was observed after state() returned `state`."""
+        delta = Histogram(self.registry, self.name, self.help, self.buckets)
+        if state is None:
+            return delta
+        counts, count, total = state
+        with self.registry.lock:
+            delta.bucket_counts = [now - then for now, then in zip(self.bucket_counts, counts)]
+            delta.count = self.count - count
+            delta.total = self.total - total
+        return delta
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Estimates a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            yield f"{self.name}_bucket", f'{{le="{bound}"}}', cumulative
+        yield f"{self.name}_bucket", '{le="+Inf"}', self.count
+        yield f"{self.name}_sum", "", self.total
+        yield f"{self.name}_count", "", self.count
+
+
+class MetricsRegistry:
+    """
+    Holds the scan engine's counters, gauges, histograms and per-stage wall times.
+
+    Every instrument checks `enabled` before touching its state, so a disabled
+    registry costs a single attribute lookup per call site. Values are
+    cumulative for the life of the process, as Prometheus expects; what one
+    scan did is read from a MetricsWindow opened when it starts.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.stage_seconds = {}
+        self._windows = weakref.WeakSet()  # Open windows, whose gauge peaks are kept up to date
+        self._http_server = None
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text):
+        return self._register(Counter(self, name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(Gauge(self, name, help_text))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(self, name, help_text, buckets))
+
+    @contextmanager
+    def stage(self, name):
+        """Accumulates the wall time spent inside the block under a stage name."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + elapsed
+
+    def window(self):
+        """Opens a MetricsWindow on the values collected from now on."""
+        return MetricsWindow(self)
+
+    def render_prometheus(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for sample_name, labels, value in metric.samples():
+                    lines.append(f"{sample_name}{labels} {value}")
+            lines.append("# HELP doormanet_stage_seconds Wall time spent in each scan stage.")
+            lines.append("# TYPE doormanet_stage_seconds counter")
+            for stage, seconds in self.stage_seconds.items():
+                lines.append(f'doormanet_stage_seconds{{stage="{stage}"}} {seconds:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Writes the metrics to a Prometheus textfile-collector file.
+        The file is replaced atomically so a scraper never reads half a file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp_path, path)
+        except IOError as e:
+            print(f"[!] Error: Could not write metrics file. Reason: {e}")
+
+    def start_http_server(self, port, host="127.0.0.1"):
+        """Serves the metrics on http://host:port/metrics from a daemon thread."""
+        if self._http_server is not None:
+            return self._http_server
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scraper requests out of the scan output
+
+        self._http_server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        thread.start()
+        print(f"[+] Metrics endpoint listening on http://{host}:{port}/metrics")
+        return self._http_server
+
+    def stop_http_server(self):
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+
+class MetricsWindow:
+    """
+    The share of a registry's values collected since the window was opened.
+
+    Counters, histograms and stage times are read as deltas from the values
+    at opening, and gauge peaks are tracked while the window is open, so a
+    scan's summary is never disturbed by the scans before it. The engine's
+    instruments are process-wide: scans running at the same time see each
+    other's probes in their windows.
+    """
+    def __init__(self, registry):
+        self.registry = registry
+        with registry.lock:
+            self._start = {name: metric.state() for name, metric in registry.metrics.items()}
+            self._stages = dict(registry.stage_seconds)
+            self.peaks = {name: metric.value for name, metric in registry.metrics.items()
+                          if metric.kind == "gauge"}
+            registry._windows.add(self)
+
+    def close(self):
+        """Stops tracking gauge peaks; the deltas can still be read."""
+        with self.registry.lock:
+            self.registry._windows.discard(self)
+
+    def count(self, counter):
+        return counter.value - self._start.get(counter.name, 0)
+
+    def histogram(self, histogram):
+        return histogram.since(self._start.get(histogram.name))
+
+    def peak(self, gauge):
+        return self.peaks.get(gauge.name, 0)
+
+    def stage_seconds(self):
+        with self.registry.lock:
+            return {stage: seconds - self._stages.get(stage, 0.0)
+                    for stage, seconds in self.registry.stage_seconds.items()
+                    if seconds > self._stages.get(stage, 0.0)}
+
+    def summary(self):
+        """Returns a short human-readable summary of the window."""
+        connect = self.histogram(CONNECT_LATENCY)
+        banner = self.histogram(BANNER_LATENCY)
+        lines = [
+            "--- Scan Metrics ---",
+            f"Probes sent:     {self.count(PROBES_SENT)} "
+            f"(open {self.count(PORTS_OPEN)}, closed {self.count(PORTS_CLOSED)}, "
+            f"filtered {self.count(PORTS_FILTERED)}, timeouts {self.count(PROBE_TIMEOUTS)}, "
+            f"errors {self.count(PROBE_ERRORS)}, resource backoffs {self.count(RESOURCE_BACKOFFS)})",
+            f"Connect latency: mean {connect.mean() * 1000:.1f} ms, "
+            f"p95 <= {connect.quantile(0.95) * 1000:.0f} ms",
+            f"Banner latency:  mean {banner.mean() * 1000:.1f} ms "
+            f"over {banner.count} grabs",
+            f"Peak queue depth {self.peak(QUEUE_DEPTH)}, peak in-flight sockets {self.peak(IN_FLIGHT)}",
+        ]
+        for stage, seconds in self.stage_seconds().items():
+            lines.append(f"Stage {stage:<10} {seconds:.2f} s")
+        return "\n".join(lines)
+
+
+# --- Engine-wide registry and instruments ---
+REGISTRY = MetricsRegistry(enabled=config.METRICS_ENABLED)
+
+PROBES_SENT = REGISTRY.counter("doormanet_probes_sent_total", "TCP connect probes sent.")
+PORTS_OPEN = REGISTRY.counter("doormanet_ports_open_total", "Probes that found an open port.")
+PORTS_CLOSED = REGISTRY.counter("doormanet_ports_closed_total", "Probes refused by the target.")
+PORTS_FILTERED = REGISTRY.counter("doormanet_ports_filtered_total", "Probes that got no answer.")
+PROBE_TIMEOUTS = REGISTRY.counter("doormanet_probe_timeouts_total", "Probes that hit the TCP timeout.")
+PROBE_ERRORS = REGISTRY.counter("doormanet_probe_errors_total",
+                                "Probes that failed with a socket error (unreachable, local failure).")
+RESOURCE_BACKOFFS = REGISTRY.counter("doormanet_resource_backoffs_total",
+                                     "Times concurrency was reduced after EMFILE/EADDRNOTAVAIL/ENOBUFS.")
+CONNECT_LATENCY = REGISTRY.histogram("doormanet_connect_latency_seconds", "Time taken by a TCP connect probe.")
+BANNER_LATENCY = REGISTRY.histogram("doormanet_banner_latency_seconds", "Time taken to grab a service banner.")
+QUEUE_DEPTH = REGISTRY.gauge("doormanet_queue_depth", "Hosts waiting for a scan worker.")
+IN_FLIGHT = REGISTRY.gauge("doormanet_in_flight_sockets", "Sockets currently open by the scanner.")
+
+
+def enable(enabled=True):
+    """Turns metric collection on or off at runtime."""
+    REGISTRY.enabled = enabled
+
+
+def publish_scan_metrics(window):
+    """Prints the summary of one scan's window and exports the registry where configured."""
+    window.close()
+    if not REGISTRY.enabled:
+        return
+    print("\n" + window.summary())
+    if config.METRICS_TEXTFILE:
+        REGISTRY.write_prometheus(config.METRICS_TEXTFILE)
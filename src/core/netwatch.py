@@ -0,0 +1,167 @@
+# src/core/netwatch.py
+
+import errno
+import select
+import socket
+import struct
+import threading
+import time
+
+from core import config, utils
+
+# rtnetlink multicast groups and message types (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+NETLINK_EVENTS = {RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR}
+
+NLMSG_HEADER = struct.Struct("=LHHLL")  # length, type, flags, sequence, pid
+
+# How long the watcher blocks before re-checking its stop flag.
+WAKE_INTERVAL = 1.0
+
+
+def open_netlink_socket():
+    """
+    Subscribes to link and IPv4 address events.
+
+    Returns:
+        A non-blocking netlink socket, or None where rtnetlink is unavailable.
+    """
+    if not hasattr(socket, "AF_NETLINK"):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+        sock.setblocking(False)
+        return sock
+    except OSError:
+        return None
+
+
+def contains_network_event(data):
+    """Returns True if a netlink datagram carries a link or address change."""
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if msg_type in NETLINK_EVENTS:
+            return True
+        if length < NLMSG_HEADER.size:
+            break
+        offset += (length + 3) & ~3  # Messages are 4-byte aligned
+    return False
+
+
+class NetworkWatcher:
+    """
+    Calls `on_change(network_range)` when the local network range changes.
+
+    On Linux the watcher sleeps on an rtnetlink socket and only re-reads the
+    interfaces after a link or address event; elsewhere it polls every
+    `poll_interval` seconds. Events are debounced: the range is re-read once
+    no event has arrived for `debounce` seconds (or `max_delay` after the
+    first one), so a flapping interface causes one check instead of a burst.
+    """
+    def __init__(self, on_change, debounce=None, max_delay=None, poll_interval=None):
+        self.on_change = on_change
+        self.debounce = debounce if debounce is not None else config.NETWORK_CHANGE_DEBOUNCE
+        self.max_delay = max_delay if max_delay is not None else config.NETWORK_CHANGE_MAX_DELAY
+        self.poll_interval = poll_interval if poll_interval is not None else config.NETWORK_POLL_INTERVAL
+        self.current_network = None
+        self.mode = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def check(self):
+        """Re-reads the network range and reports it if it changed."""
+        network = utils.get_local_network_range()
+        if network and network != self.current_network:
+            self.current_network = network
+            self.on_change(network)
+
+    def _run(self):
+        sock = open_netlink_socket()
+        self.mode = "netlink" if sock is not None else "polling"
+        try:
+            self._safe_check()
+            if sock is not None:
+                self._watch_netlink(sock)
+            else:
+                self._poll()
+        finally:
+            if sock is not None:
+                sock.close()
+
+    def _safe_check(self):
+        try:
+            self.check()
+        except Exception as e:
+            print(f"[!] Error checking network configuration: {e}")
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            self._safe_check()
+
+    def _watch_netlink(self, sock):
+        first_event = None  # When the pending burst of events started
+        last_event = None
+        while not self._stop.is_set():
+            if last_event is None:
+                timeout = WAKE_INTERVAL
+            else:
+                now = time.monotonic()
+                due = min(last_event + self.debounce, first_event + self.max_delay)
+                timeout = max(0.0, min(WAKE_INTERVAL, due - now))
+
+            try:
+                readable, _, _ = select.select([sock], [], [], timeout)
+                changed = bool(readable) and self._drain(sock)
+            except (OSError, ValueError) as e:
+                print(f"[!] Network event socket failed ({e}); falling back to polling")
+                self.mode = "polling"
+                self._poll()
+                return
+
+            if changed:
+                now = time.monotonic()
+                if first_event is None:
+                    first_event = now
+                last_event = now
+
+            if last_event is not None:
+                now = time.monotonic()
+                if now - last_event >= self.debounce or now - first_event >= self.max_delay:
+                    first_event = last_event = None
+                    self._safe_check()
+
+    def _drain(self, sock):
+        """Reads every queued datagram; returns True if any was a network event."""
+        seen = False
+        while True:
+            try:
+                data = sock.recv(65536)
+            except BlockingIOError:
+                return seen
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    return True  # Events were dropped; assume something changed
+                raise
+            if not data:
+                return seen
+            seen = seen or contains_network_event(data)
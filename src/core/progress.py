@@ -0,0 +1,93 @@
+# src/core/progress.py
+
+import threading
+import time
+from collections import deque, namedtuple
+
+# The scan rate is averaged over the probes completed in this many seconds.
+RATE_WINDOW = 10.0
+
+ProgressSnapshot = namedtuple(
+    "ProgressSnapshot", "total completed in_flight rate elapsed eta")
+ProgressSnapshot.__doc__ = """
+Point-in-time view of a scan's progress.
+
+total and completed count probe units (one TCP probe per host and port),
+rate is probes per second over the last RATE_WINDOW seconds, and eta is
+the estimated number of seconds left (None while it cannot be estimated).
+"""
+
+
+def percent_done(snapshot):
+    """Returns the completed share of the scan as a percentage."""
+    if not snapshot.total:
+        return 0.0
+    return min(100.0, 100.0 * snapshot.completed / snapshot.total)
+
+
+def format_duration(seconds):
+    """Formats a number of seconds as m:ss or h:mm:ss."""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ScanProgress:
+    """
+    Thread-safe probe counters for a running scan.
+
+    Scan threads call `probe_started()` and `probe_finished()` around each
+    probe, while a single thread (the engine's poll loop) takes snapshots.
+    The rate is a moving average over the snapshots of the last RATE_WINDOW
+    seconds.
+    """
+    def __init__(self, total, window=RATE_WINDOW):
+        self.total = total
+        self.completed = 0
+        self.in_flight = 0
+        self.window = window
+        self.started_at = time.monotonic()
+        self._samples = deque([(self.started_at, 0)])
+        self._lock = threading.Lock()
+
+    def probe_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def probe_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def skip(self, count):
+        """Counts probe units that will not be run (e.g. a host that failed) as done."""
+        with self._lock:
+            self.completed += count
+
+    def snapshot(self):
+        """Returns a ProgressSnapshot and records a sample for the moving average."""
+        now = time.monotonic()
+        with self._lock:
+            completed = self.completed
+            in_flight = self.in_flight
+
+        samples = self._samples
+        samples.append((now, completed))
+        # Keep one sample older than the window as the start of the average
+        while len(samples) > 2 and now - samples[1][0] >= self.window:
+            samples.popleft()
+        first_time, first_completed = samples[0]
+        span = now - first_time
+        rate = (completed - first_completed) / span if span > 0 else 0.0
+
+        remaining = max(0, self.total - completed)
+        if remaining == 0:
+            eta = 0.0
+        elif rate > 0:
+            eta = remaining / rate
+        else:
+            eta = None
+        return ProgressSnapshot(self.total, completed, in_flight, rate, now - self.started_at, eta)
@@ -0,0 +1,219 @@
+# src/core/resources.py
+
+import errno
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from core import metrics
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+# Socket errors caused by local resource exhaustion rather than by the target.
+# 10024/10049/10055 are the Windows WSAEMFILE/WSAEADDRNOTAVAIL/WSAENOBUFS codes.
+RESOURCE_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS,
+                   10024, 10049, 10055}
+
+# File descriptors kept free for the GUI, log files and the resolver.
+FD_RESERVE = 64
+
+# Ephemeral ports are needed for connects and linger in TIME_WAIT afterwards,
+# so only a share of the free range is handed to the scanner.
+EPHEMERAL_PORT_SHARE = 0.5
+
+# Errors reported by many threads at once count as a single back-off event.
+BACKOFF_COOLDOWN = 0.1
+
+
+class ResourceExhaustedError(OSError):
+    """A probe failed because the local machine ran out of sockets or ports."""
+
+
+def raise_fd_limit():
+    """
+    Raises the soft RLIMIT_NOFILE to the hard limit where the OS allows it.
+
+    Returns:
+        The soft limit now in effect, or None if it cannot be determined.
+    """
+    if resource is None:
+        return None
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        target = hard if hard != resource.RLIM_INFINITY else max(soft, 65536)
+        if soft == resource.RLIM_INFINITY or soft >= target:
+            return soft
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        return target
+    except (ValueError, OSError):
+        try:
+            return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        except (ValueError, OSError):
+            return None
+
+
+def local_port_range():
+    """Returns the (low, high) ephemeral port range, or None if unknown."""
+    try:
+        with open("/proc/sys/net/ipv4/ip_local_port_range", 'r') as f:
+            low, high = f.read().split()
+        return int(low), int(high)
+    except (OSError, ValueError):
+        return None
+
+
+def open_fd_count():
+    """Returns the number of file descriptors this process has open, or None."""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def time_wait_count():
+    """Counts system-wide TCP sockets in TIME_WAIT (Linux), or None if unknown."""
+    total = 0
+    found = False
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table, 'r') as f:
+                next(f, None)  # Skip the header line
+                for line in f:
+                    fields = line.split(None, 4)
+                    if len(fields) > 3 and fields[3] == "06":  # 06 = TIME_WAIT
+                        total += 1
+            found = True
+        except OSError:
+            continue
+    return total if found else None
+
+
+def plan_concurrency(requested):
+    """
+    Sizes the in-flight socket budget from the machine's current limits.
+
+    Args:
+        requested (int): The concurrency asked for by the scan settings.
+
+    Returns:
+        A (limit, report) tuple, where report describes what was measured.
+    """
+    limit = requested
+    report = {"requested": requested}
+
+    fd_limit = raise_fd_limit()
+    open_fds = open_fd_count()
+    report["fd_limit"] = fd_limit
+    report["open_fds"] = open_fds
+    if fd_limit is not None:
+        # A probe holds one descriptor; a banner grab may hold a second one
+        usable = (fd_limit - FD_RESERVE - (open_fds or 0)) // 2
+        limit = min(limit, max(1, usable))
+
+    port_range = local_port_range()
+    time_wait = time_wait_count()
+    report["port_range"] = port_range
+    report["time_wait"] = time_wait
+    if port_range is not None:
+        free_ports = (port_range[1] - port_range[0] + 1) - (time_wait or 0)
+        limit = min(limit, max(1, int(free_ports * EPHEMERAL_PORT_SHARE)))
+
+    report["limit"] = limit
+    return limit, report
+
+
+class ConcurrencyBudget:
+    """
+    Caps the number of sockets the scanner has open at once.
+
+    The limit adapts AIMD-style: it is halved whenever a probe hits a
+    resource error and grows back by one after a full window of successful
+    probes, never exceeding `maximum`.
+    """
+    def __init__(self, limit, maximum=None, minimum=1):
+        self.maximum = maximum or limit
+        self.minimum = minimum
+        self.limit = max(minimum, min(limit, self.maximum))
+        self.in_flight = 0
+        self._successes = 0
+        self._last_backoff = 0.0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def for_scan(cls, requested):
+        """Builds a budget sized from the current fd limit and port range."""
+        limit, report = plan_concurrency(requested)
+        if limit < requested:
+            print(f"[*] Limiting concurrent sockets to {limit} (requested {requested}; "
+                  f"fd limit {report['fd_limit']}, open fds {report['open_fds']}, "
+                  f"port range {report['port_range']}, TIME_WAIT {report['time_wait']})")
+        return cls(limit, maximum=requested)
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, success=True):
+        with self._cond:
+            self.in_flight -= 1
+            if success and self.limit < self.maximum:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self._successes = 0
+                    self.limit += 1
+            self._cond.notify()
+
+    def back_off(self):
+        """Halves the budget after a resource error."""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_backoff < BACKOFF_COOLDOWN:
+                return
+            self._last_backoff = now
+            new_limit = max(self.minimum, self.limit // 2)
+            if new_limit < self.limit:
+                print(f"[!] Socket resources exhausted; reducing concurrency to {new_limit}")
+            self.limit = new_limit
+            self._successes = 0
+        metrics.RESOURCE_BACKOFFS.inc()
+
+    @contextmanager
+    def slot(self):
+        """Holds one unit of the budget for the duration of the block."""
+        self.acquire()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.release(success)
+
+
+def with_backoff(budget, func, *args, retries=6, delay=0.05):
+    """
+    Runs a socket operation inside a budget slot, retrying on resource errors.
+
+    Each ResourceExhaustedError halves the budget and waits with exponential
+    backoff before retrying, so a port is never misreported as closed just
+    because the local machine ran out of sockets.
+
+    Raises:
+        ResourceExhaustedError: If the operation still fails after all retries.
+    """
+    for attempt in range(retries + 1):
+        try:
+            with budget.slot():
+                return func(*args)
+        except ResourceExhaustedError:
+            if attempt == retries:
+                raise
+            budget.back_off()
+            time.sleep(delay * (2 ** attempt))
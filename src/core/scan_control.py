@@ -0,0 +1,46 @@
+# src/core/scan_control.py
+
+import threading
+
+class ScanCancelled(Exception):
+    """Raised inside scan workers when the scan has been cancelled."""
+
+
+class ScanControl:
+    """
+    Cooperative cancel/pause switch shared between the GUI and the scan engine.
+
+    The engine calls `checkpoint()` between probes; it blocks while the scan is
+    paused and raises ScanCancelled once the scan has been cancelled. All
+    methods are safe to call from any thread.
+    """
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set() and not self.cancelled
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # Wake up any worker blocked on a pause
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def checkpoint(self):
+        """Blocks while paused and raises ScanCancelled if the scan was cancelled."""
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise ScanCancelled()
@@ -0,0 +1,229 @@
+# src/core/scan_service.py
+
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+
+from core.resources import ConcurrencyBudget
+from core.scan_control import ScanControl
+from core.scanner_engine import run_full_scan
+from core.settings import DEFAULT_SETTINGS
+
+# Lower numbers run first.
+PRIORITY_MANUAL = 0
+PRIORITY_AUTO = 10
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# Events delivered to subscribers as listener(job, event, payload)
+EVENT_QUEUED = "queued"          # payload: None
+EVENT_STARTED = "started"        # payload: None
+EVENT_RESULT = "result"          # payload: (ip, open_ports)
+EVENT_PROGRESS = "progress"      # payload: core.progress.ProgressSnapshot
+EVENT_TICK = "tick"              # payload: None, every engine poll interval
+EVENT_FINISHED = "finished"      # payload: {ip: {port: banner}}
+
+
+class ScanJob:
+    """A queued or running scan of one target with one set of settings."""
+    _ids = itertools.count(1)
+
+    def __init__(self, target, settings, priority):
+        self.id = next(self._ids)
+        self.target = target
+        self.settings = settings
+        self.priority = priority
+        self.control = ScanControl()
+        self.status = QUEUED
+        self.results = {}
+        self.error = None
+        self.submitted_at = time.time()
+        self._listeners = []
+
+    @property
+    def key(self):
+        """Jobs with the same key would send exactly the same probes."""
+        return self.target, self.settings.fingerprint()
+
+    def subscribe(self, listener):
+        """Calls listener(job, event, payload) for every event of this job."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def __repr__(self):
+        return f"ScanJob(id={self.id}, target={self.target!r}, priority={self.priority}, status={self.status})"
+
+
+class ScanService:
+    """
+    Long-lived scan runner with a priority queue of jobs.
+
+    One service thread runs jobs one at a time, highest priority first. The
+    host thread pools and socket budgets are created on first use and kept
+    warm for later jobs. Submitting a target that is already queued with the
+    same settings returns the queued job (raising its priority if needed)
+    instead of adding a duplicate. Subscribers are called on the service
+    thread and must hand work over to their own thread themselves.
+    """
+    def __init__(self):
+        self._queue = []  # (priority, sequence, job) heap; stale entries are skipped
+        self._sequence = itertools.count()
+        self._pending = {}  # job.key -> queued job
+        self._listeners = []
+        self._executors = {}  # max_workers -> ThreadPoolExecutor
+        self._budgets = {}  # max_workers -> ConcurrencyBudget
+        self._cond = threading.Condition()
+        self._running = True
+        self.current_job = None
+        self._thread = threading.Thread(target=self._run, name="scan-service", daemon=True)
+        self._thread.start()
+
+    # --- Public API (any thread) ---
+
+    def subscribe(self, listener):
+        """Calls listener(job, event, payload) for the events of every job."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def submit(self, target, settings=None, priority=PRIORITY_MANUAL, subscriber=None):
+        """
+        Queues a scan of `target`.
+
+        Args:
+            subscriber (callable): Subscribed to the job before it is queued (or,
+                for a duplicate, before the queued job can start), so it cannot
+                miss the job's first events.
+
+        Returns:
+            The new ScanJob, or the identical job that is already queued.
+        """
+        settings = settings or DEFAULT_SETTINGS
+        job = ScanJob(target, settings, priority)
+        if subscriber is not None:
+            job.subscribe(subscriber)
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("The scan service has been shut down")
+            queued = self._pending.get(job.key)
+            if queued is not None:
+                if subscriber is not None:
+                    queued.subscribe(subscriber)
+                if priority < queued.priority:
+                    queued.priority = priority
+                    heapq.heappush(self._queue, (priority, next(self._sequence), queued))
+                    self._cond.notify()
+                return queued
+            self._pending[job.key] = job
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            self._cond.notify()
+        self._emit(job, EVENT_QUEUED)
+        return job
+
+    def cancel(self, job):
+        """Removes a queued job, or stops a running one (its progress is checkpointed)."""
+        with self._cond:
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                self._pending.pop(job.key, None)
+                job.control.cancel()
+                notify_finished = True
+            else:
+                job.control.cancel()
+                notify_finished = False
+        if notify_finished:
+            self._emit(job, EVENT_FINISHED, {})
+
+    def pending_jobs(self):
+        """Returns the queued jobs in the order they will run."""
+        with self._cond:
+            jobs = sorted(self._pending.values(), key=lambda job: (job.priority, job.id))
+        return jobs
+
+    def shutdown(self, wait=True, timeout=None):
+        """Cancels all work and stops the service thread and its pools."""
+        with self._cond:
+            self._running = False
+            queued = list(self._pending.values())
+            self._pending.clear()
+            self._queue.clear()
+            current = self.current_job
+            self._cond.notify()
+        for job in queued:
+            job.status = CANCELLED
+            job.control.cancel()
+        if current is not None:
+            current.control.cancel()
+        if wait:
+            self._thread.join(timeout)
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    # --- Service thread ---
+
+    def _emit(self, job, event, payload=None):
+        for listener in list(self._listeners) + list(job._listeners):
+            try:
+                listener(job, event, payload)
+            except Exception as e:
+                print(f"[!] Scan service listener failed on {event}: {e}")
+
+    def _next_job(self):
+        with self._cond:
+            while self._running:
+                while self._queue:
+                    priority, _, job = heapq.heappop(self._queue)
+                    # Skip cancelled jobs and entries superseded by a priority raise
+                    if job.status != QUEUED or priority != job.priority:
+                        continue
+                    self._pending.pop(job.key, None)
+                    job.status = RUNNING
+                    self.current_job = job
+                    return job
+                self._cond.wait()
+        return None
+
+    def _warm_pool(self, max_workers):
+        executor = self._executors.get(max_workers)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="scan-host")
+            self._executors[max_workers] = executor
+            self._budgets[max_workers] = ConcurrencyBudget.for_scan(max_workers)
+        return executor, self._budgets[max_workers]
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._emit(job, EVENT_STARTED)
+            try:
+                executor, budget = self._warm_pool(job.settings.max_workers)
+                job.results = run_full_scan(
+                    job.target, control=job.control, settings=job.settings,
+                    on_result=lambda ip, ports, job=job: self._emit(job, EVENT_RESULT, (ip, ports)),
+                    on_tick=lambda job=job: self._emit(job, EVENT_TICK),
+                    on_progress=lambda snapshot, job=job: self._emit(job, EVENT_PROGRESS, snapshot),
+                    executor=executor, budget=budget)
+                job.status = CANCELLED if job.control.cancelled else DONE
+            except Exception as e:
+                job.status = FAILED
+                job.error = e
+                print(f"[!] Scan of {job.target} failed: {e}")
+            finally:
+                with self._cond:
+                    self.current_job = None
+            self._emit(job, EVENT_FINISHED, job.results)
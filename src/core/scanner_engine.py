@@ -1,62 +1,214 @@
 # src/core/scanner_engine.py
 
 import concurrent.futures
+import time
 from scanner import network_discovery, tcp_scanner, banner_grabber
-from core import config, logger
+from core import config, logger, metrics, checkpoint
+from core.progress import ScanProgress
+from core.resources import ConcurrencyBudget, ResourceExhaustedError, with_backoff
+from core.scan_control import ScanControl, ScanCancelled
+from core.settings import DEFAULT_SETTINGS
 
-def scan_host(ip):
+# How often the engine wakes up to check on running hosts and call on_tick/on_progress.
+POLL_INTERVAL = 0.1
+
+def scan_host(ip, control=None, settings=DEFAULT_SETTINGS, budget=None, progress=None):
     """
     Scans a single host for open ports and banners.
+    Checks `control` between ports so the scan can be paused or cancelled.
+    Every socket is opened inside a slot of `budget`, which backs off when the
+    machine runs out of descriptors or ephemeral ports. Each port probe is
+    counted in `progress` if one is given.
     """
+    if budget is None:
+        budget = ConcurrencyBudget(1)
+    if progress is None:
+        progress = ScanProgress(settings.port_count)
+    metrics.QUEUE_DEPTH.dec()
     # This print statement will show progress in the terminal where the app is launched
     print(f"[*] Scanning host: {ip}")
     open_ports = {}
-    # Use the port range from the config file
-    for port in config.PORTS_TO_SCAN:
-        if tcp_scanner.scan_port(ip, port):
-            banner = banner_grabber.grab_banner(ip, port)
-            # Store the banner if found, otherwise store a default message
-            open_ports[port] = banner if banner else "N/A"
-    
+    tcp_timeout = settings.tcp_timeout
+    banner_timeout = settings.banner_timeout
+    # Use the precomputed port tuple from the scan settings
+    probed = 0
+    try:
+        for port in settings.ports:
+            if control is not None:
+                control.checkpoint()
+            progress.probe_started()
+            try:
+                is_open = with_backoff(budget, tcp_scanner.scan_port, ip, port, tcp_timeout)
+            except ResourceExhaustedError as e:
+                # The state is unknown; do not record the port as closed
+                print(f"[!] Skipped {ip}:{port} - local socket resources exhausted ({e})")
+                continue
+            finally:
+                progress.probe_finished()
+                probed += 1
+            if is_open:
+                with metrics.REGISTRY.stage("banner"):
+                    try:
+                        banner = with_backoff(budget, banner_grabber.grab_banner, ip, port, banner_timeout)
+                    except ResourceExhaustedError:
+                        banner = None
+                # Store the banner if found, otherwise store a default message
+                open_ports[port] = banner if banner else "N/A"
+    except ScanCancelled:
+        raise  # The host stays in the work queue and is probed again on resume
+    except Exception:
+        # A failed host is dropped; count its unprobed ports as done so progress reaches 100%
+        progress.skip(settings.port_count - probed)
+        raise
+
     return ip, open_ports
 
-def run_full_scan(network_range):
+def run_full_scan(network_range, control=None, resume=True, settings=None,
+                  on_result=None, on_tick=None, on_progress=None, executor=None, budget=None):
     """
     Orchestrates a full network scan: discovery, port scanning, and banner grabbing.
     This is the main function called by the GUI's worker thread.
+
+    Args:
+        network_range (str): The network range in CIDR notation.
+        control (ScanControl): Optional switch used to pause or cancel the scan.
+        resume (bool): Continue from an on-disk checkpoint for this range if one exists.
+        settings (ScanSettings): Per-scan tuning; defaults to the values in core.config.
+        on_result (callable): Called as on_result(ip, open_ports) as soon as a host
+            with open ports has been scanned (and for hosts restored from a checkpoint).
+        on_tick (callable): Called every POLL_INTERVAL seconds while hosts are scanned.
+        on_progress (callable): Called with a core.progress.ProgressSnapshot every
+            POLL_INTERVAL seconds while hosts are scanned, and once when they are done.
+        executor (ThreadPoolExecutor): Optional long-lived pool to run hosts on. It is
+            left running afterwards; by default a pool is created for this scan.
+        budget (ConcurrencyBudget): Optional socket budget carried over between scans.
+
+    Returns:
+        The results found so far, {ip: {port: banner}}. If the scan was cancelled
+        the remaining work is left in a checkpoint for the next run.
     """
-    print(f"--- Starting Full Scan on {network_range} ---")
-    
-    # Step 1: Discover all active hosts on the network
-    active_hosts = network_discovery.discover_hosts(network_range)
-    if not active_hosts:
-        print("\n[!] No active hosts found. Exiting scan.")
-        return {}
-    
-    # Extract just the IP addresses for scanning
-    host_ips = [host['ip'] for host in active_hosts]
-    print(f"\n[*] Found {len(host_ips)} active hosts: {host_ips}")
-    
-    all_results = {}
-    
+    if control is None:
+        control = ScanControl()
+    if settings is None:
+        settings = DEFAULT_SETTINGS
+    registry = metrics.REGISTRY
+    # The registry stays cumulative; this scan's summary is read from its own window
+    window = registry.window()
+    if registry.enabled and config.METRICS_HTTP_PORT:
+        registry.start_http_server(config.METRICS_HTTP_PORT)
+
+    saved = checkpoint.load_checkpoint(network_range, settings) if resume else None
+    if saved:
+        print(f"--- Resuming Scan on {network_range} from checkpoint ({saved['saved_at']}) ---")
+        host_ips = saved["pending_hosts"]
+        all_results = saved["results"]
+        if on_result is not None:
+            for ip, open_ports in all_results.items():
+                on_result(ip, open_ports)
+    else:
+        print(f"--- Starting Full Scan on {network_range} ---")
+
+        # Step 1: Discover all active hosts on the network
+        with registry.stage("discovery"):
+            active_hosts = network_discovery.discover_hosts(network_range)
+        if not active_hosts:
+            print("\n[!] No active hosts found. Exiting scan.")
+            metrics.publish_scan_metrics(window)
+            return {}
+
+        # Extract just the IP addresses for scanning
+        host_ips = [host['ip'] for host in active_hosts]
+        print(f"\n[*] Found {len(host_ips)} active hosts: {host_ips}")
+        all_results = {}
+
     # Step 2: Scan all discovered hosts concurrently using a thread pool for speed
     print("\n--- Scanning Hosts for Open Ports ---")
-    # Use the worker count from the config file
-    with concurrent.futures.ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
-        # Create a mapping of future tasks to their corresponding IP addresses
-        future_to_host = {executor.submit(scan_host, ip): ip for ip in host_ips}
-        
-        # Process results as they are completed
-        for future in concurrent.futures.as_completed(future_to_host):
-            ip = future_to_host[future]
-            try:
-                ip_result, open_ports = future.result()
-                if open_ports:
-                    all_results[ip_result] = open_ports
-            except Exception as exc:
-                print(f"[!] Host {ip} generated an exception: {exc}")
-                
+    remaining_hosts = set(host_ips)
+    metrics.QUEUE_DEPTH.set(len(host_ips))
+    # One probe unit per port of every host still to scan
+    progress = ScanProgress(len(host_ips) * settings.port_count)
+    future_to_host = {}
+    pending = set()
+
+    def collect(future):
+        ip = future_to_host[future]
+        try:
+            ip_result, open_ports = future.result()
+            if open_ports:
+                all_results[ip_result] = open_ports
+                if on_result is not None:
+                    on_result(ip_result, open_ports)
+            remaining_hosts.discard(ip)
+        except (ScanCancelled, concurrent.futures.CancelledError):
+            pass  # Host stays in the work queue
+        except Exception as exc:
+            remaining_hosts.discard(ip)
+            print(f"[!] Host {ip} generated an exception: {exc}")
+
+    if budget is None:
+        # Size the socket budget from the fd limit, port range and sockets in use
+        budget = ConcurrencyBudget.for_scan(settings.max_workers)
+    owns_executor = executor is None
+    if owns_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=settings.max_workers)
+    try:
+        with registry.stage("port_scan"):
+            # Create a mapping of future tasks to their corresponding IP addresses
+            future_to_host = {executor.submit(scan_host, ip, control, settings, budget, progress): ip
+                              for ip in host_ips}
+            pending = set(future_to_host)
+            last_checkpoint = time.monotonic()
+            checkpointed_pause = False
+
+            # Process results as they are completed, waking up regularly to
+            # honour cancel/pause requests and to write periodic checkpoints
+            while pending and not control.cancelled:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=POLL_INTERVAL, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+                if on_tick is not None:
+                    on_tick()
+                if on_progress is not None:
+                    on_progress(progress.snapshot())
+
+                now = time.monotonic()
+                if control.paused and not checkpointed_pause:
+                    # Persist progress as soon as the scan is paused
+                    checkpoint.save_checkpoint(network_range, remaining_hosts, all_results, settings)
+                    checkpointed_pause = True
+                    last_checkpoint = now
+                elif not control.paused:
+                    checkpointed_pause = False
+                if pending and now - last_checkpoint >= settings.checkpoint_interval:
+                    checkpoint.save_checkpoint(network_range, remaining_hosts, all_results, settings)
+                    last_checkpoint = now
+    finally:
+        # Queued hosts are dropped on cancel; running ones stop at their next port
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in pending:
+                future.cancel()
+            concurrent.futures.wait(pending)
+        # Keep hosts that finished while the scan was being stopped
+        for future in pending:
+            if future.done():
+                collect(future)
+
+    if on_progress is not None:
+        on_progress(progress.snapshot())
+
+    if control.cancelled:
+        checkpoint.save_checkpoint(network_range, remaining_hosts, all_results, settings)
+        print(f"\n--- Scan Cancelled ({len(remaining_hosts)} hosts left, checkpoint saved) ---")
+        metrics.publish_scan_metrics(window)
+        return all_results
+
     print("\n--- Full Scan Complete ---")
-    logger.save_log(all_results)
-    
+    checkpoint.clear_checkpoint(network_range, settings)
+    with registry.stage("log"):
+        logger.save_log(all_results)
+    metrics.publish_scan_metrics(window)
+
     return all_results
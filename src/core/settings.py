@@ -0,0 +1,161 @@
+# src/core/settings.py
+
+import argparse
+import hashlib
+import json
+from dataclasses import dataclass, field, fields, replace
+from types import MappingProxyType
+
+from core import config
+
+def parse_ports(spec):
+    """
+    Normalises a port specification into a sorted tuple of unique ports.
+
+    Args:
+        spec: A string such as "1-1024,3389", a range, or an iterable of ints.
+
+    Raises:
+        ValueError: If a port is malformed or outside 1-65535.
+    """
+    if isinstance(spec, int):
+        spec = [spec]
+    if isinstance(spec, str):
+        ports = set()
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                start, end = part.split("-", 1)
+                start, end = int(start), int(end)
+                if start > end:
+                    raise ValueError(f"Invalid port range: {part}")
+                ports.update(range(start, end + 1))
+            else:
+                ports.add(int(part))
+    else:
+        ports = {int(port) for port in spec}
+
+    if not ports:
+        raise ValueError("At least one port must be scanned.")
+    if min(ports) < 1 or max(ports) > 65535:
+        raise ValueError("Ports must be between 1 and 65535.")
+    return tuple(sorted(ports))
+
+
+@dataclass(frozen=True)
+class ScanSettings:
+    """
+    Immutable tuning for a single scan, validated once at construction.
+
+    The engine reads everything it needs from here instead of the module-level
+    constants in core.config, so scans with different settings can run side by
+    side. Derived values (the port tuple and the port count) are computed
+    in __post_init__ and never change afterwards.
+    """
+    ports: tuple = tuple(config.PORTS_TO_SCAN)
+    max_workers: int = config.MAX_WORKERS
+    tcp_timeout: float = config.TCP_TIMEOUT
+    banner_timeout: float = config.BANNER_TIMEOUT
+    checkpoint_interval: float = config.CHECKPOINT_INTERVAL
+    critical_ports: MappingProxyType = field(
+        default_factory=lambda: MappingProxyType(dict(config.CRITICAL_PORTS)), hash=False)
+
+    # --- Derived values ---
+    port_count: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Frozen dataclasses need object.__setattr__ to normalise fields
+        object.__setattr__(self, "ports", parse_ports(self.ports))
+        object.__setattr__(self, "critical_ports",
+                           MappingProxyType({int(port): str(reason)
+                                             for port, reason in dict(self.critical_ports).items()}))
+
+        if int(self.max_workers) < 1:
+            raise ValueError("max_workers must be at least 1.")
+        object.__setattr__(self, "max_workers", int(self.max_workers))
+        for name in ("tcp_timeout", "banner_timeout", "checkpoint_interval"):
+            value = float(getattr(self, name))
+            if value <= 0:
+                raise ValueError(f"{name} must be greater than 0.")
+            object.__setattr__(self, name, value)
+
+        object.__setattr__(self, "port_count", len(self.ports))
+
+    def fingerprint(self):
+        """Short stable id of the settings that change which probes a scan sends."""
+        data = repr((self.ports, self.tcp_timeout, self.banner_timeout)).encode()
+        return hashlib.sha1(data).hexdigest()[:12]
+
+    def with_overrides(self, **overrides):
+        """Returns a copy with some values replaced; the copy is validated again."""
+        overrides = {key: value for key, value in overrides.items() if value is not None}
+        return replace(self, **overrides) if overrides else self
+
+    @classmethod
+    def from_profile(cls, path, base=None):
+        """
+        Loads settings from a JSON profile file.
+
+        Unknown keys are rejected so typos do not silently fall back to defaults.
+        Example profile: {"ports": "1-1024,3389", "max_workers": 100, "tcp_timeout": 0.5}
+        """
+        with open(path, 'r') as f:
+            profile = json.load(f)
+        if not isinstance(profile, dict):
+            raise ValueError(f"Profile {path} must contain a JSON object.")
+
+        allowed = {f.name for f in fields(cls) if f.init}
+        unknown = set(profile) - allowed
+        if unknown:
+            raise ValueError(f"Unknown setting(s) in {path}: {', '.join(sorted(unknown))}")
+        # Wrongly typed values (e.g. "ports": {}) surface as ValueError like any other bad setting
+        try:
+            if "critical_ports" in profile:
+                profile["critical_ports"] = {int(port): reason
+                                             for port, reason in profile["critical_ports"].items()}
+            return (base or cls()).with_overrides(**profile)
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid setting in {path}: {e}")
+
+    @staticmethod
+    def add_arguments(parser):
+        """Adds the scan tuning flags to an argparse parser."""
+        group = parser.add_argument_group("scan settings")
+        group.add_argument("--profile", help="JSON file with scan settings")
+        group.add_argument("--ports", help="ports to scan, e.g. 1-1024,3389")
+        group.add_argument("--workers", type=int, dest="max_workers",
+                           help="number of hosts scanned concurrently")
+        group.add_argument("--tcp-timeout", type=float, help="TCP connect timeout in seconds")
+        group.add_argument("--banner-timeout", type=float, help="banner grab timeout in seconds")
+        return group
+
+    @classmethod
+    def from_args(cls, args):
+        """Builds settings from parsed CLI flags: the profile first, then explicit flags."""
+        settings = cls.from_profile(args.profile) if args.profile else cls()
+        return settings.with_overrides(
+            ports=args.ports,
+            max_workers=args.max_workers,
+            tcp_timeout=args.tcp_timeout,
+            banner_timeout=args.banner_timeout,
+        )
+
+    @classmethod
+    def from_argv(cls, argv):
+        """
+        Parses scan flags out of an argument list.
+
+        Returns:
+            A (settings, remaining_args) tuple; unrecognised arguments are left
+            for the caller (e.g. Qt's own command line options).
+        """
+        parser = argparse.ArgumentParser(prog="doormanet", add_help=False)
+        cls.add_arguments(parser)
+        args, remaining = parser.parse_known_args(argv)
+        return cls.from_args(args), remaining
+
+
+# Settings used when a caller does not provide its own.
+DEFAULT_SETTINGS = ScanSettings()
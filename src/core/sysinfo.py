@@ -0,0 +1,125 @@
+# src/core/sysinfo.py
+
+import datetime
+import platform
+import socket
+import time
+
+import psutil
+
+# Facts that rarely change but may (IP address, disk size) are re-read this often.
+SLOW_REFRESH_SECONDS = 60
+
+# (section title, [(field key, label), ...]) in display order.
+SECTIONS = [
+    ("Operating System", [
+        ("system", "System"),
+        ("version", "Version"),
+        ("architecture", "Architecture"),
+        ("hostname", "Hostname"),
+        ("local_ip", "Local IP"),
+    ]),
+    ("Hardware Information", [
+        ("processor", "Processor"),
+        ("cpu_cores", "CPU Cores"),
+        ("cpu_usage", "CPU Usage"),
+        ("memory_total", "Total Memory"),
+        ("memory_available", "Available Memory"),
+        ("disk", "Disk Space"),
+    ]),
+    ("System Status", [
+        ("python_version", "Python Version"),
+        ("boot_time", "Boot Time"),
+        ("uptime", "System Uptime"),
+    ]),
+]
+
+GB = 1024 ** 3
+
+
+def local_ip_address():
+    """
+    Returns the address of the interface used for outbound traffic.
+
+    Connecting a UDP socket only selects a route; no packet is sent and no
+    DNS lookup is made, unlike socket.gethostbyname(socket.gethostname()).
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(("10.255.255.255", 1))
+            return sock.getsockname()[0]
+    except OSError:
+        return "Unable to determine"
+
+
+def _disk_root():
+    return "C:\\" if platform.system() == "Windows" else "/"
+
+
+class SystemInfoCollector:
+    """
+    Builds snapshots of the System Info fields as display-ready strings.
+
+    Static facts (OS, CPU counts, boot time) are read once, slow-changing ones
+    (hostname, local IP) every SLOW_REFRESH_SECONDS, and the live metrics with
+    one cheap psutil call each per snapshot. `changes()` returns only the
+    fields that differ from the previous call.
+    """
+    def __init__(self):
+        self._static = None
+        self._slow = {}
+        self._slow_at = None
+        self._last = {}
+        psutil.cpu_percent(interval=None)  # Prime the CPU counter; the first value is meaningless
+
+    def _static_fields(self):
+        if self._static is None:
+            physical = psutil.cpu_count(logical=False)
+            logical = psutil.cpu_count(logical=True)
+            self._boot_time = datetime.datetime.fromtimestamp(psutil.boot_time())
+            self._static = {
+                "system": f"{platform.system()} {platform.release()}",
+                "version": platform.version(),
+                "architecture": f"{platform.architecture()[0]} ({platform.machine()})",
+                "processor": platform.processor() or platform.machine(),
+                "cpu_cores": f"{physical} physical, {logical} logical",
+                "python_version": platform.python_version(),
+                "boot_time": self._boot_time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+        return self._static
+
+    def _slow_fields(self):
+        now = time.monotonic()
+        if self._slow_at is None or now - self._slow_at >= SLOW_REFRESH_SECONDS:
+            self._slow_at = now
+            self._slow = {
+                "hostname": socket.gethostname(),
+                "local_ip": local_ip_address(),
+            }
+        return self._slow
+
+    def snapshot(self):
+        """Returns every field as {key: text}."""
+        fields = dict(self._static_fields())
+        fields.update(self._slow_fields())
+
+        memory = psutil.virtual_memory()
+        fields["memory_total"] = f"{memory.total / GB:.2f} GB"
+        fields["memory_available"] = f"{memory.available / GB:.2f} GB ({100 - memory.percent:.1f}% free)"
+        fields["cpu_usage"] = f"{psutil.cpu_percent(interval=None):.0f}%"
+        try:
+            disk = psutil.disk_usage(_disk_root())
+            fields["disk"] = f"{disk.used / GB:.2f} GB / {disk.total / GB:.2f} GB ({disk.percent}% used)"
+        except OSError:
+            fields["disk"] = "Unavailable"
+
+        uptime = datetime.datetime.now() - self._boot_time
+        fields["uptime"] = str(uptime).split('.')[0]
+        return fields
+
+    def changes(self):
+        """Takes a snapshot and returns only the fields that changed since the last call."""
+        fields = self.snapshot()
+        changed = {key: value for key, value in fields.items() if self._last.get(key) != value}
+        self._last = fields
+        return changed
@@ -0,0 +1,277 @@
+# src/core/traffic_sampler.py
+
+import argparse
+import socket
+import threading
+import time
+from array import array
+from collections import Counter, deque, namedtuple
+
+import psutil
+
+from core import config
+
+Listener = namedtuple("Listener", "protocol address port pid process")
+ListenerEvent = namedtuple("ListenerEvent", "timestamp listener")
+
+# New-listener events kept for the GUI and CLI.
+MAX_LISTENER_EVENTS = 200
+
+
+class RingBuffer:
+    """Fixed-capacity circular buffer of floats stored in a flat array."""
+    __slots__ = ("capacity", "count", "_data", "_next")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self._data = array('d', bytes(8 * capacity))
+        self._next = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def last(self, n):
+        """Returns the newest `n` values, oldest first."""
+        n = min(n, self.count)
+        start = self._next - n
+        if start >= 0:
+            return self._data[start:self._next]
+        return self._data[start:] + self._data[:self._next]
+
+    def sum_last(self, n):
+        return sum(self.last(n))
+
+    def newest(self, i=0):
+        """Returns the value appended `i` appends ago (0 = newest)."""
+        return self._data[(self._next - 1 - i) % self.capacity]
+
+
+class InterfaceHistory:
+    """Per-sample byte and packet deltas of one network interface."""
+    __slots__ = ("sent", "recv", "packets_sent", "packets_recv")
+
+    def __init__(self, capacity, backfill=0):
+        self.sent = RingBuffer(capacity)
+        self.recv = RingBuffer(capacity)
+        self.packets_sent = RingBuffer(capacity)
+        self.packets_recv = RingBuffer(capacity)
+        # Keep the rows aligned with samples taken before the interface appeared
+        for _ in range(backfill):
+            self.append(0, 0, 0, 0)
+
+    def append(self, sent, recv, packets_sent, packets_recv):
+        self.sent.append(sent)
+        self.recv.append(recv)
+        self.packets_sent.append(packets_sent)
+        self.packets_recv.append(packets_recv)
+
+
+def _counter_delta(current, previous):
+    # Counters restart from zero when an interface is reset or wraps around
+    return current - previous if current >= previous else current
+
+
+class TrafficSampler:
+    """
+    Samples interface counters and the connection table into ring buffers.
+
+    Every `interval` seconds the per-interface counters are read with one
+    psutil call and the deltas are appended to fixed-size arrays, so the
+    history costs the same memory after an hour as after a minute. The
+    connection table, which is far more expensive to read, is sampled every
+    `connection_every` samples to track listeners and remote hosts.
+    Queries may be made from any thread.
+    """
+    def __init__(self, interval=None, history=None, connection_every=None):
+        self.interval = interval or config.TRAFFIC_SAMPLE_INTERVAL
+        self.history = history or config.TRAFFIC_HISTORY
+        self.connection_every = connection_every or config.CONNECTION_SAMPLE_EVERY
+        self.durations = RingBuffer(self.history)  # Seconds covered by each sample
+        self.interfaces = {}
+        self.listener_events = deque(maxlen=MAX_LISTENER_EVENTS)
+        self.remote_hosts = Counter()  # Remote IP -> established connections at the last sample
+        self._listeners = None  # Listening sockets at the last connection sample
+        self._last_counters = None
+        self._last_time = None
+        self._samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Sampling ---
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="traffic-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"[!] Error sampling network traffic: {e}")
+            self._stop.wait(self.interval)
+
+    def sample(self):
+        """Takes one sample of the counters (and, periodically, of the connections)."""
+        now = time.monotonic()
+        counters = psutil.net_io_counters(pernic=True)
+        with self._lock:
+            if self._last_counters is not None:
+                self.durations.append(now - self._last_time)
+                filled = self.durations.count - 1
+                for name, current in counters.items():
+                    history = self.interfaces.get(name)
+                    if history is None:
+                        history = self.interfaces[name] = InterfaceHistory(self.history, filled)
+                    previous = self._last_counters.get(name, current)
+                    history.append(_counter_delta(current.bytes_sent, previous.bytes_sent),
+                                   _counter_delta(current.bytes_recv, previous.bytes_recv),
+                                   _counter_delta(current.packets_sent, previous.packets_sent),
+                                   _counter_delta(current.packets_recv, previous.packets_recv))
+                for name, history in self.interfaces.items():
+                    if name not in counters:
+                        history.append(0, 0, 0, 0)  # Interface went away
+            self._last_counters = counters
+            self._last_time = now
+
+        if self._samples % self.connection_every == 0:
+            self._sample_connections()
+        self._samples += 1
+
+    def _sample_connections(self):
+        try:
+            connections = psutil.net_connections(kind='inet')
+        except (psutil.AccessDenied, OSError):
+            return  # Needs elevated rights on some systems
+        listeners = set()
+        remote_hosts = Counter()
+        for conn in connections:
+            if conn.status == psutil.CONN_LISTEN or (conn.type == socket.SOCK_DGRAM and not conn.raddr):
+                if conn.laddr:
+                    protocol = "TCP" if conn.type == socket.SOCK_STREAM else "UDP"
+                    listeners.add((protocol, conn.laddr.ip, conn.laddr.port, conn.pid))
+            elif conn.status == psutil.CONN_ESTABLISHED and conn.raddr:
+                remote_hosts[conn.raddr.ip] += 1
+
+        # The first sample is the baseline; later additions are reported
+        added = []
+        if self._listeners is not None:
+            timestamp = time.time()
+            added = [ListenerEvent(timestamp, Listener(protocol, address, port, pid, _process_name(pid)))
+                     for protocol, address, port, pid in sorted(listeners - self._listeners, key=str)]
+        with self._lock:
+            self.listener_events.extend(added)
+            self._listeners = listeners
+            self.remote_hosts = remote_hosts
+
+    # --- Queries ---
+
+    def _window_samples(self, window):
+        """Returns (samples, seconds) covering at least `window` seconds of history."""
+        seconds = 0.0
+        samples = 0
+        while samples < self.durations.count and seconds < window:
+            seconds += self.durations.newest(samples)
+            samples += 1
+        return samples, seconds
+
+    def rates(self, window=5.0):
+        """
+        Returns {interface: (sent bytes/s, received bytes/s)} averaged over
+        the last `window` seconds.
+        """
+        with self._lock:
+            samples, seconds = self._window_samples(window)
+            if not samples or seconds <= 0:
+                return {}
+            return {name: (history.sent.sum_last(samples) / seconds,
+                           history.recv.sum_last(samples) / seconds)
+                    for name, history in self.interfaces.items()}
+
+    def total_rate(self, window=5.0):
+        """Returns (sent bytes/s, received bytes/s) over all interfaces."""
+        rates = self.rates(window)
+        return (sum(sent for sent, _ in rates.values()),
+                sum(recv for _, recv in rates.values()))
+
+    def top_interfaces(self, n=3, window=5.0):
+        """Returns the `n` busiest interfaces as (name, sent/s, received/s)."""
+        rates = self.rates(window)
+        ranked = sorted(rates.items(), key=lambda item: item[1][0] + item[1][1], reverse=True)
+        return [(name, sent, recv) for name, (sent, recv) in ranked[:n] if sent + recv > 0]
+
+    def top_talkers(self, n=5):
+        """
+        Returns the `n` remote hosts with the most established connections.
+        Per-host byte counts would need packet capture, so connections are counted.
+        """
+        with self._lock:
+            return self.remote_hosts.most_common(n)
+
+    def new_listeners(self, since=0.0):
+        """Returns the ListenerEvents for sockets that started listening after `since` (epoch seconds)."""
+        with self._lock:
+            return [event for event in self.listener_events if event.timestamp > since]
+
+
+def _process_name(pid):
+    if not pid:
+        return "unknown"
+    try:
+        return psutil.Process(pid).name()
+    except (psutil.Error, OSError):
+        return "unknown"
+
+
+def format_rate(bytes_per_second):
+    """Formats a byte rate as B/s, KB/s or MB/s."""
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if bytes_per_second < 1024 or unit == "MB/s":
+            return f"{bytes_per_second:.1f} {unit}"
+        bytes_per_second /= 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sample local network traffic and listening sockets.")
+    parser.add_argument("--interval", type=float, default=config.TRAFFIC_SAMPLE_INTERVAL,
+                        help="seconds between samples")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="stop after this many seconds (default: run until Ctrl+C)")
+    parser.add_argument("--window", type=float, default=5.0,
+                        help="seconds averaged by the rate queries")
+    args = parser.parse_args()
+
+    sampler = TrafficSampler(interval=args.interval)
+    started = time.time()
+    last_event = 0.0
+    try:
+        while args.duration is None or time.time() - started < args.duration:
+            sampler.sample()
+            sent, recv = sampler.total_rate(args.window)
+            busiest = ", ".join(f"{name} {format_rate(s + r)}"
+                                for name, s, r in sampler.top_interfaces(window=args.window))
+            talkers = ", ".join(f"{ip} ({count})" for ip, count in sampler.top_talkers(3))
+            print(f"[*] Up {format_rate(sent)}  Down {format_rate(recv)}  |  "
+                  f"{busiest or 'idle'}  |  Top hosts: {talkers or 'none'}")
+            for event in sampler.new_listeners(last_event):
+                listener = event.listener
+                print(f"[!] New listener: {listener.protocol} {listener.address}:{listener.port} "
+                      f"({listener.process}, pid {listener.pid})")
+                last_event = event.timestamp
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
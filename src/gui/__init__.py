@@ -1,3 +1,3 @@
 """GUI package for DoormaNet."""
 
-__all__ = ["main_window", "worker", "alerts"]
+__all__ = ["main_window", "worker", "alerts", "blocklist_model", "notifications", "results_model"]
@@ -1,7 +1,8 @@
 # src/gui/alerts.py
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QFrame, QSpacerItem, QSizePolicy)
+                             QPushButton, QFrame, QSpacerItem, QSizePolicy,
+                             QTreeWidget, QTreeWidgetItem, QHeaderView)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QPixmap, QPalette, QColor
 
@@ -139,4 +140,173 @@ class AlertDialog(QDialog):
         # Add all to main layout
         layout.addWidget(header_frame)
         layout.addWidget(info_frame)
-        layout.addLayout(button_layout)
\ No newline at end of file
+        layout.addLayout(button_layout)
+
+
+class AlertCenter(QDialog):
+    """
+    Non-modal window that aggregates critical findings while a scan streams.
+
+    Findings are grouped by host, then by port and risk, with a count of how
+    often each was reported. The window pops up at most once per scan; later
+    findings only update the counts.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("Security Alert Center")
+        self.setWindowIcon(self.style().standardIcon(getattr(self.style(), 'SP_MessageBoxWarning')))
+        self.setMinimumWidth(640)
+        self.setMinimumHeight(420)
+        self.setModal(False)
+        self.setFont(QFont("Segoe UI", 10))
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #2b2b2b;
+                color: #ffffff;
+                font-family: 'Segoe UI', Arial, sans-serif;
+            }
+            QLabel {
+                color: #ffffff;
+                background-color: transparent;
+            }
+            QTreeWidget {
+                background-color: #3c3c3c;
+                alternate-background-color: #444444;
+                color: #ffffff;
+                border: 1px solid #555555;
+                border-radius: 6px;
+            }
+            QHeaderView::section {
+                background-color: #2b2b2b;
+                color: #ffffff;
+                padding: 8px;
+                border: 1px solid #555555;
+                font-weight: 600;
+            }
+            QPushButton {
+                background-color: #dc3545;
+                color: white;
+                border: none;
+                padding: 10px 20px;
+                border-radius: 6px;
+                font-weight: 600;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background-color: #c82333;
+            }
+        """)
+
+        # Host -> top-level item, (host, port, reason) -> child item
+        self._host_items = {}
+        self._finding_items = {}
+        self._total = 0
+        self._popup_shown = False
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        title = QLabel("⚠ Critical Security Findings")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #dc3545;")
+        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+
+        self.summary_label = QLabel("No critical findings")
+        self.summary_label.setStyleSheet("font-size: 12px; color: #ffc107;")
+        self.summary_label.setWordWrap(True)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(4)
+        self.tree.setHeaderLabels(["Host", "Port", "Security Risk", "Count"])
+        self.tree.setAlternatingRowColors(True)
+        self.tree.setUniformRowHeights(True)
+        self.tree.header().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.tree.setSortingEnabled(True)
+
+        recommendation = QLabel(
+            "It is highly recommended to close these ports if they are not needed or ensure they are "
+            "properly secured with authentication and access controls.")
+        recommendation.setWordWrap(True)
+        recommendation.setStyleSheet("font-size: 11px; color: #cccccc;")
+
+        button_layout = QHBoxLayout()
+        button_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
+        ok_button = QPushButton("Acknowledge")
+        ok_button.clicked.connect(self.hide)
+        button_layout.addWidget(ok_button)
+
+        layout.addWidget(title)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.tree)
+        layout.addWidget(recommendation)
+        layout.addLayout(button_layout)
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def host_count(self):
+        return len(self._host_items)
+
+    def begin_scan(self):
+        """Clears the previous scan's findings and re-arms the popup."""
+        self.tree.clear()
+        self._host_items.clear()
+        self._finding_items.clear()
+        self._total = 0
+        self._popup_shown = False
+        self.summary_label.setText("Scan in progress - no critical findings yet")
+
+    def add_findings(self, findings):
+        """
+        Adds a batch of (ip, port, reason) findings and updates the counts.
+
+        Returns:
+            True if this call opened the window (first critical finding of the scan).
+        """
+        self.tree.setSortingEnabled(False)  # Avoid re-sorting on every change
+        for ip, port, reason in findings:
+            host_item = self._host_items.get(ip)
+            if host_item is None:
+                host_item = QTreeWidgetItem([ip, "", "", "0"])
+                host_item.setForeground(0, QColor("#ffc107"))
+                self.tree.addTopLevelItem(host_item)
+                host_item.setExpanded(True)
+                self._host_items[ip] = host_item
+
+            key = (ip, port, reason)
+            finding_item = self._finding_items.get(key)
+            if finding_item is None:
+                finding_item = QTreeWidgetItem(["", str(port), reason, "0"])
+                finding_item.setForeground(1, QColor("#dc3545"))
+                host_item.addChild(finding_item)
+                self._finding_items[key] = finding_item
+            finding_item.setText(3, str(int(finding_item.text(3)) + 1))
+            host_item.setText(3, str(int(host_item.text(3)) + 1))
+            self._total += 1
+        self.tree.setSortingEnabled(True)
+
+        self._update_summary()
+        if findings and not self._popup_shown:
+            self._popup_shown = True
+            self.show()
+            self.raise_()
+            return True
+        return False
+
+    def finish_scan(self):
+        """Shows the final summary once the scan is over."""
+        if self._total:
+            self.summary_label.setText(f"Scan complete - {self._summary_text()}")
+        else:
+            self.summary_label.setText("Scan complete - no critical findings")
+
+    def _summary_text(self):
+        hosts = len(self._host_items)
+        return (f"{self._total} critical finding{'s' if self._total != 1 else ''} "
+                f"on {hosts} host{'s' if hosts != 1 else ''}")
+
+    def _update_summary(self):
+        self.summary_label.setText(self._summary_text())
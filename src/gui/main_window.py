@@ -1,11 +1,7 @@
 import sys
 import os
-import threading
-import time
 import datetime
-import platform
-import socket
-import psutil
+import time
 try:
     import winreg  # Windows registry access
 except ImportError:
@@ -13,19 +9,35 @@ except ImportError:
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-                             QTableWidget, QTableWidgetItem, QHeaderView,
-                             QTabWidget, QListWidget, QMenu, QMessageBox,
+                             QTableView, QAbstractItemView, QHeaderView,
+                             QTabWidget, QListView, QMenu, QMessageBox,
                              QProgressBar, QStatusBar, QFrame, QGroupBox,
-                             QGridLayout, QTextEdit, QCheckBox, QListWidgetItem,
-                             QSystemTrayIcon, QStyle, QSpacerItem, QSizePolicy)
-from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QObject, QSize
-from PyQt5.QtGui import QFont, QColor
+                             QGridLayout, QTextEdit, QCheckBox,
+                             QSystemTrayIcon, QStyle, QSpacerItem, QSizePolicy,
+                             QComboBox, QFileDialog, QProgressDialog)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QObject
+from PyQt5.QtGui import QFont
 
 # Import local modules
-from gui.worker import ScannerWorker
-from core import utils
-from protection import firewall_manager, hosts_editor
-from gui.alerts import AlertDialog
+from gui.worker import ScannerWorker, SystemInfoWorker, ProtectionWorker
+from core import utils, config
+from core.settings import DEFAULT_SETTINGS
+from core.progress import percent_done, format_duration
+from core.sysinfo import SECTIONS as SYSINFO_SECTIONS
+from core.netwatch import NetworkWatcher
+from core.scan_service import ScanService, PRIORITY_MANUAL, PRIORITY_AUTO
+from core.traffic_sampler import TrafficSampler, format_rate
+from protection.dns_sinkhole import SinkholeThread
+from protection.executor import EXPIRE_DOMAINS, EXPIRE_IPS
+from protection import policy as response_policy
+from gui.alerts import AlertCenter
+from gui.results_model import ResultsTableModel, ResultsFilterProxy
+from gui.notifications import (Notification, NotificationListModel,
+                               NotificationFilterProxy, NotificationDelegate)
+from gui.blocklist_model import BlockedDomainsModel, SEARCH_DEBOUNCE_MS
+
+# Scan progress bar resolution; 1000 steps show tenths of a percent.
+PROGRESS_STEPS = 1000
 
 class NetworkMonitor(QObject):
     """Monitor network changes and trigger scans."""
@@ -33,39 +45,26 @@ class NetworkMonitor(QObject):
     
     def __init__(self):
         super().__init__()
-        self.current_network = None
-        self.monitoring = False
+        # rtnetlink events on Linux, polling elsewhere; emitted from the watcher thread
+        self.watcher = NetworkWatcher(self.network_changed.emit)
+        
+    @property
+    def current_network(self):
+        return self.watcher.current_network
         
     def start_monitoring(self):
-        if not self.monitoring:  # Prevent multiple monitor threads
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitor_network, daemon=True)
-            self.monitor_thread.start()
+        self.watcher.start()  # No-op if already running
     
     def stop_monitoring(self):
-        self.monitoring = False
-        # Give the thread time to stop
-        if hasattr(self, 'monitor_thread'):
-            try:
-                self.monitor_thread.join(timeout=2)
-            except:
-                pass
-    
-    def _monitor_network(self):
-        while self.monitoring:
-            try:
-                current_network = utils.get_local_network_range()
-                if current_network != self.current_network and current_network:
-                    self.current_network = current_network
-                    self.network_changed.emit(current_network)
-                time.sleep(10)  # Check every 10 seconds
-            except Exception:
-                pass
+        self.watcher.stop()
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, scan_settings=None):
         super().__init__()
 
+        # Tuning used for every scan started from this window
+        self.scan_settings = scan_settings or DEFAULT_SETTINGS
+
         self.setWindowTitle("doormaNet - Network Security Suite")
         self.setGeometry(100, 100, 1400, 900)
         self.setMinimumSize(1200, 800)
@@ -81,10 +80,19 @@ class MainWindow(QMainWindow):
         self.network_monitor = NetworkMonitor()
         self.network_monitor.network_changed.connect(self.on_network_changed)
         
-        # Notification system
-        self.notifications = []
-        self.max_notifications = 50
-        self.all_blocked_domains = []  # Store all blocked domains for filtering
+        # Notification system: a fixed-capacity ring buffer behind a list model
+        self.notification_model = NotificationListModel(config.MAX_NOTIFICATIONS, self)
+        self.blocked_model = BlockedDomainsModel(self)  # Parsed blocklist with a search index
+        
+        # Hosts and firewall changes run on a background executor; results arrive as signals
+        self.protection = ProtectionWorker()
+        self.protection_tasks = {}  # task id -> how to report its result
+        self.import_dialog = None
+        self.protection.task_finished.connect(self.on_protection_task_finished)
+        self.protection.task_progress.connect(self.on_protection_task_progress)
+        self.protection.blocklist_changed.connect(self.on_blocklist_changed)
+        self.protection.policy_flushed.connect(self.on_policy_flushed)
+        self.protection.policy_status.connect(self.on_policy_status)
         
         # Create status bar
         self.status_bar = QStatusBar()
@@ -119,13 +127,15 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.info_tab, "System Info")
         self.setup_info_ui()
 
+        # Non-modal alert center that aggregates critical findings per scan
+        self.alert_center = AlertCenter(self)
+        
         # --- Finalize Functionality ---
-        self.thread = None
-        self.worker = None
+        # Long-lived scan service; scans are queued as jobs instead of a QThread each
+        self.scan_service = ScanService()
+        self.worker = None  # Worker of the job currently shown in the Scanner tab
+        self.scan_workers = {}  # job id -> ScannerWorker for every queued or running job
         self.tray_icon = None  # Initialize tray icon
-        self.scan_timer = QTimer()
-        self.scan_timer.timeout.connect(self.update_scan_progress)
-        self.scan_progress = 0
         self.auto_fill_target()
         
         # Start network monitoring
@@ -133,6 +143,13 @@ class MainWindow(QMainWindow):
         
         # Add initial notification
         self.add_notification("SYSTEM", "Application Started", "doormaNet is now monitoring your network security", "INFO")
+        if self.protection.policy_error:
+            self.on_policy_status(self.protection.policy_error)
+        
+        # Optional local DNS sinkhole serving the blocklist (see config.DNS_SINKHOLE_ENABLED)
+        self.dns_sinkhole = None
+        if config.DNS_SINKHOLE_ENABLED:
+            self.start_dns_sinkhole()
 
     def closeEvent(self, event):
         """Handle application close event with proper cleanup."""
@@ -141,27 +158,23 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'network_monitor'):
                 self.network_monitor.stop_monitoring()
             
-            # Clean up scan timer
-            if hasattr(self, 'scan_timer'):
-                self.scan_timer.stop()
+            # Stop the System Info collector
+            self.stop_system_info()
+            if hasattr(self, 'traffic_sampler'):
+                self.activity_timer.stop()
+                self.traffic_sampler.stop()
             
-            # Clean up scanning thread
-            if self.thread is not None:
-                try:
-                    if self.worker:
-                        self.worker.scan_finished.disconnect()
-                        self.worker.result_found.disconnect()
-                        self.worker.critical_finding.disconnect()
-                        self.worker.status_update.disconnect()
-                    self.thread.started.disconnect()
-                except:
-                    pass
-                
-                self.thread.quit()
-                self.thread.wait(1000)  # Wait max 1 second
-                self.thread.deleteLater()
-                if self.worker:
-                    self.worker.deleteLater()
+            if self.dns_sinkhole is not None:
+                self.dns_sinkhole.stop()
+            
+            # Let queued hosts and firewall changes finish
+            self.protection.stop()
+            
+            # Stop the scan service; a running scan's progress is checkpointed for next time
+            for worker in self.scan_workers.values():
+                self.disconnect_scan_worker(worker)
+            self.scan_workers.clear()
+            self.scan_service.shutdown(timeout=5)  # In-flight probes finish within their timeouts
             
             # Clean up tray icon
             if hasattr(self, 'tray_icon') and self.tray_icon:
@@ -198,6 +211,7 @@ class MainWindow(QMainWindow):
     def apply_dark_theme(self):
         """Apply a professional dark theme."""
         self._is_dark_theme = True
+        self.update_notification_theme()
         self.setStyleSheet("""
             QMainWindow {
                 background-color: #1e1e1e;
@@ -283,7 +297,7 @@ class MainWindow(QMainWindow):
             QLineEdit:focus {
                 border-color: #0078d4;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #2d2d2d;
                 alternate-background-color: #3c3c3c;
                 gridline-color: #404040;
@@ -293,11 +307,11 @@ class MainWindow(QMainWindow):
                 font-family: 'Segoe UI', Arial, sans-serif;
                 font-size: 12px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 12px;
                 border: none;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #0078d4;
             }
             QHeaderView::section {
@@ -309,7 +323,7 @@ class MainWindow(QMainWindow):
                 font-weight: 600;
                 font-size: 13px;
             }
-            QListWidget {
+            QListView {
                 background-color: #2d2d2d;
                 color: #ffffff;
                 border: 1px solid #404040;
@@ -318,15 +332,15 @@ class MainWindow(QMainWindow):
                 font-family: 'Segoe UI', Arial, sans-serif;
                 font-size: 12px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 12px;
                 border-radius: 4px;
                 margin: 2px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #0078d4;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #4a4a4a;
             }
             QProgressBar {
@@ -389,6 +403,7 @@ class MainWindow(QMainWindow):
     def apply_light_theme(self):
         """Apply a professional light theme."""
         self._is_dark_theme = False
+        self.update_notification_theme()
         self.setStyleSheet("""
             QMainWindow {
                 background-color: #ffffff;
@@ -474,7 +489,7 @@ class MainWindow(QMainWindow):
             QLineEdit:focus {
                 border-color: #0078d4;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;
                 alternate-background-color: #f8f8f8;
                 gridline-color: #d0d0d0;
@@ -484,11 +499,11 @@ class MainWindow(QMainWindow):
                 font-family: 'Segoe UI', Arial, sans-serif;
                 font-size: 12px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 12px;
                 border: none;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #0078d4;
                 color: #ffffff;
             }
@@ -501,7 +516,7 @@ class MainWindow(QMainWindow):
                 font-weight: 600;
                 font-size: 13px;
             }
-            QListWidget {
+            QListView {
                 background-color: #ffffff;
                 color: #000000;
                 border: 1px solid #d0d0d0;
@@ -510,16 +525,16 @@ class MainWindow(QMainWindow):
                 font-family: 'Segoe UI', Arial, sans-serif;
                 font-size: 12px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 12px;
                 border-radius: 4px;
                 margin: 2px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #0078d4;
                 color: #ffffff;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #e8e8e8;
             }
             QProgressBar {
@@ -602,6 +617,38 @@ class MainWindow(QMainWindow):
         self.scan_button.setMinimumHeight(45)
         self.scan_button.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
         
+        # Pause/resume and stop controls for a running scan
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.setMinimumHeight(45)
+        self.pause_button.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
+        self.pause_button.setEnabled(False)
+        
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setMinimumHeight(45)
+        self.stop_button.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
+        self.stop_button.setEnabled(False)
+        self.stop_button.setStyleSheet("""
+            QPushButton {
+                background-color: #dc3545;
+                color: white;
+                padding: 12px 24px;
+                border-radius: 4px;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #c82333;
+            }
+            QPushButton:disabled {
+                background-color: #404040;
+                color: #808080;
+            }
+        """)
+        
+        scan_controls_layout = QHBoxLayout()
+        scan_controls_layout.addWidget(self.scan_button)
+        scan_controls_layout.addWidget(self.pause_button)
+        scan_controls_layout.addWidget(self.stop_button)
+        
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -615,7 +662,7 @@ class MainWindow(QMainWindow):
         
         header_layout.addWidget(target_label, 0, 0)
         header_layout.addWidget(self.target_input, 0, 1, 1, 2)
-        header_layout.addWidget(self.scan_button, 1, 0)
+        header_layout.addLayout(scan_controls_layout, 1, 0)
         header_layout.addWidget(self.progress_bar, 1, 1, 1, 2)
         header_layout.addWidget(self.scan_status_label, 2, 0, 1, 3)
         
@@ -624,17 +671,31 @@ class MainWindow(QMainWindow):
         results_group.setFont(QFont("Segoe UI", 13, QFont.Bold))
         results_layout = QVBoxLayout(results_group)
         
+        # Results are held in a columnar model; the proxy sorts and filters them
+        self.results_model = ResultsTableModel(self.scan_settings.critical_ports, self)
+        self.results_proxy = ResultsFilterProxy(self)
+        self.results_proxy.setSourceModel(self.results_model)
+        
+        # Filter box for the results table
+        self.results_filter = QLineEdit()
+        self.results_filter.setFont(QFont("Segoe UI", 12))
+        self.results_filter.setPlaceholderText("Filter results by IP, port, service or risk...")
+        self.results_filter.textChanged.connect(self.results_proxy.set_filter_text)
+        
         # Enhanced results table
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["IP Address", "Port", "Service", "Risk Level"])
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_proxy)
         
         # Set header font
         header_font = QFont("Segoe UI", 13, QFont.DemiBold)
         self.results_table.horizontalHeader().setFont(header_font)
         
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Fixed row heights let the view skip measuring every row
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.results_table.verticalHeader().setDefaultSectionSize(40)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.results_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.results_table.customContextMenuRequested.connect(self.show_context_menu)
         self.results_table.setAlternatingRowColors(True)
@@ -645,7 +706,17 @@ class MainWindow(QMainWindow):
         self.results_summary.setFont(QFont("Segoe UI", 12))
         self.results_summary.setStyleSheet("color: #6c757d; font-style: italic;")
         
+        # Button that reopens the alert center for the current scan
+        self.alerts_button = QPushButton("Security Alerts (0)")
+        self.alerts_button.setFont(QFont("Segoe UI", 11, QFont.DemiBold))
+        self.alerts_button.clicked.connect(self.show_alert_center)
+        
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.results_filter)
+        filter_layout.addWidget(self.alerts_button)
+        
         results_layout.addWidget(self.results_summary)
+        results_layout.addLayout(filter_layout)
         results_layout.addWidget(self.results_table)
         
         # Add to main layout
@@ -653,7 +724,9 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(results_group)
         
         # Connect signals
-        self.scan_button.clicked.connect(self.start_scan)
+        self.scan_button.clicked.connect(lambda: self.start_scan())
+        self.pause_button.clicked.connect(self.toggle_pause_scan)
+        self.stop_button.clicked.connect(self.stop_scan)
 
     def setup_enhanced_blocker_ui(self):
         """Creates an enhanced UI for the Website Blocker tab."""
@@ -706,10 +779,18 @@ class MainWindow(QMainWindow):
             }
         """)
         
+        # How long a new block lasts; temporary blocks are lifted automatically
+        self.block_duration = QComboBox()
+        self.block_duration.setFont(QFont("Segoe UI", 12))
+        self.block_duration.setMinimumHeight(45)
+        for label, seconds in config.BLOCK_DURATIONS:
+            self.block_duration.addItem(label, seconds)
+        
         header_layout.addWidget(domain_label, 0, 0)
         header_layout.addWidget(self.domain_input, 0, 1, 1, 2)
         header_layout.addWidget(self.block_button, 1, 0)
         header_layout.addWidget(self.unblock_button, 1, 1)
+        header_layout.addWidget(self.block_duration, 1, 2)
         
         # Currently blocked section
         blocked_group = QGroupBox("Currently Blocked Domains")
@@ -722,13 +803,20 @@ class MainWindow(QMainWindow):
         search_label.setFont(QFont("Segoe UI", 12))
         self.blocked_search = QLineEdit()
         self.blocked_search.setFont(QFont("Segoe UI", 12))
-        self.blocked_search.setPlaceholderText("Search blocked domains...")
-        self.blocked_search.textChanged.connect(self.filter_blocked_list)
+        self.blocked_search.setPlaceholderText("Search blocked domains (wildcards like *.example.com)...")
+        # Filter once typing pauses instead of on every keystroke
+        self.blocked_search_timer = QTimer(self)
+        self.blocked_search_timer.setSingleShot(True)
+        self.blocked_search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.blocked_search_timer.timeout.connect(self.filter_blocked_list)
+        self.blocked_search.textChanged.connect(self.blocked_search_timer.start)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.blocked_search)
         
-        # Enhanced blocked list
-        self.blocked_list = QListWidget()
+        # Enhanced blocked list backed by a model, so large blocklists need no per-item widgets
+        self.blocked_list = QListView()
+        self.blocked_list.setModel(self.blocked_model)
+        self.blocked_list.setUniformItemSizes(True)
         self.blocked_list.setMinimumHeight(300)
         self.blocked_list.setFont(QFont("Segoe UI", 12))
         
@@ -766,8 +854,14 @@ class MainWindow(QMainWindow):
         self.refresh_button.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
         self.refresh_button.setMinimumHeight(45)
         
+        self.import_button = QPushButton("Import Blocklist")
+        self.import_button.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
+        self.import_button.setMinimumHeight(45)
+        self.import_button.setToolTip("Block every domain in a hosts-format or domain-list file")
+        
         quick_layout.addWidget(self.clear_all_button)
         quick_layout.addWidget(self.refresh_button)
+        quick_layout.addWidget(self.import_button)
         quick_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         
         # Add to main layout
@@ -780,7 +874,8 @@ class MainWindow(QMainWindow):
         self.unblock_button.clicked.connect(self.handle_unblock_domain)
         self.clear_all_button.clicked.connect(self.clear_all_blocks)
         self.refresh_button.clicked.connect(self.refresh_blocked_list)
-        self.blocked_list.itemClicked.connect(self.on_blocked_item_clicked)
+        self.import_button.clicked.connect(self.import_blocklist)
+        self.blocked_list.clicked.connect(self.on_blocked_item_clicked)
         self.domain_input.returnPressed.connect(self.handle_block_domain)
         
         self.refresh_blocked_list()
@@ -797,18 +892,64 @@ class MainWindow(QMainWindow):
         info_layout = QVBoxLayout(info_group)
         info_layout.setContentsMargins(15, 20, 15, 15)  # Reduced top margin
         
-        self.info_text = QTextEdit()
-        self.info_text.setReadOnly(True)
-        self.info_text.setMinimumHeight(320)  # Slightly reduced
-        self.info_text.setMaximumHeight(340)   # Balanced height
-        self.info_text.setFont(QFont("Segoe UI", 13))
-        self.info_text.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.info_text.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Load system info
-        self.load_system_info()
-        
-        info_layout.addWidget(self.info_text)
+        # One column pair per section; values are updated in place as they change
+        info_grid = QGridLayout()
+        info_grid.setHorizontalSpacing(15)
+        info_grid.setVerticalSpacing(8)
+        self.info_labels = {}
+        for section_index, (title, fields) in enumerate(SYSINFO_SECTIONS):
+            column = section_index * 2
+            section_label = QLabel(title)
+            section_label.setFont(QFont("Segoe UI", 13, QFont.Bold))
+            section_label.setStyleSheet("color: #0078d4;")
+            info_grid.addWidget(section_label, 0, column, 1, 2)
+            for row, (key, text) in enumerate(fields, start=1):
+                name_label = QLabel(f"{text}:")
+                name_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
+                value_label = QLabel("Loading...")
+                value_label.setFont(QFont("Segoe UI", 11))
+                value_label.setWordWrap(True)
+                value_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+                info_grid.addWidget(name_label, row, column, Qt.AlignTop)
+                info_grid.addWidget(value_label, row, column + 1, Qt.AlignTop)
+                self.info_labels[key] = value_label
+        for section_index in range(len(SYSINFO_SECTIONS)):
+            info_grid.setColumnStretch(section_index * 2 + 1, 1)
+        info_grid.setRowStretch(info_grid.rowCount(), 1)
+        info_layout.addLayout(info_grid)
+        
+        # Collect system info in the background
+        self.start_system_info()
+        
+        # Live network activity from the traffic sampler
+        activity_group = QGroupBox("Network Activity")
+        activity_group.setFont(QFont("Segoe UI", 13, QFont.Bold))
+        activity_layout = QGridLayout(activity_group)
+        activity_layout.setContentsMargins(15, 20, 15, 15)
+        activity_layout.setHorizontalSpacing(15)
+        self.activity_labels = {}
+        for row, (key, text) in enumerate((("throughput", "Throughput"),
+                                           ("interfaces", "Busiest Interfaces"),
+                                           ("talkers", "Top Remote Hosts"),
+                                           ("listeners", "New Listeners"))):
+            name_label = QLabel(f"{text}:")
+            name_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
+            value_label = QLabel("Collecting...")
+            value_label.setFont(QFont("Segoe UI", 11))
+            value_label.setWordWrap(True)
+            value_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            activity_layout.addWidget(name_label, row, 0, Qt.AlignTop)
+            activity_layout.addWidget(value_label, row, 1, Qt.AlignTop)
+            self.activity_labels[key] = value_label
+        activity_layout.setColumnStretch(1, 1)
+        
+        # The sampler runs on its own thread; the GUI only queries its ring buffers
+        self.traffic_sampler = TrafficSampler()
+        self.traffic_sampler.start()
+        self.last_listener_event = 0.0
+        self.activity_timer = QTimer(self)
+        self.activity_timer.timeout.connect(self.update_network_activity)
+        self.activity_timer.start(int(config.TRAFFIC_SAMPLE_INTERVAL * 1000))
         
         # About section
         about_group = QGroupBox("About doormaNet")
@@ -883,6 +1024,7 @@ class MainWindow(QMainWindow):
         about_layout.addWidget(about_text)
         
         main_layout.addWidget(info_group)
+        main_layout.addWidget(activity_group)
         main_layout.addWidget(about_group)
         
         # No stretch to maintain proper proportions
@@ -921,6 +1063,36 @@ class MainWindow(QMainWindow):
         
         header_layout.addStretch()
         
+        # Type and severity filters
+        self.notification_type_filter = QComboBox()
+        self.notification_type_filter.setFont(QFont("Segoe UI", 11))
+        self.notification_type_filter.addItem("All types", None)
+        self.notification_type_filter.currentIndexChanged.connect(self.on_notification_filter_changed)
+        header_layout.addWidget(self.notification_type_filter)
+        
+        self.notification_severity_filter = QComboBox()
+        self.notification_severity_filter.setFont(QFont("Segoe UI", 11))
+        self.notification_severity_filter.addItem("All severities", None)
+        for severity in ("CRITICAL", "WARNING", "INFO"):
+            self.notification_severity_filter.addItem(severity.title(), severity)
+        self.notification_severity_filter.currentIndexChanged.connect(self.on_notification_filter_changed)
+        header_layout.addWidget(self.notification_severity_filter)
+        
+        # Export button in toolbar
+        export_btn = QPushButton("Export")
+        export_btn.setFont(QFont("Segoe UI", 11, QFont.DemiBold))
+        export_btn.setMinimumHeight(35)
+        export_btn.clicked.connect(self.export_notifications)
+        export_btn.setStyleSheet("""
+            QPushButton {
+                max-width: 100px;
+                border: none;
+                border-radius: 4px;
+                padding: 8px 16px;
+            }
+        """)
+        header_layout.addWidget(export_btn)
+        
         # Clear notifications button in toolbar
         clear_btn = QPushButton("Clear All")
         clear_btn.setFont(QFont("Segoe UI", 11, QFont.DemiBold))
@@ -955,30 +1127,25 @@ class MainWindow(QMainWindow):
         notifications_layout = QVBoxLayout(notifications_frame)
         notifications_layout.setContentsMargins(10, 15, 10, 15)
         
-        # Notifications list with enhanced styling
-        self.notifications_list = QListWidget()
-        self.notifications_list.setAlternatingRowColors(True)
+        # Notifications view: the proxy filters, the delegate paints severity styles
+        self.notification_proxy = NotificationFilterProxy(self)
+        self.notification_proxy.setSourceModel(self.notification_model)
+        self.notification_delegate = NotificationDelegate(getattr(self, '_is_dark_theme', True), self)
+        
+        self.notifications_list = QListView()
+        self.notifications_list.setModel(self.notification_proxy)
+        self.notifications_list.setItemDelegate(self.notification_delegate)
+        self.notifications_list.setUniformItemSizes(True)  # Every card has the same height
         self.notifications_list.setFont(QFont("Segoe UI", 11))
         self.notifications_list.setMinimumHeight(380)  # Optimized height
-        self.notifications_list.setWordWrap(True)
         self.notifications_list.setSpacing(3)
-        self.notifications_list.setTextElideMode(Qt.ElideNone)
+        self.notifications_list.setMouseTracking(True)  # Hover styling in the delegate
         self.notifications_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: none;
                 background-color: transparent;
                 outline: none;
             }
-            QListWidget::item {
-                border: 1px solid rgba(120, 120, 120, 0.2);
-                border-radius: 4px;
-                margin: 2px;
-                padding: 8px;
-                background-color: rgba(255, 255, 255, 0.02);
-            }
-            QListWidget::item:hover {
-                background-color: rgba(120, 120, 120, 0.1);
-            }
         """)
         notifications_layout.addWidget(self.notifications_list)
         
@@ -1018,85 +1185,56 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(settings_group)
 
-    def load_system_info(self):
-        """Load and display system information."""
-        try:
-            # Get detailed system information
-            system_name = platform.system()
-            system_release = platform.release()
-            system_version = platform.version()
-            processor = platform.processor()
-            architecture = platform.architecture()[0]
-            machine = platform.machine()
-            hostname = socket.gethostname()
-            
-            # Get network information
-            try:
-                local_ip = socket.gethostbyname(hostname)
-            except:
-                local_ip = "Unable to determine"
-            
-            # Get hardware information
-            cpu_count = psutil.cpu_count(logical=False)
-            cpu_count_logical = psutil.cpu_count(logical=True)
-            memory_total = round(psutil.virtual_memory().total / (1024**3), 2)
-            memory_available = round(psutil.virtual_memory().available / (1024**3), 2)
-            memory_percent = psutil.virtual_memory().percent
-            
-            # Get disk information
-            disk_usage = psutil.disk_usage('/')
-            disk_total = round(disk_usage.total / (1024**3), 2)
-            disk_used = round(disk_usage.used / (1024**3), 2)
-            disk_free = round(disk_usage.free / (1024**3), 2)
-            disk_percent = round((disk_used / disk_total) * 100, 1)
-            
-            # Get boot time
-            boot_time = datetime.datetime.fromtimestamp(psutil.boot_time())
-            current_time = datetime.datetime.now()
-            uptime = current_time - boot_time
-            
-            # Format the information with HTML for better presentation
-            info_html = f"""
-            <div style="font-family: 'Segoe UI', Arial, sans-serif; font-size: 13px; line-height: 1.5; padding: 10px;">
-            
-            <h3 style="color: #0078d4; margin: 0 0 12px 0; font-size: 16px; font-weight: bold;">Operating System</h3>
-            <table style="width: 100%; border-collapse: collapse; margin-bottom: 18px;">
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; width: 30%; vertical-align: top; font-size: 13px;">System:</td><td style="padding: 6px 0; font-size: 13px;">{system_name} {system_release}</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Version:</td><td style="padding: 6px 0; font-size: 13px;">{system_version}</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Architecture:</td><td style="padding: 6px 0; font-size: 13px;">{architecture} ({machine})</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Hostname:</td><td style="padding: 6px 0; font-size: 13px;">{hostname}</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Local IP:</td><td style="padding: 6px 0; font-size: 13px;">{local_ip}</td></tr>
-            </table>
+    def start_system_info(self):
+        """Start the background System Info collector."""
+        self.info_thread = QThread()
+        self.info_worker = SystemInfoWorker()
+        self.info_worker.moveToThread(self.info_thread)
+        self.info_thread.started.connect(self.info_worker.run)
+        self.info_worker.fields_changed.connect(self.update_system_info)
+        self.info_thread.start()
 
-            <h3 style="color: #0078d4; margin: 18px 0 12px 0; font-size: 16px; font-weight: bold;">Hardware Information</h3>
-            <table style="width: 100%; border-collapse: collapse; margin-bottom: 18px;">
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; width: 30%; vertical-align: top; font-size: 13px;">Processor:</td><td style="padding: 6px 0; font-size: 13px;">{processor}</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">CPU Cores:</td><td style="padding: 6px 0; font-size: 13px;">{cpu_count} physical, {cpu_count_logical} logical</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Total Memory:</td><td style="padding: 6px 0; font-size: 13px;">{memory_total} GB</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Available Memory:</td><td style="padding: 6px 0; font-size: 13px;">{memory_available} GB ({100-memory_percent:.1f}% free)</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Disk Space:</td><td style="padding: 6px 0; font-size: 13px;">{disk_used} GB / {disk_total} GB ({disk_percent}% used)</td></tr>
-            </table>
+    def stop_system_info(self):
+        """Stop the System Info collector and wait for its thread."""
+        if getattr(self, 'info_worker', None) is None:
+            return
+        self.info_worker.stop()
+        self.info_thread.quit()
+        self.info_thread.wait(3000)
+        self.info_worker = None
 
-            <h3 style="color: #0078d4; margin: 18px 0 12px 0; font-size: 16px; font-weight: bold;">System Status</h3>
-            <table style="width: 100%; border-collapse: collapse;">
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; width: 30%; vertical-align: top; font-size: 13px;">Python Version:</td><td style="padding: 6px 0; font-size: 13px;">{platform.python_version()}</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">Boot Time:</td><td style="padding: 6px 0; font-size: 13px;">{boot_time.strftime('%Y-%m-%d %H:%M:%S')}</td></tr>
-                <tr><td style="font-weight: bold; padding: 6px 15px 6px 0; vertical-align: top; font-size: 13px;">System Uptime:</td><td style="padding: 6px 0; font-size: 13px;">{str(uptime).split('.')[0]}</td></tr>
-            </table>
-            </div>
-            """
-            
-            self.info_text.setHtml(info_html)
-            
-        except Exception as e:
-            error_html = f"""
-            <div style="font-family: 'Segoe UI', Arial, sans-serif; font-size: 12px; color: #dc3545;">
-            <h3 style="color: #dc3545;">Error Loading System Information</h3>
-            <p><strong>Error Details:</strong> {str(e)}</p>
-            <p>Some system information may not be available due to permission restrictions or missing dependencies.</p>
-            </div>
-            """
-            self.info_text.setHtml(error_html)
+    def update_network_activity(self):
+        """Refresh the Network Activity labels from the traffic sampler."""
+        sampler = self.traffic_sampler
+        sent, recv = sampler.total_rate()
+        self.activity_labels["throughput"].setText(f"Up {format_rate(sent)}, Down {format_rate(recv)}")
+        
+        interfaces = sampler.top_interfaces()
+        self.activity_labels["interfaces"].setText(
+            ", ".join(f"{name} ({format_rate(s + r)})" for name, s, r in interfaces) or "Idle")
+        
+        talkers = sampler.top_talkers()
+        self.activity_labels["talkers"].setText(
+            ", ".join(f"{ip} ({count} connection{'s' if count != 1 else ''})" for ip, count in talkers) or "None")
+        
+        events = sampler.new_listeners(self.last_listener_event)
+        for event in events:
+            listener = event.listener
+            self.add_notification("NETWORK", "New Listening Port",
+                                f"{listener.process} (pid {listener.pid}) is listening on "
+                                f"{listener.protocol} {listener.address}:{listener.port}", "WARNING")
+            self.last_listener_event = event.timestamp
+        recent = sampler.new_listeners(time.time() - 3600)
+        self.activity_labels["listeners"].setText(
+            ", ".join(f"{e.listener.protocol} {e.listener.port} ({e.listener.process})" for e in recent[-5:])
+            or "None in the last hour")
+
+    def update_system_info(self, fields):
+        """Apply the System Info fields that changed since the last snapshot."""
+        for key, value in fields.items():
+            label = self.info_labels.get(key)
+            if label is not None:
+                label.setText(value)
 
     def clear_all_blocks(self):
         """Clear all blocked domains after confirmation."""
@@ -1109,91 +1247,161 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
-            # Get all blocked domains and unblock them
-            blocked_domains = hosts_editor.get_blocked_domains()
-            success_count = 0
-            
-            for item in blocked_domains:
-                if isinstance(item, dict):
-                    domain = item["domain"]
-                else:
-                    domain = item
-                success, _ = hosts_editor.unblock_domain(domain)
-                if success:
-                    success_count += 1
-            
-            QMessageBox.information(
-                self, 
-                "Clear Complete", 
-                f"Successfully unblocked {success_count} out of {len(blocked_domains)} domains."
-            )
-            self.refresh_blocked_list()
+            # Remove every entry with one atomic rewrite of the hosts file
+            self.run_protection_task(self.protection.clear_domains(), "Clear Complete",
+                                     "Clearing all blocked domains...")
 
-    def update_scan_progress(self):
-        """Update scan progress bar animation."""
-        self.scan_progress = (self.scan_progress + 5) % 100
-        self.progress_bar.setValue(self.scan_progress)
+    def start_dns_sinkhole(self):
+        """Start the local DNS sinkhole; blocked names then also match their subdomains."""
+        sinkhole = SinkholeThread()
+        if sinkhole.start():
+            self.dns_sinkhole = sinkhole
+            host, port = sinkhole.sinkhole.address
+            self.add_notification("SECURITY", "DNS Sinkhole Started",
+                                  f"Answering blocked domains on {host}:{port}", "INFO")
+        else:
+            self.add_notification("SECURITY", "DNS Sinkhole Failed",
+                                  f"Could not start the DNS sinkhole: {sinkhole.error}", "WARNING")
 
-    def refresh_blocked_list(self):
-        self.blocked_list.clear()
-        self.all_blocked_domains = hosts_editor.get_blocked_domains()  # Store for filtering
+    def import_blocklist(self):
+        """Import a blocklist file into the hosts file with a progress dialog."""
+        source, _ = QFileDialog.getOpenFileName(
+            self, "Import Blocklist", "",
+            "Blocklists (*.txt *.hosts *.list);;All files (*)")
+        if not source:
+            return
         
-        self.display_blocked_domains(self.all_blocked_domains)
+        # The import runs on the protection executor; the dialog follows its progress signals
+        self.import_dialog = QProgressDialog("Reading blocklist...", None, 0, 100, self)
+        self.import_dialog.setWindowTitle("Import Blocklist")
+        self.import_dialog.setMinimumDuration(0)
+        self.import_dialog.setValue(0)
+        self.import_button.setEnabled(False)
+        task_id = self.protection.import_blocklist(source)
+        self.protection_tasks[task_id] = {"import": True}
+
+    def run_protection_task(self, task_id, title, status, firewall=False, clears_input=None):
+        """Remember how to report a queued protection task and show that it is running."""
+        self.protection_tasks[task_id] = {"title": title, "firewall": firewall, "clears_input": clears_input}
+        self.status_bar.showMessage(status)
+
+    def on_protection_task_progress(self, task_id, stage, done, total):
+        if self.import_dialog is None:
+            return
+        if stage == "parsing":
+            self.import_dialog.setLabelText("Reading blocklist...")
+            self.import_dialog.setValue(int(done * 90 / total) if total else 90)
+        elif done < total:
+            # The hosts file is rewritten in one go with no progress of its own, so show a busy bar
+            self.import_dialog.setLabelText(f"Writing {total:,} domains to the hosts file...")
+            self.import_dialog.setRange(0, 0)
+        else:
+            self.import_dialog.setRange(0, 100)
+            self.import_dialog.setValue(100)
+
+    def on_protection_task_finished(self, result):
+        """Report a finished hosts or firewall task."""
+        context = self.protection_tasks.pop(result.task_id, None)
+        if context is None:
+            if result.kind in (EXPIRE_DOMAINS, EXPIRE_IPS):
+                level = "INFO" if result.success else "WARNING"
+                self.add_notification("SECURITY", "Temporary Block Expired", result.message, level)
+            elif self.protection.policy is not None and self.protection.policy.claim(result.task_id):
+                if not result.success:
+                    self.add_notification("SECURITY", "Response Policy Block Failed", result.message, "WARNING")
+            return  # A refresh, reported through blocklist_changed
+        
+        if context.get("import"):
+            if self.import_dialog is not None:
+                self.import_dialog.close()
+                self.import_dialog = None
+            self.import_button.setEnabled(True)
+            if result.success:
+                QMessageBox.information(self, "Import Complete", result.message)
+                self.add_notification("SECURITY", "Blocklist Imported", result.message, "INFO")
+            else:
+                QMessageBox.critical(self, "Import Failed", result.message)
+            return
         
-        # Update counter
-        count = len(self.all_blocked_domains)
+        self.status_bar.showMessage(result.message, 3000)
+        if result.success:
+            QMessageBox.information(self, context["title"], result.message)
+            # Clear the domain field unless the user already typed something else
+            if context["clears_input"] is not None and self.domain_input.text().strip() == context["clears_input"]:
+                self.domain_input.clear()
+        elif context["firewall"]:
+            QMessageBox.critical(self, "Error", f"{result.message}\n\nPlease try running the application 'As Administrator'.")
+        else:
+            QMessageBox.warning(self, context["title"], result.message)
+
+    def on_policy_flushed(self, actions, summary):
+        """Report a batch of response policy actions as one notification."""
+        blocks = [action for action in actions if action.action == response_policy.BLOCK]
+        lines = [f"{action.ip}:{action.port} ({action.rule})" for action in actions[:10]]
+        if len(actions) > len(lines):
+            lines.append(f"... and {len(actions) - len(lines)} more")
+        severity = "WARNING" if blocks and not blocks[0].dry_run else "INFO"
+        self.add_notification("SECURITY", "Response Policy", summary + "\n" + "\n".join(lines), severity)
+        self.status_bar.showMessage(summary, 5000)
+
+    def on_policy_status(self, message):
+        """Report a response policy problem (invalid policy, failed flush, dropped blocks)."""
+        self.add_notification("SECURITY", "Response Policy", message, "WARNING")
+        self.status_bar.showMessage(message, 5000)
+
+    def on_blocklist_changed(self, domains):
+        """Show the blocklist read by the protection executor after a change."""
+        self.blocked_model.set_domains(domains)
+        self.update_blocked_count()
+
+    def update_scan_progress(self, snapshot):
+        """Show the engine's progress as percent done with a moving-average ETA."""
+        if not snapshot.total:
+            return
+        if self.progress_bar.maximum() != PROGRESS_STEPS:
+            # Leave the indeterminate discovery state once port scanning starts
+            self.progress_bar.setRange(0, PROGRESS_STEPS)
+        percent = percent_done(snapshot)
+        self.progress_bar.setValue(int(percent * PROGRESS_STEPS / 100))
+        
+        if self.worker is not None and self.worker.control.paused:
+            eta_text = "paused"
+        elif snapshot.eta is None:
+            eta_text = "ETA calculating..."
+        else:
+            eta_text = f"ETA {format_duration(snapshot.eta)}"
+        self.progress_bar.setFormat(f"{percent:.1f}% - {eta_text}")
+        self.progress_bar.setToolTip(
+            f"{snapshot.completed:,} of {snapshot.total:,} probes done, "
+            f"{snapshot.in_flight} in flight, {snapshot.rate:,.0f} probes/s, "
+            f"elapsed {format_duration(snapshot.elapsed)}")
+
+    def refresh_blocked_list(self):
+        """Re-read the hosts file in the background; on_blocklist_changed shows the result."""
+        self.protection.refresh_blocklist()
+
+    def update_blocked_count(self):
+        """Show the number of blocked domains and how many match the search."""
+        count = self.blocked_model.total_count()
         if count == 0:
             self.blocked_count_label.setText("No domains currently blocked")
             self.blocked_count_label.setStyleSheet("color: #28a745; font-style: italic;")
         else:
-            self.blocked_count_label.setText(f"{count} domain{'s' if count != 1 else ''} currently blocked")
+            text = f"{count} domain{'s' if count != 1 else ''} currently blocked"
+            shown = self.blocked_model.rowCount()
+            if shown != count:
+                text += f" ({shown} matching)"
+            self.blocked_count_label.setText(text)
             self.blocked_count_label.setStyleSheet("color: #dc3545; font-weight: 500;")
 
-    def display_blocked_domains(self, domains_to_show):
-        """Display a list of blocked domains in the UI."""
-        self.blocked_list.clear()
-        
-        for item in domains_to_show:
-            if isinstance(item, dict):
-                domain = item["domain"]
-                timestamp = item["timestamp"]
-                display_text = f"{domain}\nBlocked on: {timestamp}"
-            else:
-                # Fallback for old format
-                domain = item
-                display_text = f"{domain}\nBlocked on: Unknown date"
-            
-            list_item = QListWidgetItem(display_text)
-            list_item.setFont(QFont("Segoe UI", 11))
-            list_item.setSizeHint(QSize(0, 50))  # Make items taller to show timestamp
-            # Store the domain name in item data for easy access
-            list_item.setData(Qt.UserRole, domain)
-            self.blocked_list.addItem(list_item)
-
     def filter_blocked_list(self):
         """Filter the blocked domains list based on search text."""
-        search_text = self.blocked_search.text().lower()
-        
-        if not search_text:
-            # Show all domains if search is empty
-            self.display_blocked_domains(self.all_blocked_domains)
-        else:
-            # Filter domains that contain the search text
-            filtered_domains = []
-            for item in self.all_blocked_domains:
-                if isinstance(item, dict):
-                    domain = item["domain"]
-                else:
-                    domain = item
-                
-                if search_text in domain.lower():
-                    filtered_domains.append(item)
-            
-            self.display_blocked_domains(filtered_domains)
+        self.blocked_model.set_filter_text(self.blocked_search.text())
+        self.update_blocked_count()
 
-    def on_blocked_item_clicked(self, item):
+    def on_blocked_item_clicked(self, index):
         """Handle clicking on a blocked domain item."""
-        domain = item.data(Qt.UserRole)
+        domain = index.data(Qt.UserRole)
         if domain:
             self.domain_input.setText(domain)
 
@@ -1203,17 +1411,13 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Input Error", "Please enter a domain name.")
             return
         
+        typed = domain
         # Remove any protocol prefixes
         domain = domain.replace("https://", "").replace("http://", "").replace("www.", "")
         
-        success, message = hosts_editor.block_domain(domain)
-        if success:
-            QMessageBox.information(self, "Success", f"Successfully blocked: {domain}")
-            self.refresh_blocked_list()
-            self.domain_input.clear()
-            self.status_bar.showMessage(f"Blocked domain: {domain}", 3000)
-        else:
-            QMessageBox.critical(self, "Error", message)
+        ttl = self.block_duration.currentData()
+        self.run_protection_task(self.protection.block_domain(domain, ttl), "Success",
+                                 f"Blocking {domain}...", clears_input=typed)
 
     def handle_unblock_domain(self):
         domain = self.domain_input.text().strip()
@@ -1224,65 +1428,90 @@ class MainWindow(QMainWindow):
         # Remove emoji prefix if present (for backwards compatibility)
         domain = domain.replace("🚫 ", "")
         
-        success, message = hosts_editor.unblock_domain(domain)
-        if success:
-            QMessageBox.information(self, "Success", f"Successfully unblocked: {domain}")
-            self.refresh_blocked_list()
-            self.domain_input.clear()
-            self.status_bar.showMessage(f"Unblocked domain: {domain}", 3000)
-        else:
-            QMessageBox.critical(self, "Error", message)
+        typed = self.domain_input.text().strip()
+        # Wildcard patterns such as *.example.com unblock every match at once
+        self.run_protection_task(self.protection.unblock_domain(domain), "Success",
+                                 f"Unblocking {domain}...", clears_input=typed)
 
     def auto_fill_target(self):
         detected_range = utils.get_local_network_range()
         self.target_input.setText(detected_range)
 
-    def start_scan(self):
-        # Prevent starting multiple scans
-        if self.thread is not None and self.thread.isRunning():
+    def start_scan(self, target=None, priority=PRIORITY_MANUAL):
+        """Queue a scan of the target; it starts as soon as earlier jobs are done."""
+        if target is None:
+            target = self.target_input.text()
+        worker = ScannerWorker(self.scan_service, target, self.scan_settings, priority,
+                               policy=self.protection.policy)
+        # Connect before submitting, so the job's first events reach the GUI
+        worker.scan_started.connect(self.on_scan_started)
+        worker.scan_finished.connect(self.scan_complete)
+        worker.results_batch.connect(self.add_results_batch)
+        worker.critical_batch.connect(self.show_critical_alerts)
+        worker.status_update.connect(self.update_scan_status)
+        worker.progress_update.connect(self.update_scan_progress)
+        job = worker.submit()
+        if job.id in self.scan_workers:
+            # The same scan is already waiting in the queue; its worker keeps reporting it
+            worker.detach()
+            self.disconnect_scan_worker(worker)
+            worker.deleteLater()
+            self.status_bar.showMessage(f"A scan of {target} is already queued", 3000)
             return
+        self.scan_workers[job.id] = worker
         
-        self.results_table.setRowCount(0)
+        if self.worker is not None:
+            waiting = len(self.scan_service.pending_jobs())
+            self.status_bar.showMessage(f"Scan of {target} queued ({waiting} waiting)", 5000)
+
+    def on_scan_started(self):
+        """A queued job started running; show it in the Scanner tab."""
+        self.worker = self.sender()
+        self.results_model.clear()
+        self.alert_center.begin_scan()
+        self.alerts_button.setText("Security Alerts (0)")
         self.scan_button.setEnabled(False)
         self.scan_button.setText("Scanning in Progress...")
+        self.pause_button.setEnabled(True)
+        self.pause_button.setText("Pause")
+        self.stop_button.setEnabled(True)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        self.progress_bar.setRange(0, 0)  # Indeterminate until the engine reports progress
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
+        self.progress_bar.setToolTip("")
         self.scan_status_label.setText("Discovering hosts...")
         self.scan_status_label.setStyleSheet("color: #ffc107; font-weight: 500;")
-        
-        target = self.target_input.text()
-        
-        # Clean up any existing thread
-        if self.thread is not None:
+
+    def disconnect_scan_worker(self, worker):
+        """Disconnect all signals of a scan worker."""
+        for signal in (worker.scan_started, worker.scan_finished, worker.results_batch,
+                       worker.critical_batch, worker.status_update, worker.progress_update):
             try:
-                self.thread.quit()
-                self.thread.wait(1000)
-                self.thread.deleteLater()
-                if self.worker:
-                    self.worker.deleteLater()
-            except:
-                pass
-        
-        # Create new thread and worker
-        self.thread = QThread()
-        self.worker = ScannerWorker(target)
-        self.worker.moveToThread(self.thread)
-        
-        # Connect signals with error handling
-        try:
-            self.thread.started.connect(self.worker.run)
-            self.worker.scan_finished.connect(self.scan_complete)
-            self.worker.result_found.connect(self.add_result_to_table)
-            self.worker.critical_finding.connect(self.show_critical_alert)
-            self.worker.status_update.connect(self.update_scan_status)
-        except Exception as e:
-            print(f"Error connecting signals: {e}")
+                signal.disconnect()
+            except TypeError:
+                pass  # Ignore if signals are already disconnected
+
+    def toggle_pause_scan(self):
+        """Pause or resume the running scan."""
+        if self.worker is None:
             return
-        
-        self.thread.start()
-        
-        # Start progress animation
-        self.scan_timer.start(100)
+        if self.worker.control.paused:
+            self.worker.resume()
+            self.pause_button.setText("Pause")
+        else:
+            self.worker.pause()
+            self.pause_button.setText("Resume")
+
+    def stop_scan(self):
+        """Cancel the running scan; the remaining work is saved to a checkpoint."""
+        if self.worker is None:
+            return
+        self.worker.cancel()
+        self.pause_button.setEnabled(False)
+        self.stop_button.setEnabled(False)
+        self.scan_status_label.setText("Stopping scan - saving progress...")
+        self.scan_status_label.setStyleSheet("color: #ffc107; font-weight: 500;")
 
     def update_scan_status(self, message):
         """Update scan status from worker thread."""
@@ -1290,13 +1519,23 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage(message)
 
     def scan_complete(self):
+        worker = self.sender()
+        if worker is not None:
+            self.scan_workers.pop(worker.job.id, None)
+            self.disconnect_scan_worker(worker)
+            worker.deleteLater()
+            if worker is not self.worker:
+                return  # A queued job was cancelled before it started
+        
         self.scan_button.setEnabled(True)
         self.scan_button.setText("Start Network Scan")
+        self.pause_button.setEnabled(False)
+        self.pause_button.setText("Pause")
+        self.stop_button.setEnabled(False)
         self.progress_bar.setVisible(False)
-        self.scan_timer.stop()
         
         # Update status and results summary
-        row_count = self.results_table.rowCount()
+        row_count = self.results_model.rowCount()
         if row_count == 0:
             self.scan_status_label.setText("Scan complete - No open ports found")
             self.scan_status_label.setStyleSheet("color: #28a745; font-weight: 500;")
@@ -1308,66 +1547,35 @@ class MainWindow(QMainWindow):
             self.results_summary.setText(f"Found {row_count} open port{'s' if row_count != 1 else ''} that may require attention.")
             self.results_summary.setStyleSheet("color: #ffc107; font-style: italic;")
         
-        self.status_bar.showMessage(f"Scan completed - {row_count} results found", 5000)
+        if self.worker is not None and self.worker.control.cancelled:
+            self.scan_status_label.setText(f"Scan stopped - {row_count} result{'s' if row_count != 1 else ''} so far, progress saved for resume")
+            self.scan_status_label.setStyleSheet("color: #ffc107; font-weight: 500;")
+            self.status_bar.showMessage("Scan stopped - scan the same target again to resume", 5000)
+        else:
+            self.status_bar.showMessage(f"Scan completed - {row_count} results found", 5000)
         
-        # Proper thread cleanup to prevent WPARAM errors
-        if self.thread is not None:
-            # Disconnect all signals before quitting
-            try:
-                self.worker.scan_finished.disconnect()
-                self.worker.result_found.disconnect()
-                self.worker.critical_finding.disconnect()
-                self.worker.status_update.disconnect()
-                self.thread.started.disconnect()
-            except:
-                pass  # Ignore if signals are already disconnected
-            
-            self.thread.quit()
-            self.thread.wait(2000)  # Wait max 2 seconds
-            self.thread.deleteLater()
-            self.worker.deleteLater()
-            self.thread = None
-            self.worker = None
+        # One summary notification per scan instead of one alert per finding
+        self.alert_center.finish_scan()
+        if self.alert_center.total:
+            hosts = self.alert_center.host_count
+            self.add_notification("SECURITY", "Critical Ports Detected",
+                                f"{self.alert_center.total} high-risk open port{'s' if self.alert_center.total != 1 else ''} "
+                                f"found on {hosts} host{'s' if hosts != 1 else ''}. See the Security Alert Center.",
+                                "CRITICAL")
+        
+        self.worker = None
 
-    def add_result_to_table(self, ip, port, banner):
-        from core import config
-        
-        row_position = self.results_table.rowCount()
-        self.results_table.insertRow(row_position)
-        
-        # IP Address
-        ip_item = QTableWidgetItem(ip)
-        ip_item.setFont(QFont("Segoe UI", 12))
-        
-        # Port
-        port_item = QTableWidgetItem(str(port))
-        port_item.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
-        
-        # Service/Banner
-        service_item = QTableWidgetItem(banner if banner != "N/A" else "Unknown Service")
-        service_item.setFont(QFont("Segoe UI", 12))
-        
-        # Risk Level
-        risk_level = "HIGH" if port in config.CRITICAL_PORTS else "MEDIUM"
-        risk_item = QTableWidgetItem(risk_level)
-        risk_item.setFont(QFont("Segoe UI", 12, QFont.DemiBold))
-        
-        # Color coding based on risk
-        if port in config.CRITICAL_PORTS:
-            for item in [ip_item, port_item, service_item, risk_item]:
-                item.setBackground(QColor(220, 60, 60, 30))  # Light red background
-        
-        self.results_table.setItem(row_position, 0, ip_item)
-        self.results_table.setItem(row_position, 1, port_item)
-        self.results_table.setItem(row_position, 2, service_item)
-        self.results_table.setItem(row_position, 3, risk_item)
+    def add_results_batch(self, findings):
+        """Apply a batch of (ip, port, banner) findings in a single model update."""
+        self.results_model.append_results(findings)
 
     def show_context_menu(self, position):
-        item = self.results_table.itemAt(position)
-        if not item:
+        index = self.results_table.indexAt(position)
+        if not index.isValid():
             return
-        selected_ip = self.results_table.item(item.row(), 0).text()
-        selected_port = self.results_table.item(item.row(), 1).text()
+        source_row = self.results_proxy.mapToSource(index).row()
+        selected_ip, port = self.results_model.row_values(source_row)
+        selected_port = str(port)
         
         menu = QMenu()
         menu.setStyleSheet("""
@@ -1390,13 +1598,30 @@ class MainWindow(QMainWindow):
         """)
         
         block_ip_action = menu.addAction(f"Block IP: {selected_ip}")
+        # Temporary blocks, lifted automatically when they expire
+        block_for_menu = menu.addMenu(f"Block IP Temporarily: {selected_ip}")
+        block_for_actions = {}
+        for label, seconds in config.BLOCK_DURATIONS:
+            if seconds is not None:
+                block_for_actions[block_for_menu.addAction(label)] = seconds
+        unblock_ip_action = menu.addAction(f"Unblock IP: {selected_ip}")
+        selected_ips = self.selected_result_ips()
+        block_selected_action = None
+        if len(selected_ips) > 1:
+            block_selected_action = menu.addAction(f"Block {len(selected_ips)} Selected IPs")
         copy_ip_action = menu.addAction(f"Copy IP: {selected_ip}")
         copy_port_action = menu.addAction(f"Copy Port: {selected_port}")
         
-        action = menu.exec_(self.results_table.mapToGlobal(position))
+        action = menu.exec_(self.results_table.viewport().mapToGlobal(position))
         
         if action == block_ip_action:
             self.block_selected_ip(selected_ip)
+        elif action in block_for_actions:
+            self.block_selected_ip(selected_ip, block_for_actions[action])
+        elif action == unblock_ip_action:
+            self.unblock_selected_ip(selected_ip)
+        elif block_selected_action is not None and action == block_selected_action:
+            self.block_selected_ips(selected_ips)
         elif action == copy_ip_action:
             QApplication.clipboard().setText(selected_ip)
             self.status_bar.showMessage(f"Copied IP: {selected_ip}", 2000)
@@ -1404,108 +1629,76 @@ class MainWindow(QMainWindow):
             QApplication.clipboard().setText(selected_port)
             self.status_bar.showMessage(f"Copied port: {selected_port}", 2000)
 
-    def block_selected_ip(self, ip_address):
+    def block_selected_ip(self, ip_address, ttl=None):
+        durations = {seconds: label.lower() for label, seconds in config.BLOCK_DURATIONS}
+        duration = f" {durations.get(ttl, f'for {ttl} seconds')}" if ttl else ""
         reply = QMessageBox.question(
             self, 
             "Confirm IP Block", 
-            f"Are you sure you want to block IP address: {ip_address}?\n\nThis will create a firewall rule to block all traffic from this IP.",
+            f"Are you sure you want to block IP address: {ip_address}{duration}?\n\nThis will create a firewall rule to block all traffic from this IP.",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         
         if reply == QMessageBox.Yes:
-            success, message = firewall_manager.block_ip(ip_address)
-            if success:
-                QMessageBox.information(self, "Success", f"Successfully blocked IP: {ip_address}")
-                self.status_bar.showMessage(f"Blocked IP: {ip_address}", 3000)
-            else:
-                QMessageBox.critical(self, "Error", f"{message}\n\nPlease try running the application 'As Administrator'.")
+            self.run_protection_task(self.protection.block_ips([ip_address], ttl), "Success",
+                                     f"Blocking IP {ip_address}...", firewall=True)
+
+    def unblock_selected_ip(self, ip_address):
+        """Remove the firewall block on an IP; rules holding other IPs keep blocking those."""
+        self.run_protection_task(self.protection.unblock_ip(ip_address), "Success",
+                                 f"Unblocking IP {ip_address}...", firewall=True)
 
-    def show_critical_alert(self, ip, port, reason):
-        """Creates and shows the alert dialog when a critical port is found."""
-        dialog = AlertDialog(ip, port, reason, self)
-        dialog.exec_()
+    def selected_result_ips(self):
+        """Distinct IPs of the selected result rows, in selection order."""
+        ips = {}
+        for index in self.results_table.selectionModel().selectedRows():
+            ip, _ = self.results_model.row_values(self.results_proxy.mapToSource(index).row())
+            ips[ip] = None
+        return list(ips)
+
+    def block_selected_ips(self, ips):
+        """Block several IPs at once; they are merged into as few firewall rules as possible."""
+        reply = QMessageBox.question(
+            self,
+            "Confirm IP Block",
+            f"Are you sure you want to block {len(ips)} IP addresses?\n\nThis will create firewall rules to block all traffic from them.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
         
-        # Also show in status bar
+        if reply == QMessageBox.Yes:
+            self.run_protection_task(self.protection.block_ips(ips), "Success",
+                                     f"Blocking {len(ips)} IPs...", firewall=True)
+
+    def show_critical_alerts(self, findings):
+        """Add a batch of (ip, port, reason) critical findings to the alert center."""
+        # The alert center is non-modal and pops up at most once per scan
+        self.alert_center.add_findings(findings)
+        self.alerts_button.setText(f"Security Alerts ({self.alert_center.total})")
+        
+        # Also show the latest finding in the status bar
+        ip, port, reason = findings[-1]
         self.status_bar.showMessage(f"CRITICAL: {reason} found on {ip}:{port}", 10000)
 
+    def show_alert_center(self):
+        """Reopen the alert center."""
+        self.alert_center.show()
+        self.alert_center.raise_()
+        self.alert_center.activateWindow()
+
     def add_notification(self, notification_type, title, message, severity="INFO"):
-        """Add a new notification to the list with enhanced formatting."""
+        """Add a new notification; the oldest one is dropped once the buffer is full."""
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         
-        # Create professionally formatted notification with icons
-        if severity == "CRITICAL":
-            severity_icon = "🔴"
-            severity_color = "#dc3545"
-        elif severity == "WARNING":
-            severity_icon = "🟡"
-            severity_color = "#ffc107"
-        elif severity == "INFO":
-            severity_icon = "🔵"
-            severity_color = "#0078d4"
-        else:
-            severity_icon = "⚪"
-            severity_color = "#6c757d"
-        
-        # Create enhanced notification text with better formatting
-        notification_text = f"{severity_icon} [{timestamp}] {severity}\n{title}\n{message}"
-        
-        # Add to notifications list
-        self.notifications.append({
-            'timestamp': timestamp,
-            'type': notification_type,
-            'title': title,
-            'message': message,
-            'severity': severity
-        })
-        
-        # Create list item with enhanced formatting
-        item = QListWidgetItem()
-        item.setText(notification_text)
-        
-        # Set enhanced styling based on severity and theme
-        item_font = QFont("Segoe UI", 11)
-        item.setFont(item_font)
-        
-        # Theme-aware color styling with better contrast
-        if hasattr(self, '_is_dark_theme') and self._is_dark_theme:
-            # Dark theme colors - more vibrant
-            if severity == "CRITICAL":
-                item.setBackground(QColor(70, 25, 25))  # Deeper red
-                item.setForeground(QColor(255, 170, 170))  # Brighter red text
-            elif severity == "WARNING":
-                item.setBackground(QColor(70, 55, 25))  # Deeper yellow
-                item.setForeground(QColor(255, 230, 130))  # Brighter yellow text
-            elif severity == "INFO":
-                item.setBackground(QColor(25, 45, 75))  # Deeper blue
-                item.setForeground(QColor(170, 200, 255))  # Brighter blue text
-        else:
-            # Light theme colors - better contrast
-            if severity == "CRITICAL":
-                item.setBackground(QColor(255, 245, 245))  # Very light red
-                item.setForeground(QColor(170, 30, 30))  # Darker red
-            elif severity == "WARNING":
-                item.setBackground(QColor(255, 252, 240))  # Very light yellow
-                item.setForeground(QColor(190, 150, 30))  # Darker yellow
-            elif severity == "INFO":
-                item.setBackground(QColor(245, 250, 255))  # Very light blue
-                item.setForeground(QColor(30, 90, 170))  # Darker blue
-        
-        # Set consistent item height
-        item.setSizeHint(QSize(0, 75))
-        
-        self.notifications_list.insertItem(0, item)  # Add to top
+        # O(1) append to the ring buffer; the view is updated through the model
+        is_new_type = notification_type not in self.notification_model.types
+        self.notification_model.add(Notification(timestamp, notification_type, title, message, severity))
+        if is_new_type and hasattr(self, 'notification_type_filter'):
+            self.notification_type_filter.addItem(notification_type.title(), notification_type)
         
         # Update notification count if label exists
-        count = len(self.notifications)
-        if hasattr(self, 'notification_count_label'):
-            self.notification_count_label.setText(f"{count} notification{'s' if count != 1 else ''}")
-        
-        # Limit notifications count
-        if len(self.notifications) > self.max_notifications:
-            self.notifications.pop()
-            if self.notifications_list.count() > self.max_notifications:
-                self.notifications_list.takeItem(self.notifications_list.count() - 1)
+        self.update_notification_count()
         
         # Show desktop notification if enabled
         if hasattr(self, 'desktop_notifications') and self.desktop_notifications.isChecked():
@@ -1555,16 +1748,50 @@ class MainWindow(QMainWindow):
     
     def clear_notifications(self):
         """Clear all notifications and update display."""
-        self.notifications.clear()
-        self.notifications_list.clear()
+        self.notification_model.clear()
         
         # Update notification count
-        if hasattr(self, 'notification_count_label'):
-            self.notification_count_label.setText("0 notifications")
+        self.update_notification_count()
         
         # Add a system message about clearing
         self.add_notification("SYSTEM", "Notifications Cleared", "All previous notifications have been cleared from the display.", "INFO")
     
+    def update_notification_theme(self):
+        """Repaint the notification cards with the colors of the current theme."""
+        if hasattr(self, 'notification_delegate'):
+            self.notification_delegate.dark_theme = self._is_dark_theme
+            self.notifications_list.viewport().update()
+
+    def update_notification_count(self):
+        """Show how many notifications are retained and how many pass the filter."""
+        if not hasattr(self, 'notification_count_label'):
+            return
+        count = self.notification_model.rowCount()
+        shown = self.notification_proxy.rowCount()
+        text = f"{count} notification{'s' if count != 1 else ''}"
+        if shown != count:
+            text += f" ({shown} shown)"
+        self.notification_count_label.setText(text)
+
+    def on_notification_filter_changed(self):
+        """Apply the type and severity filters to the notifications view."""
+        self.notification_proxy.set_type_filter(self.notification_type_filter.currentData())
+        self.notification_proxy.set_severity_filter(self.notification_severity_filter.currentData())
+        self.update_notification_count()
+
+    def export_notifications(self):
+        """Export the currently shown notifications to CSV or JSON."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Notifications", "notifications.csv",
+            "CSV files (*.csv);;JSON files (*.json)")
+        if not path:
+            return
+        try:
+            self.notification_model.export(path, self.notification_proxy.visible_records())
+            self.status_bar.showMessage(f"Exported notifications to {path}", 3000)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Failed", f"Could not export notifications: {e}")
+
     def toggle_auto_scan(self, state):
         """Toggle automatic scanning on network changes."""
         if state == 2:  # Checked
@@ -1595,8 +1822,7 @@ class MainWindow(QMainWindow):
                             "Performing quick network security scan...", "INFO")
         # Use existing scan functionality with limited scope
         target = utils.get_local_network_range()
-        self.target_input.setText(target)
-        self.start_scan()
+        self.start_scan(target, PRIORITY_AUTO)
         
     def start_full_scan(self):
         """Start a full network scan."""
@@ -1604,8 +1830,7 @@ class MainWindow(QMainWindow):
                             "Performing comprehensive network security scan...", "INFO")
         # Use existing scanner functionality
         target = utils.get_local_network_range()
-        self.target_input.setText(target)
-        self.start_scan()
+        self.start_scan(target, PRIORITY_AUTO)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,187 @@
+# src/gui/notifications.py
+
+import csv
+import json
+from collections import deque, namedtuple
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QSize, QRectF
+from PyQt5.QtGui import QFont, QColor, QPen, QPainter, QFontMetrics
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+Notification = namedtuple("Notification", "timestamp type title message severity")
+
+# Role returning the Notification record of a row.
+RECORD_ROLE = Qt.UserRole + 1
+
+SEVERITY_ICONS = {
+    "CRITICAL": "🔴",
+    "WARNING": "🟡",
+    "INFO": "🔵",
+}
+
+# (background, foreground) per severity for each theme
+DARK_COLORS = {
+    "CRITICAL": (QColor(70, 25, 25), QColor(255, 170, 170)),
+    "WARNING": (QColor(70, 55, 25), QColor(255, 230, 130)),
+    "INFO": (QColor(25, 45, 75), QColor(170, 200, 255)),
+}
+LIGHT_COLORS = {
+    "CRITICAL": (QColor(255, 245, 245), QColor(170, 30, 30)),
+    "WARNING": (QColor(255, 252, 240), QColor(190, 150, 30)),
+    "INFO": (QColor(245, 250, 255), QColor(30, 90, 170)),
+}
+
+
+def format_notification(record):
+    """Returns the three-line text shown for a notification."""
+    icon = SEVERITY_ICONS.get(record.severity, "⚪")
+    return f"{icon} [{record.timestamp}] {record.severity}\n{record.title}\n{record.message}"
+
+
+class NotificationListModel(QAbstractListModel):
+    """
+    Newest-first list model over a fixed-capacity ring buffer.
+
+    Notifications live in a deque with maxlen=capacity; appending is O(1) and
+    the oldest entry is evicted (and removed from the view) once it is full.
+    Row 0 is the newest notification.
+    """
+    def __init__(self, capacity, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self.types = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[len(self._records) - 1 - index.row()]
+        if role == RECORD_ROLE:
+            return record
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return format_notification(record)
+        return None
+
+    def add(self, record):
+        """Adds a notification at the top, evicting the oldest one if full."""
+        count = len(self._records)
+        if count == self.capacity:
+            # The oldest entry is the last row
+            self.beginRemoveRows(QModelIndex(), count - 1, count - 1)
+            self._records.popleft()
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._records.append(record)
+        self.endInsertRows()
+        self.types.add(record.type)
+
+    def clear(self):
+        self.beginResetModel()
+        self._records.clear()
+        self.endResetModel()
+
+    def records(self):
+        """Returns the retained notifications, oldest first."""
+        return list(self._records)
+
+    def export(self, path, records=None):
+        """
+        Writes notifications to a .json or .csv file (chosen by extension).
+
+        Args:
+            path (str): Destination file.
+            records (list): Notifications to write; defaults to all retained ones.
+        """
+        records = self.records() if records is None else records
+        if path.lower().endswith(".json"):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([record._asdict() for record in records], f, indent=2, ensure_ascii=False)
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(Notification._fields)
+                writer.writerows(records)
+
+
+class NotificationFilterProxy(QSortFilterProxyModel):
+    """Filters notifications by type and/or severity (None means any)."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._type = None
+        self._severity = None
+
+    def set_type_filter(self, notification_type):
+        self._type = notification_type or None
+        self.invalidateFilter()
+
+    def set_severity_filter(self, severity):
+        self._severity = severity or None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._type is None and self._severity is None:
+            return True
+        record = self.sourceModel().index(source_row, 0, source_parent).data(RECORD_ROLE)
+        if self._type is not None and record.type != self._type:
+            return False
+        return self._severity is None or record.severity == self._severity
+
+    def visible_records(self):
+        """Returns the notifications passing the current filter, oldest first."""
+        rows = [self.index(row, 0).data(RECORD_ROLE) for row in range(self.rowCount())]
+        rows.reverse()
+        return rows
+
+
+class NotificationDelegate(QStyledItemDelegate):
+    """Paints each notification as a rounded card styled by severity and theme."""
+    ROW_HEIGHT = 75
+
+    def __init__(self, dark_theme=True, parent=None):
+        super().__init__(parent)
+        self.dark_theme = dark_theme
+        # Shared paint resources, created once
+        # (font, metrics) for the header, title and message lines
+        self._line_fonts = [(font, QFontMetrics(font)) for font in (
+            QFont("Segoe UI", 10, QFont.DemiBold),
+            QFont("Segoe UI", 11, QFont.Bold),
+            QFont("Segoe UI", 11),
+        )]
+        self._border_pen = QPen(QColor(120, 120, 120, 50))
+
+    def sizeHint(self, option, index):
+        return QSize(0, self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        record = index.data(RECORD_ROLE)
+        if record is None:
+            return super().paint(painter, option, index)
+
+        colors = DARK_COLORS if self.dark_theme else LIGHT_COLORS
+        background, foreground = colors.get(record.severity, (None, option.palette.text().color()))
+        if option.state & QStyle.State_Selected:
+            background = option.palette.highlight().color()
+            foreground = option.palette.highlightedText().color()
+        elif background is not None and option.state & QStyle.State_MouseOver:
+            background = background.lighter(115) if self.dark_theme else background.darker(103)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = QRectF(option.rect.adjusted(2, 2, -2, -2))
+        painter.setPen(self._border_pen)
+        painter.setBrush(background if background is not None else Qt.NoBrush)
+        painter.drawRoundedRect(card, 4, 4)
+
+        text_rect = option.rect.adjusted(10, 6, -10, -6)
+        painter.setPen(foreground)
+        y = text_rect.top()
+        header = f"{SEVERITY_ICONS.get(record.severity, '⚪')} [{record.timestamp}] {record.severity}"
+        for (font, metrics), text in zip(self._line_fonts, (header, record.title, record.message)):
+            painter.setFont(font)
+            elided = metrics.elidedText(text, Qt.ElideRight, text_rect.width())
+            painter.drawText(text_rect.left(), y + metrics.ascent(), elided)
+            y += metrics.height() + 2
+        painter.restore()
@@ -0,0 +1,143 @@
+# src/gui/results_model.py
+
+import ipaddress
+import sys
+from array import array
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QFont, QColor, QBrush
+
+# Role returning a value that sorts naturally (numeric IPs and ports).
+SORT_ROLE = Qt.UserRole + 1
+
+
+class ResultStore:
+    """
+    Compact columnar storage for scan findings.
+
+    Each column is a flat list or array indexed by row, so 100k findings cost a
+    few megabytes instead of 100k dicts or 400k widget items. Host addresses
+    are interned because the same IP repeats for every open port it has.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.ips = []
+        self.ip_keys = array('Q')      # Numeric IP for sorting
+        self.ports = array('H')
+        self.services = []
+        self.critical = bytearray()    # 1 if the port is in the critical list
+        self.search_keys = []          # Lower-cased row text used by the filter
+
+    def __len__(self):
+        return len(self.ports)
+
+    def extend(self, findings, critical_ports):
+        """Appends (ip, port, banner) tuples."""
+        for ip, port, banner in findings:
+            ip = sys.intern(ip)
+            service = banner if banner and banner != "N/A" else "Unknown Service"
+            is_critical = port in critical_ports
+            try:
+                ip_key = int(ipaddress.ip_address(ip))
+            except ValueError:
+                ip_key = 0
+            self.ips.append(ip)
+            self.ip_keys.append(ip_key & 0xFFFFFFFFFFFFFFFF)
+            self.ports.append(port)
+            self.services.append(service)
+            self.critical.append(1 if is_critical else 0)
+            risk = "HIGH" if is_critical else "MEDIUM"
+            self.search_keys.append(f"{ip} {port} {service} {risk}".lower())
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """Table model over a ResultStore; rows are appended in batches."""
+    HEADERS = ["IP Address", "Port", "Service", "Risk Level"]
+
+    def __init__(self, critical_ports, parent=None):
+        super().__init__(parent)
+        self.store = ResultStore()
+        self.critical_ports = critical_ports
+
+        # Shared style objects instead of new fonts/brushes per cell
+        self._normal_font = QFont("Segoe UI", 12)
+        self._bold_font = QFont("Segoe UI", 12, QFont.DemiBold)
+        self._critical_brush = QBrush(QColor(220, 60, 60, 30))  # Light red background
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        store = self.store
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return store.ips[row]
+            if column == 1:
+                return str(store.ports[row])
+            if column == 2:
+                return store.services[row]
+            return "HIGH" if store.critical[row] else "MEDIUM"
+        if role == SORT_ROLE:
+            if column == 0:
+                return store.ip_keys[row]
+            if column == 1:
+                return store.ports[row]
+            if column == 2:
+                return store.services[row].lower()
+            return store.critical[row]
+        if role == Qt.FontRole:
+            return self._bold_font if column in (1, 3) else self._normal_font
+        if role == Qt.BackgroundRole and store.critical[row]:
+            return self._critical_brush
+        return None
+
+    def append_results(self, findings):
+        """Appends a batch of (ip, port, banner) tuples with a single insert notification."""
+        if not findings:
+            return
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(findings) - 1)
+        self.store.extend(findings, self.critical_ports)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
+
+    def row_values(self, row):
+        """Returns (ip, port) for a source row."""
+        return self.store.ips[row], self.store.ports[row]
+
+
+class ResultsFilterProxy(QSortFilterProxyModel):
+    """Sorts on SORT_ROLE and filters rows by a case-insensitive substring."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        # Test the precomputed row text instead of calling data() per column
+        if not self._needle:
+            return True
+        return self._needle in self.sourceModel().store.search_keys[source_row]
@@ -1,44 +1,257 @@
 # src/gui/worker.py
 
+import threading
+import time
+
 from PyQt5.QtCore import QObject, pyqtSignal
-from core.scanner_engine import run_full_scan
-from core import config
+from core import config, scan_service
+from core.sysinfo import SystemInfoCollector
+from protection.executor import ProtectionExecutor
+from protection.policy import PolicyEngine, load_policy
+
+# Buffered findings are flushed to the GUI at this cadence or at this size,
+# whichever comes first, so each flush is one cross-thread event.
+BATCH_INTERVAL = 0.1
+BATCH_SIZE = 500
+
+# Progress snapshots are forwarded to the GUI at most this often.
+PROGRESS_INTERVAL = 0.25
+
+
+class ResultBatcher:
+    """
+    Buffers items and hands them to `flush_callback` as a list.
+
+    A flush happens when BATCH_SIZE items are waiting, or when `poll()` (or
+    `add()`) runs at least BATCH_INTERVAL seconds after the previous flush.
+    """
+    def __init__(self, flush_callback, interval=BATCH_INTERVAL, max_items=BATCH_SIZE):
+        self.flush_callback = flush_callback
+        self.interval = interval
+        self.max_items = max_items
+        self.items = []
+        self.last_flush = time.monotonic()
+
+    def add(self, item):
+        self.items.append(item)
+        if len(self.items) >= self.max_items:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        if self.items and time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if self.items:
+            items, self.items = self.items, []
+            self.flush_callback(items)
+
 
 class ScannerWorker(QObject):
     """
-    A worker object that runs the scan in a separate thread.
-    Emits signals to communicate with the main GUI thread.
+    Follows one job of the scan service and relays it to the GUI.
+    The service calls it on the service thread; signals carry the data over
+    to the main GUI thread.
     """
-    result_found = pyqtSignal(str, int, str) # ip, port, banner
+    scan_started = pyqtSignal()
+    results_batch = pyqtSignal(list) # [(ip, port, banner), ...]
     scan_finished = pyqtSignal()
     status_update = pyqtSignal(str)
-    critical_finding = pyqtSignal(str, int, str) # ip, port, reason
-    
-    def __init__(self, network_range):
+    critical_batch = pyqtSignal(list) # [(ip, port, reason), ...]
+    progress_update = pyqtSignal(object) # core.progress.ProgressSnapshot
+
+    def __init__(self, service, network_range, settings, priority=scan_service.PRIORITY_MANUAL, policy=None):
         super().__init__()
+        self.service = service
         self.network_range = network_range
+        self.settings = settings
+        self.priority = priority
+        self.policy = policy  # protection.policy.PolicyEngine fed with every batch, if any
+        self._batcher = ResultBatcher(self._emit_batch)
+        self._last_progress = 0.0
+        self.job = None
+        self.control = None
 
-    def run(self):
-        """Starts the scan and emits signals for results."""
-        self.status_update.emit(f"Discovering hosts on {self.network_range}...")
-        results = run_full_scan(self.network_range)
-        
-        if not results:
-            self.status_update.emit("No active hosts found or scan completed with no open ports")
+    def submit(self):
+        """
+        Queues the scan and returns its job. Call this after connecting the
+        signals: the service thread may start the job right away.
+
+        If the same scan is already queued, the queued job is returned and
+        this worker follows it as well; a caller that keeps the existing
+        worker instead calls detach().
+        """
+        self.job = self.service.submit(self.network_range, self.settings, self.priority,
+                                       subscriber=self._on_event)
+        self.control = self.job.control
+        return self.job
+
+    def detach(self):
+        """Stops following the job."""
+        if self.job is not None:
+            self.job.unsubscribe(self._on_event)
+
+    # ScanControl is thread-safe, so these are called directly from the GUI thread
+    def cancel(self):
+        """Stops the scan (or drops it from the queue); the remaining work is checkpointed for a later resume."""
+        self.service.cancel(self.job)
+
+    def pause(self):
+        self.control.pause()
+        self.status_update.emit("Scan paused")
+
+    def resume(self):
+        self.control.resume()
+        self.status_update.emit("Scan resumed")
+
+    def _on_event(self, job, event, payload):
+        """Called by the scan service on its thread for each event of the job."""
+        if event == scan_service.EVENT_RESULT:
+            self._on_host_result(*payload)
+        elif event == scan_service.EVENT_TICK:
+            self._batcher.poll()
+        elif event == scan_service.EVENT_PROGRESS:
+            self._on_progress(payload)
+        elif event == scan_service.EVENT_STARTED:
+            self.scan_started.emit()
+            self.status_update.emit(f"Discovering hosts on {self.network_range}...")
+        elif event == scan_service.EVENT_FINISHED:
+            job.unsubscribe(self._on_event)
+            self._on_finished(job, payload)
+
+    def _on_host_result(self, ip, open_ports):
+        """Called by the engine as each host finishes."""
+        for port, banner in sorted(open_ports.items()):
+            self._batcher.add((ip, port, banner))
+
+    def _on_progress(self, snapshot):
+        """Forwards engine progress to the GUI, throttled to PROGRESS_INTERVAL."""
+        now = time.monotonic()
+        if now - self._last_progress >= PROGRESS_INTERVAL or snapshot.completed >= snapshot.total:
+            self._last_progress = now
+            self.progress_update.emit(snapshot)
+
+    def _emit_batch(self, findings):
+        """Sends a batch of findings, and the critical ones among them, to the GUI."""
+        self.results_batch.emit(findings)
+        if self.policy is not None:
+            self.policy.observe(findings)
+
+        # Check the found ports against the critical list of this scan's settings
+        critical_ports = self.settings.critical_ports
+        critical = [(ip, port, critical_ports[port])
+                    for ip, port, _ in findings if port in critical_ports]
+        if critical:
+            self.critical_batch.emit(critical)
+
+    def _on_finished(self, job, results):
+        """Flushes the last findings and reports how the job ended."""
+        self._batcher.flush()
+
+        if job.status == scan_service.FAILED:
+            self.status_update.emit(f"Scan failed: {job.error}")
+        elif not results:
+            if not job.control.cancelled:
+                self.status_update.emit("No active hosts found or scan completed with no open ports")
         else:
-            self.status_update.emit("Processing scan results...")
             total_ports = sum(len(ports) for ports in results.values())
             self.status_update.emit(f"Found {total_ports} open port{'s' if total_ports != 1 else ''} on {len(results)} host{'s' if len(results) != 1 else ''}")
-            
-            for ip, ports in results.items():
-                for port, banner in ports.items():
-                    # Emit the standard result for the table
-                    self.result_found.emit(ip, port, banner)
-                    
-                    # Check if the found port is in our critical list from the config file
-                    if port in config.CRITICAL_PORTS:
-                        reason = config.CRITICAL_PORTS[port]
-                        # If it is, emit the special signal for the alert pop-up
-                        self.critical_finding.emit(ip, port, reason)
-
-        self.scan_finished.emit()
\ No newline at end of file
+
+        if job.control.cancelled:
+            self.status_update.emit("Scan stopped - progress saved, scan the same target again to resume")
+        self.scan_finished.emit()
+
+
+class SystemInfoWorker(QObject):
+    """
+    Collects System Info snapshots in a separate thread.
+    Emits only the fields that changed since the previous snapshot.
+    """
+    fields_changed = pyqtSignal(dict) # {field key: text}
+
+    def __init__(self, interval=None):
+        super().__init__()
+        self.interval = interval or config.SYSINFO_INTERVAL
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Ends the collection loop; safe to call from the GUI thread."""
+        self._stop.set()
+
+    def run(self):
+        collector = SystemInfoCollector()
+        while not self._stop.is_set():
+            try:
+                changed = collector.changes()
+            except Exception as e:
+                print(f"[!] Error collecting system information: {e}")
+                changed = {}
+            if changed:
+                self.fields_changed.emit(changed)
+            self._stop.wait(self.interval)
+
+
+class ProtectionWorker(QObject):
+    """
+    Runs hosts-file and firewall operations off the GUI thread.
+    Requests made in quick succession are merged into one transaction by
+    the ProtectionExecutor; every request still gets its own result.
+    """
+    task_finished = pyqtSignal(object) # protection.executor.TaskResult
+    task_progress = pyqtSignal(int, str, object, object) # task id, stage, done, total
+    blocklist_changed = pyqtSignal(list) # hosts_editor.get_blocked_domains() after a change
+    policy_flushed = pyqtSignal(list, str) # [protection.policy.PolicyAction, ...], summary
+    policy_status = pyqtSignal(str) # Response policy failures and dropped blocks
+
+    def __init__(self):
+        super().__init__()
+        # The callbacks run on the executor thread; the signals queue them to the GUI
+        self.policy = None
+        self.executor = ProtectionExecutor(on_finished=self.task_finished.emit,
+                                           on_progress=self.task_progress.emit,
+                                           on_blocklist=self.blocklist_changed.emit,
+                                           on_firewall=self._on_firewall)
+        # Automatic responses to scan findings, when a response policy is configured
+        success, message, policy = load_policy()
+        self.policy_error = None if success else message  # Shown by the window once it is built
+        if policy is not None:
+            self.policy = PolicyEngine(policy, self.executor, on_flush=self.policy_flushed.emit,
+                                       on_status=self.policy_status.emit)
+
+    def _on_firewall(self, networks):
+        """Called on the executor thread after each firewall sync."""
+        policy = self.policy
+        if policy is not None:
+            policy.firewall_changed(networks)
+
+    def block_domain(self, domain, ttl=None):
+        """Blocks a domain, for `ttl` seconds if given."""
+        return self.executor.block_domains([domain], ttl)
+
+    def unblock_domain(self, domain):
+        return self.executor.unblock_domains([domain])
+
+    def clear_domains(self):
+        return self.executor.clear_domains()
+
+    def import_blocklist(self, source):
+        return self.executor.import_blocklist(source)
+
+    def refresh_blocklist(self):
+        return self.executor.refresh_blocklist()
+
+    def block_ips(self, ips, ttl=None):
+        """Blocks IPs, for `ttl` seconds if given."""
+        return self.executor.block_ips(ips, ttl)
+
+    def unblock_ip(self, ip):
+        return self.executor.unblock_ips([ip])
+
+    def stop(self):
+        """Finishes the queued operations; called when the window closes."""
+        if self.policy is not None:
+            self.policy.stop()
+        self.executor.shutdown()
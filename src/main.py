@@ -3,13 +3,21 @@ from PyQt5.QtWidgets import QApplication
 
 # Import local modules from the project structure
 from gui.main_window import MainWindow
+from core.settings import ScanSettings
 
 # --- Main Application Entry Point ---
 
 def main_gui_function():
     """GUI entry-point used by setup.py's gui_scripts."""
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    # Scan tuning comes from --profile/--ports/... flags; the rest goes to Qt
+    try:
+        scan_settings, qt_args = ScanSettings.from_argv(sys.argv[1:])
+    except (OSError, ValueError) as e:
+        print(f"[!] Invalid scan settings: {e}")
+        sys.exit(2)
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(scan_settings)
     window.show()
     sys.exit(app.exec_())
 
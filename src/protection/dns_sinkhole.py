@@ -0,0 +1,632 @@
+# src/protection/dns_sinkhole.py
+
+import argparse
+import asyncio
+import ipaddress
+import random
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from core import config
+from protection import hosts_editor
+from protection.domain_trie import DomainTrie
+
+HEADER = struct.Struct("!HHHHHH")  # id, flags, qdcount, ancount, nscount, arcount
+RECORD = struct.Struct("!HHIH")  # type, class, ttl, rdlength
+LENGTH_PREFIX = struct.Struct("!H")  # DNS over TCP
+
+TYPE_A = 1
+TYPE_AAAA = 28
+TYPE_OPT = 41
+CLASS_IN = 1
+
+FLAG_QR = 0x8000
+FLAG_OPCODE = 0x7800
+FLAG_TC = 0x0200
+FLAG_RD = 0x0100
+FLAG_RA = 0x0080
+
+RCODE_NOERROR = 0
+RCODE_FORMERR = 1
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+# TTL of the answers given for blocked names.
+BLOCKED_TTL = 60
+
+# Largest UDP answer for clients that do not advertise EDNS.
+CLASSIC_UDP_SIZE = 512
+
+# Seconds between checks of the hosts file for blocklist changes.
+BLOCKLIST_REFRESH_INTERVAL = 2.0
+
+Question = namedtuple("Question", "id flags name qtype qclass end")
+
+
+class DNSFormatError(ValueError):
+    """Raised for packets that are not a well-formed single-question query."""
+
+
+def parse_query(packet):
+    """
+    Parses the header and the single question of a query.
+
+    Returns:
+        A Question; `end` is the offset just past the question section.
+    """
+    if len(packet) < HEADER.size:
+        raise DNSFormatError("Packet shorter than a DNS header")
+    query_id, flags, qdcount, _, _, _ = HEADER.unpack_from(packet)
+    if flags & FLAG_QR or qdcount != 1:
+        raise DNSFormatError("Not a single-question query")
+    labels = []
+    offset = HEADER.size
+    try:
+        while True:
+            length = packet[offset]
+            offset += 1
+            if length == 0:
+                break
+            if length & 0xC0:
+                raise DNSFormatError("Compressed name in question")
+            labels.append(packet[offset:offset + length])
+            offset += length
+        qtype, qclass = struct.unpack_from("!HH", packet, offset)
+        name = b".".join(labels).decode("ascii").lower()
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise DNSFormatError(f"Malformed question: {e}") from None
+    return Question(query_id, flags, name, qtype, qclass, offset + 4)
+
+
+def build_query(name, qtype=TYPE_A, query_id=0):
+    """Builds a recursive query for `name` (used by the benchmark and tests)."""
+    qname = b"".join(bytes([len(label)]) + label.encode("ascii")
+                     for label in name.rstrip(".").split(".")) + b"\0"
+    return HEADER.pack(query_id, FLAG_RD, 1, 0, 0, 0) + qname + struct.pack("!HH", qtype, CLASS_IN)
+
+
+def build_response(packet, question, rcode=RCODE_NOERROR, answers=()):
+    """
+    Builds a response to `packet` echoing its question.
+
+    Args:
+        answers: (type, ttl, rdata) records for the question's name.
+    """
+    flags = FLAG_QR | FLAG_RA | (question.flags & (FLAG_OPCODE | FLAG_RD)) | rcode
+    parts = [HEADER.pack(question.id, flags, 1, len(answers), 0, 0), packet[HEADER.size:question.end]]
+    for rtype, ttl, rdata in answers:
+        # 0xC00C points back at the name in the question
+        parts.append(b"\xc0\x0c" + RECORD.pack(rtype, question.qclass, ttl, len(rdata)) + rdata)
+    return b"".join(parts)
+
+
+def _skip_name(packet, offset):
+    while True:
+        length = packet[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2  # A compression pointer ends the name
+        offset += 1 + length
+        if length == 0:
+            return offset
+
+
+def record_ttls(response):
+    """
+    Returns [(offset, ttl)] for the TTL fields of every record in a response,
+    skipping the EDNS OPT pseudo-record (whose "TTL" holds flags).
+    """
+    _, _, qdcount, ancount, nscount, arcount = HEADER.unpack_from(response)
+    offset = HEADER.size
+    for _ in range(qdcount):
+        offset = _skip_name(response, offset) + 4
+    ttls = []
+    for _ in range(ancount + nscount + arcount):
+        offset = _skip_name(response, offset)
+        rtype, _, ttl, rdlength = RECORD.unpack_from(response, offset)
+        if rtype != TYPE_OPT:
+            ttls.append((offset + 4, ttl))
+        offset += RECORD.size + rdlength
+    return ttls
+
+
+def udp_payload_limit(packet, question):
+    """Largest UDP response the client accepts: its EDNS buffer size, or 512 bytes."""
+    if HEADER.unpack_from(packet)[5] and len(packet) >= question.end + 11:
+        # An OPT record right after the question: root name, type 41, class = buffer size
+        if packet[question.end] == 0:
+            rtype, size = struct.unpack_from("!HH", packet, question.end + 1)
+            if rtype == TYPE_OPT:
+                return max(size, CLASSIC_UDP_SIZE)
+    return CLASSIC_UDP_SIZE
+
+
+class AnswerCache:
+    """
+    LRU cache of upstream responses that honours their TTLs.
+
+    Entries expire after the smallest TTL in the response (clamped to
+    [min_ttl, max_ttl]). A hit is served from the stored bytes with the
+    client's query id and the TTLs counted down by the time spent in cache.
+    """
+    def __init__(self, max_size=None, min_ttl=None, max_ttl=None):
+        self.max_size = max_size or config.DNS_CACHE_SIZE
+        self.min_ttl = config.DNS_CACHE_MIN_TTL if min_ttl is None else min_ttl
+        self.max_ttl = config.DNS_CACHE_MAX_TTL if max_ttl is None else max_ttl
+        self._entries = OrderedDict()  # key -> (stored_at, expires_at, response, ttls)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, now=None):
+        entry = self._entries.get(key)
+        now = time.monotonic() if now is None else now
+        if entry is None or entry[1] <= now:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        stored_at, _, response, ttls = entry
+        elapsed = int(now - stored_at)
+        if not elapsed:
+            return response
+        response = bytearray(response)
+        for offset, ttl in ttls:
+            struct.pack_into("!I", response, offset, max(0, ttl - elapsed))
+        return bytes(response)
+
+    def put(self, key, response, now=None):
+        flags = HEADER.unpack_from(response)[1]
+        if (flags & 0xF) not in (RCODE_NOERROR, RCODE_NXDOMAIN) or flags & FLAG_TC:
+            return  # Failures and truncated answers are not cached
+        try:
+            ttls = record_ttls(response)
+        except (IndexError, struct.error):
+            return
+        ttl = min((ttl for _, ttl in ttls), default=self.min_ttl)
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        now = time.monotonic() if now is None else now
+        self._entries[key] = (now, now + ttl, response, ttls)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class _UpstreamProtocol(asyncio.DatagramProtocol):
+    def __init__(self, sinkhole):
+        self.sinkhole = sinkhole
+
+    def datagram_received(self, data, addr):
+        self.sinkhole._on_upstream_response(data)
+
+    def error_received(self, exc):
+        print(f"[!] DNS upstream error: {exc}")
+
+
+class _ServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, sinkhole):
+        self.sinkhole = sinkhole
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        # Blocked and cached names are answered right here, without a task per query
+        response, question = self.sinkhole._resolve_local(data)
+        if response is not None:
+            self.transport.sendto(response, addr)
+        elif question is not None:
+            self.sinkhole._spawn(self.sinkhole._answer_udp(self.transport, data, question, addr))
+
+
+class DNSSinkhole:
+    """
+    Local DNS server that answers blocked names itself and forwards the rest.
+
+    Listens on UDP and TCP. A query for a blocked name, or for any name under
+    a blocked parent domain, is answered with HOSTS_REDIRECT_IP (A/AAAA) or
+    NXDOMAIN without leaving the machine. Other queries are forwarded over
+    one shared UDP socket (TCP when the answer is truncated), identical
+    queries in flight are sent upstream once, and answers are kept in a
+    TTL-aware LRU cache. The blocklist is the hosts-file index, re-checked
+    every BLOCKLIST_REFRESH_INTERVAL seconds off the event loop, or any
+    `blocklist` object with a covering(name) method (e.g. a DomainTrie).
+    """
+    def __init__(self, listen=None, upstream=None, block_response=None, redirect_ip=None,
+                 blocklist=None, cache=None, timeout=None):
+        self.listen = listen or config.DNS_SINKHOLE_LISTEN
+        self.upstream = upstream or config.DNS_UPSTREAM
+        self.block_response = block_response or config.DNS_BLOCK_RESPONSE
+        self.cache = cache if cache is not None else AnswerCache()
+        self.timeout = timeout or config.DNS_UPSTREAM_TIMEOUT
+        self.blocklist = blocklist
+        self._follow_hosts = blocklist is None
+        self._redirect_records = self._redirect_answers(redirect_ip or config.HOSTS_REDIRECT_IP)
+        self.stats = {"queries": 0, "blocked": 0, "cached": 0, "forwarded": 0, "failed": 0}
+        self.address = None  # (host, port) actually bound, once started
+        self._pending = {}  # upstream query id -> future
+        self._inflight = {}  # (name, qtype, qclass) -> future of the upstream response
+        self._tasks = set()
+        self._udp_transport = None
+        self._tcp_server = None
+        self._upstream_transport = None
+        self._refresh_task = None
+
+    @staticmethod
+    def _redirect_answers(redirect_ip):
+        address = ipaddress.ip_address(redirect_ip)
+        if address.version == 4:
+            # Mirror the IPv4 sink for AAAA queries so clients do not fall back to IPv6
+            v6 = ipaddress.IPv6Address("::1" if address.is_loopback else "::")
+            return {TYPE_A: address.packed, TYPE_AAAA: v6.packed}
+        return {TYPE_AAAA: address.packed}
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        if self._follow_hosts:
+            await self._load_blocklist()
+            self._refresh_task = loop.create_task(self._refresh_blocklist())
+        self._upstream_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _UpstreamProtocol(self), remote_addr=tuple(self.upstream))
+        self._udp_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ServerProtocol(self), local_addr=tuple(self.listen))
+        self.address = self._udp_transport.get_extra_info("sockname")[:2]
+        # TCP on the port UDP got, so listening on port 0 works for tests
+        self._tcp_server = await asyncio.start_server(self._serve_tcp, self.address[0], self.address[1])
+        print(f"[*] DNS sinkhole listening on {self.address[0]}:{self.address[1]}, "
+              f"forwarding to {self.upstream[0]}:{self.upstream[1]}")
+
+    async def stop(self):
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+        for transport in (self._udp_transport, self._upstream_transport):
+            if transport is not None:
+                transport.close()
+        # Pending answers and open TCP connections (idle clients included) end here
+        tasks = list(self._tasks) + ([self._refresh_task] if self._refresh_task is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._tcp_server is not None:
+            await self._tcp_server.wait_closed()
+
+    def _spawn(self, coroutine):
+        self._track(asyncio.get_running_loop().create_task(coroutine))
+
+    def _track(self, task):
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # --- Blocklist ---
+
+    async def _load_blocklist(self):
+        # Parsing a large hosts file and building its trie runs in a worker thread
+        def load():
+            index = hosts_editor.get_index()
+            index.trie  # Built here rather than on the event loop
+            return index
+        self.blocklist = await asyncio.get_running_loop().run_in_executor(None, load)
+
+    async def _refresh_blocklist(self):
+        while True:
+            await asyncio.sleep(BLOCKLIST_REFRESH_INTERVAL)
+            try:
+                await self._load_blocklist()
+            except Exception as e:
+                # Keep refreshing; the next reload may succeed
+                print(f"[!] Could not reload the blocklist: {e}")
+
+    def is_blocked(self, name):
+        return self.blocklist is not None and self.blocklist.covering(name) is not None
+
+    # --- Resolution ---
+
+    async def resolve(self, packet, tcp=False):
+        """Returns the response bytes for one query packet, or None to drop it."""
+        response, question = self._resolve_local(packet, tcp)
+        if response is not None or question is None:
+            return response
+        return await self._resolve_upstream(packet, question, tcp)
+
+    def _resolve_local(self, packet, tcp=False):
+        """
+        Answers what can be answered without the upstream resolver.
+
+        Returns:
+            (response, question); the response is None when the query must be
+            forwarded, and both are None for packets that should be dropped.
+        """
+        try:
+            question = parse_query(packet)
+        except DNSFormatError:
+            if len(packet) < HEADER.size:
+                return None, None
+            query_id, flags = struct.unpack_from("!HH", packet)
+            return HEADER.pack(query_id, FLAG_QR | (flags & FLAG_OPCODE) | RCODE_FORMERR, 0, 0, 0, 0), None
+
+        self.stats["queries"] += 1
+        if self.is_blocked(question.name):
+            self.stats["blocked"] += 1
+            return self._blocked_response(packet, question), question
+
+        response = self.cache.get((question.name, question.qtype, question.qclass))
+        if response is None:
+            return None, question
+        self.stats["cached"] += 1
+        return self._finish(response, packet, question, tcp), question
+
+    async def _resolve_upstream(self, packet, question, tcp=False):
+        key = (question.name, question.qtype, question.qclass)
+        response = await self._forward(packet, key)
+        if response is None:
+            self.stats["failed"] += 1
+            return build_response(packet, question, RCODE_SERVFAIL)
+        self.cache.put(key, response)
+        return self._finish(response, packet, question, tcp)
+
+    def _finish(self, response, packet, question, tcp):
+        response = self._for_client(response, packet, question)
+        if not tcp and len(response) > udp_payload_limit(packet, question):
+            # Too big for this client over UDP: send the question with TC so it retries over TCP
+            flags = HEADER.unpack_from(response)[1] | FLAG_TC
+            response = HEADER.pack(question.id, flags, 1, 0, 0, 0) + packet[HEADER.size:question.end]
+        return response
+
+    def _blocked_response(self, packet, question):
+        if self.block_response == "nxdomain":
+            return build_response(packet, question, RCODE_NXDOMAIN)
+        rdata = self._redirect_records.get(question.qtype)
+        answers = [(question.qtype, BLOCKED_TTL, rdata)] if rdata is not None else []
+        return build_response(packet, question, RCODE_NOERROR, answers)
+
+    @staticmethod
+    def _for_client(response, packet, question):
+        """Gives a shared or cached response the client's id and question (including its letter case)."""
+        return (LENGTH_PREFIX.pack(question.id) + response[2:HEADER.size]
+                + packet[HEADER.size:question.end] + response[question.end:])
+
+    async def _forward(self, packet, key):
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._query_upstream_udp(packet)
+            if response is not None and HEADER.unpack_from(response)[1] & FLAG_TC:
+                response = await self._query_upstream_tcp(packet)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            print(f"[!] DNS upstream query for {key[0]} failed: {e}")
+            future.set_result(None)
+            return None
+        finally:
+            del self._inflight[key]
+
+    async def _query_upstream_udp(self, packet):
+        self.stats["forwarded"] += 1
+        upstream_id = random.getrandbits(16)
+        while upstream_id in self._pending:
+            upstream_id = random.getrandbits(16)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[upstream_id] = future
+        try:
+            self._upstream_transport.sendto(LENGTH_PREFIX.pack(upstream_id) + packet[2:])
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(upstream_id, None)
+
+    def _on_upstream_response(self, data):
+        if len(data) < HEADER.size:
+            return
+        future = self._pending.get(LENGTH_PREFIX.unpack_from(data)[0])
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    async def _query_upstream_tcp(self, packet):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.upstream[0], self.upstream[1]), self.timeout)
+        try:
+            writer.write(LENGTH_PREFIX.pack(len(packet)) + packet)
+            await writer.drain()
+            length, = LENGTH_PREFIX.unpack(await asyncio.wait_for(reader.readexactly(2), self.timeout))
+            return await asyncio.wait_for(reader.readexactly(length), self.timeout)
+        finally:
+            writer.close()
+
+    # --- Serving ---
+
+    async def _answer_udp(self, transport, packet, question, addr):
+        response = await self._resolve_upstream(packet, question)
+        if response is not None and not transport.is_closing():
+            transport.sendto(response, addr)
+
+    async def _serve_tcp(self, reader, writer):
+        # asyncio runs each connection in its own task; stop() cancels it
+        self._track(asyncio.current_task())
+        try:
+            while True:
+                length, = LENGTH_PREFIX.unpack(await reader.readexactly(2))
+                packet = await reader.readexactly(length)
+                response = await self.resolve(packet, tcp=True)
+                if response is None:
+                    break
+                writer.write(LENGTH_PREFIX.pack(len(response)) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # The client went away, or the sinkhole is stopping
+        finally:
+            writer.close()
+
+
+class SinkholeThread:
+    """Runs a DNSSinkhole on its own event loop thread, for the GUI."""
+    def __init__(self, sinkhole=None):
+        self.sinkhole = sinkhole or DNSSinkhole()
+        self._loop = None
+        self._thread = None
+        self._started = threading.Event()
+        self.error = None
+
+    def start(self, timeout=5):
+        """Starts the server; returns False (with `error` set) if it could not bind."""
+        self._thread = threading.Thread(target=self._run, name="dns-sinkhole", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout)
+        return self.error is None and self._started.is_set()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.sinkhole.start())
+        except Exception as e:
+            self.error = e
+            print(f"[!] Could not start the DNS sinkhole: {e}")
+            self._started.set()
+            self._loop.close()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.sinkhole.stop())
+        finally:
+            self._loop.close()
+
+    def stop(self, timeout=2):
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# --- Benchmark ---
+
+class StubUpstream(asyncio.DatagramProtocol):
+    """Minimal upstream resolver answering every A query with one fixed address."""
+    def __init__(self, address="192.0.2.1", ttl=300):
+        self.rdata = ipaddress.ip_address(address).packed
+        self.ttl = ttl
+        self.transport = None
+        self.queries = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.queries += 1
+        try:
+            question = parse_query(data)
+        except DNSFormatError:
+            return
+        answers = [(TYPE_A, self.ttl, self.rdata)] if question.qtype == TYPE_A else []
+        self.transport.sendto(build_response(data, question, RCODE_NOERROR, answers), addr)
+
+
+class _BenchClient(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.pending = {}
+
+    def datagram_received(self, data, addr):
+        future = self.pending.pop(LENGTH_PREFIX.unpack_from(data)[0], None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+
+async def _run_queries(transport, client, names, concurrency):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    ids = iter(range(1 << 16))
+
+    async def one(name):
+        async with semaphore:
+            query_id = next(ids) & 0xFFFF
+            future = loop.create_future()
+            client.pending[query_id] = future
+            transport.sendto(build_query(name, TYPE_A, query_id))
+            await asyncio.wait_for(future, 5)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(name) for name in names))
+    return len(names) / (time.perf_counter() - started)
+
+
+async def benchmark(count=20000, concurrency=100):
+    """
+    Measures queries/sec for blocked, cached and forwarded names against a
+    stub upstream on localhost. The client, the stub and the sinkhole share
+    one event loop, so the figures are a lower bound for the sinkhole alone.
+    """
+    loop = asyncio.get_running_loop()
+    stub_transport, _ = await loop.create_datagram_endpoint(StubUpstream, local_addr=("127.0.0.1", 0))
+    blocklist = DomainTrie((f"ads{i}.example.net", True) for i in range(100000))
+    sinkhole = DNSSinkhole(listen=("127.0.0.1", 0), upstream=stub_transport.get_extra_info("sockname")[:2],
+                           blocklist=blocklist, cache=AnswerCache(max_size=count * 2))
+    await sinkhole.start()
+    transport, client = await loop.create_datagram_endpoint(_BenchClient, remote_addr=sinkhole.address)
+    try:
+        # Phases are capped at 65536 queries so the client's query ids stay unique
+        count = min(count, 1 << 16)
+        results = {
+            "blocked (suffix match)": await _run_queries(
+                transport, client, [f"cdn.ads{i % 100000}.example.net" for i in range(count)], concurrency),
+            "forwarded (cache miss)": await _run_queries(
+                transport, client, [f"host{i}.example.org" for i in range(count)], concurrency),
+            "cached": await _run_queries(
+                transport, client, [f"host{i}.example.org" for i in range(count)], concurrency),
+        }
+    finally:
+        transport.close()
+        await sinkhole.stop()
+        stub_transport.close()
+    for label, rate in results.items():
+        print(f"[*] {label:<24} {rate:>10,.0f} queries/s")
+    print(f"[*] Sinkhole stats: {sinkhole.stats}")
+    return results
+
+
+def _address(value, default_port):
+    host, _, port = value.rpartition(":")
+    return (host, int(port)) if host else (value, default_port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local DNS sinkhole for the DoormaNet blocklist.")
+    parser.add_argument("--listen", default=":".join(map(str, config.DNS_SINKHOLE_LISTEN)),
+                        help="address:port to listen on")
+    parser.add_argument("--upstream", default=":".join(map(str, config.DNS_UPSTREAM)),
+                        help="address:port of the upstream resolver")
+    parser.add_argument("--nxdomain", action="store_true",
+                        help="answer blocked names with NXDOMAIN instead of HOSTS_REDIRECT_IP")
+    parser.add_argument("--bench", type=int, metavar="N", default=None,
+                        help="benchmark N queries per phase against a stub upstream on localhost and exit")
+    parser.add_argument("--concurrency", type=int, default=100,
+                        help="queries in flight during the benchmark")
+    args = parser.parse_args()
+
+    if args.bench:
+        asyncio.run(benchmark(args.bench, args.concurrency))
+    else:
+        async def serve():
+            sinkhole = DNSSinkhole(listen=_address(args.listen, 53), upstream=_address(args.upstream, 53),
+                                   block_response="nxdomain" if args.nxdomain else None)
+            await sinkhole.start()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await sinkhole.stop()
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,180 @@
+# src/protection/domain_trie.py
+
+from fnmatch import fnmatchcase
+
+# Key under which a node stores the value of the domain ending there. A
+# private object, so no label (not even an empty one) can collide with it.
+_VALUE = object()
+
+
+def domain_labels(domain):
+    """Returns the labels of `domain` from the TLD down: "a.b.com" -> ["com", "b", "a"]."""
+    labels = domain.strip().rstrip(".").lower().split(".")
+    labels.reverse()
+    return labels
+
+
+def _join(labels):
+    return ".".join(reversed(labels))
+
+
+class DomainTrie:
+    """
+    Trie of domains keyed by their labels in reverse order.
+
+    "ads.example.com" is stored under com -> example -> ads, so a domain and
+    all of its subdomains share one subtree. Exact lookups, "is this name
+    under a stored parent" checks and subtree queries therefore walk one
+    node per label, regardless of how many domains are stored. Each node is
+    a plain dict of label -> child node; a stored domain keeps its value
+    under the _VALUE key of its last node.
+    """
+    def __init__(self, items=()):
+        self._root = {}
+        self._size = 0
+        for domain, value in items:
+            self.add(domain, value)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, domain):
+        node = self._find(domain_labels(domain))
+        return node is not None and _VALUE in node
+
+    def __iter__(self):
+        for domain, _ in self._walk(self._root, []):
+            yield domain
+
+    def _find(self, labels):
+        node = self._root
+        for label in labels:
+            node = node.get(label)
+            if node is None:
+                return None
+        return node
+
+    def add(self, domain, value=True):
+        """Stores `domain` with `value`, replacing any previous value."""
+        node = self._root
+        for label in domain_labels(domain):
+            node = node.setdefault(label, {})
+        if _VALUE not in node:
+            self._size += 1
+        node[_VALUE] = value
+
+    def discard(self, domain):
+        """Removes `domain` (not its subdomains); returns True if it was stored."""
+        labels = domain_labels(domain)
+        path = [self._root]
+        for label in labels:
+            node = path[-1].get(label)
+            if node is None:
+                return False
+            path.append(node)
+        if _VALUE not in path[-1]:
+            return False
+        del path[-1][_VALUE]
+        self._size -= 1
+        # Prune the nodes that no longer lead to any domain
+        for depth in range(len(labels), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][labels[depth - 1]]
+        return True
+
+    def get(self, domain, default=None):
+        """Returns the value stored for exactly `domain`."""
+        node = self._find(domain_labels(domain))
+        if node is None:
+            return default
+        return node.get(_VALUE, default)
+
+    def covering(self, domain):
+        """
+        Returns (stored domain, value) for the closest of `domain` itself and
+        its parents that is stored, or None. "x.ads.com" is covered by "ads.com".
+        """
+        labels = domain_labels(domain)
+        node = self._root
+        match = None
+        for depth, label in enumerate(labels):
+            node = node.get(label)
+            if node is None:
+                break
+            if _VALUE in node:
+                match = depth + 1, node[_VALUE]
+        if match is None:
+            return None
+        depth, value = match
+        return _join(labels[:depth]), value
+
+    def subdomains(self, domain, include_self=True):
+        """Yields (domain, value) for every stored name at or under `domain`."""
+        labels = domain_labels(domain)
+        node = self._find(labels)
+        if node is None:
+            return
+        for name, value in self._walk(node, labels):
+            if include_self or name != _join(labels):
+                yield name, value
+
+    def suffix_search(self, text):
+        """
+        Yields (domain, value) for every stored name that ends with `text`.
+
+        This is a prefix search over the reversed names: all labels of `text`
+        but the first are walked exactly and the first may be partial, so
+        "ple.com" finds "example.com", "sample.com" and "cdn.example.com".
+        """
+        labels = domain_labels(text)
+        partial = labels.pop()
+        node = self._find(labels)
+        if node is None:
+            return
+        for label, child in node.items():
+            if label is not _VALUE and label.endswith(partial):
+                yield from self._walk(child, labels + [label])
+
+    def expand(self, pattern):
+        """
+        Yields (domain, value) for every stored name matching a wildcard pattern.
+
+        "*" as the leftmost label matches one or more labels ("*.example.com"
+        is every subdomain of example.com); elsewhere, "*" and "?" match
+        within a single label ("ads.*.com", "ad?.example.com"). Exact labels
+        are walked directly, so only wildcard labels look at sibling nodes.
+        """
+        labels = domain_labels(pattern)
+        stack = [(self._root, 0, [])]
+        while stack:
+            node, depth, name = stack.pop()
+            if depth == len(labels):
+                if _VALUE in node:
+                    yield _join(name), node[_VALUE]
+                continue
+            label = labels[depth]
+            if label == "*" and depth == len(labels) - 1:
+                for child_label, child in node.items():
+                    if child_label is not _VALUE:
+                        yield from self._walk(child, name + [child_label])
+            elif "*" in label or "?" in label or "[" in label:
+                for child_label, child in node.items():
+                    if child_label is not _VALUE and fnmatchcase(child_label, label):
+                        stack.append((child, depth + 1, name + [child_label]))
+            else:
+                child = node.get(label)
+                if child is not None:
+                    stack.append((child, depth + 1, name + [label]))
+
+    @staticmethod
+    def _walk(node, labels):
+        """Yields (domain, value) for every stored name in the subtree of `node`."""
+        stack = [(node, labels)]
+        while stack:
+            node, labels = stack.pop()
+            for label, child in node.items():
+                if label is _VALUE:
+                    yield _join(labels), child
+                else:
+                    stack.append((child, labels + [label]))
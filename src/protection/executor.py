@@ -0,0 +1,437 @@
+# src/protection/executor.py
+
+import itertools
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from core import config
+from protection import firewall_manager, hosts_editor
+from protection.expiry import DOMAIN, IP, TimedBlocks
+
+# Task kinds
+BLOCK_DOMAINS = "block_domains"
+UNBLOCK_DOMAINS = "unblock_domains"
+CLEAR_DOMAINS = "clear_domains"
+IMPORT_BLOCKLIST = "import_blocklist"
+REFRESH_BLOCKLIST = "refresh_blocklist"
+BLOCK_IPS = "block_ips"
+UNBLOCK_IPS = "unblock_ips"
+EXPIRE_DOMAINS = "expire_domains"  # Queued by the executor when temporary blocks run out
+EXPIRE_IPS = "expire_ips"
+
+HOSTS_TASKS = {BLOCK_DOMAINS, UNBLOCK_DOMAINS, CLEAR_DOMAINS, EXPIRE_DOMAINS}
+FIREWALL_TASKS = {BLOCK_IPS, UNBLOCK_IPS, EXPIRE_IPS}
+
+# `expires` is the wall-clock time a block task's blocks are lifted; None is permanent.
+Task = namedtuple("Task", "id kind items expires", defaults=(None,))
+TaskResult = namedtuple("TaskResult", "task_id kind success message")
+
+
+def _plural(count, word):
+    return f"{count} {word}{'s' if count != 1 else ''}"
+
+
+def _expires(ttl):
+    """Expiry time of a block lasting `ttl` seconds from now; None is permanent."""
+    return time.time() + ttl if ttl else None
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class ProtectionExecutor:
+    """
+    Runs hosts-file and firewall operations on one background thread.
+
+    Callers submit tasks and get a task id back immediately. The thread
+    waits `coalesce_window` seconds after the first task of a burst, then
+    folds every queued hosts task into a single apply_changes() transaction
+    and every firewall task into a single FirewallState sync, in submission
+    order (the last operation on a domain or address wins). Imports run on
+    their own, between the hosts batches before and after them.
+
+    Blocks may be temporary. Their expiry times are kept in a TimedBlocks
+    store, whose timer wheel the thread advances once per tick while any
+    are pending; every block that runs out in a tick becomes one expire
+    task, folded into the same batch as anything else queued. Blocking a
+    temporarily blocked domain or address again replaces its expiry, and
+    blocking it without one makes it permanent. A permanent IP block also
+    disarms the temporary blocks it covers, and an expiring block only
+    lifts the addresses no other block still holds.
+
+    Callbacks run on the executor thread:
+        on_finished(TaskResult) once per task,
+        on_progress(task_id, stage, done, total) during imports,
+        on_blocklist(domain_list) after every change to the hosts file,
+        on_firewall(networks) with the blocked networks after every firewall sync.
+    """
+    def __init__(self, on_finished=None, on_progress=None, on_blocklist=None,
+                 on_firewall=None, coalesce_window=None, hosts_path=None, firewall_state=None,
+                 timed_blocks=None):
+        self.on_finished = on_finished
+        self.on_progress = on_progress
+        self.on_blocklist = on_blocklist
+        self.on_firewall = on_firewall
+        self.coalesce_window = (config.PROTECTION_COALESCE_WINDOW
+                                if coalesce_window is None else coalesce_window)
+        self.hosts_path = hosts_path
+        self._firewall_state = firewall_state
+        self.timed = timed_blocks if timed_blocks is not None else TimedBlocks()
+        self._ids = itertools.count(1)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="protection-executor", daemon=True)
+        self._thread.start()
+
+    # --- Submitting (any thread) ---
+
+    def reserve_id(self):
+        """Returns an id for a later submit(), so the caller can record it before the task runs."""
+        return next(self._ids)
+
+    def submit(self, kind, items=(), expires=None, task_id=None):
+        """Queues a task; returns its id (`task_id`, if one was reserved)."""
+        task = Task(next(self._ids) if task_id is None else task_id, kind, list(items), expires)
+        self._queue.put(task)
+        return task.id
+
+    def block_domains(self, domains, ttl=None):
+        """Blocks `domains`, for `ttl` seconds if given."""
+        return self.submit(BLOCK_DOMAINS, domains, _expires(ttl))
+
+    def unblock_domains(self, domains):
+        """Domains may be wildcard patterns such as "*.example.com"."""
+        return self.submit(UNBLOCK_DOMAINS, domains)
+
+    def clear_domains(self):
+        return self.submit(CLEAR_DOMAINS)
+
+    def import_blocklist(self, source):
+        return self.submit(IMPORT_BLOCKLIST, [source])
+
+    def refresh_blocklist(self):
+        """Re-reads the hosts file and reports the blocklist through on_blocklist."""
+        return self.submit(REFRESH_BLOCKLIST)
+
+    def block_ips(self, ips, ttl=None, task_id=None):
+        """Blocks `ips`, for `ttl` seconds if given."""
+        return self.submit(BLOCK_IPS, ips, _expires(ttl), task_id)
+
+    def unblock_ips(self, ips):
+        return self.submit(UNBLOCK_IPS, ips)
+
+    def shutdown(self, timeout=5):
+        """Finishes the queued tasks, then stops the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # --- Executor thread ---
+
+    def _run(self):
+        while True:
+            # Wake once per tick while temporary blocks are pending
+            try:
+                task = self._queue.get(timeout=self.timed.tick if len(self.timed) else None)
+            except queue.Empty:
+                task = False
+            if task is None:
+                return
+            batch = [task] if task else []
+            stopping = False
+            try:
+                # Let the rest of a burst arrive, then take everything queued
+                if batch:
+                    task = self._queue.get(timeout=self.coalesce_window)
+                    while task is not None:
+                        batch.append(task)
+                        task = self._queue.get_nowait()
+                    stopping = True
+            except queue.Empty:
+                pass
+            # Expired blocks go first; they ran out before the queued tasks were run
+            batch = self._expired_tasks() + batch
+            if not batch:
+                continue
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                print(f"[!] Protection batch failed: {e}")
+            if stopping:
+                return
+
+    def _run_batch(self, batch):
+        hosts_group = []
+        firewall_group = []
+        refresh = False
+        for task in batch:
+            if task.kind in HOSTS_TASKS:
+                hosts_group.append(task)
+            elif task.kind in FIREWALL_TASKS:
+                firewall_group.append(task)
+            elif task.kind == IMPORT_BLOCKLIST:
+                # Earlier hosts tasks go first so the import sees their result
+                if hosts_group:
+                    self._run_hosts(hosts_group)
+                    hosts_group = []
+                self._run_import(task)
+                refresh = True
+            elif task.kind == REFRESH_BLOCKLIST:
+                refresh = True
+                self._finish(TaskResult(task.id, task.kind, True, "Blocklist reloaded."))
+            else:
+                self._finish(TaskResult(task.id, task.kind, False, f"Unknown task: {task.kind}"))
+        if hosts_group:
+            self._run_hosts(hosts_group)
+            refresh = True
+        if refresh:
+            self._report_blocklist()
+        if firewall_group:
+            self._run_firewall(firewall_group)
+
+    def _expired_tasks(self):
+        """Advances the expiry wheel; everything due in this tick becomes one task per kind."""
+        expired = self.timed.due(time.time())
+        tasks = []
+        if expired[DOMAIN]:
+            tasks.append(Task(next(self._ids), EXPIRE_DOMAINS, expired[DOMAIN]))
+        if expired[IP]:
+            tasks.append(Task(next(self._ids), EXPIRE_IPS, expired[IP]))
+        return tasks
+
+    def _record_expiry(self, kind, timed, tasks):
+        """Stores the expiry changes of a batch that was applied; saves them once."""
+        changed = any(task.kind in (EXPIRE_DOMAINS, EXPIRE_IPS) for task in tasks)
+        for name, expires in timed.items():
+            if expires is None:
+                changed = self.timed.discard(kind, [name]) or changed
+            else:
+                changed = self.timed.set(kind, [name], expires) or changed
+        if changed:
+            self.timed.save()
+
+    def _retry_expired(self, kind, tasks):
+        """Keeps the blocks whose expiry could not be applied, to try again later."""
+        retry_at = time.time() + config.EXPIRY_RETRY_DELAY
+        for task in tasks:
+            if task.kind in (EXPIRE_DOMAINS, EXPIRE_IPS):
+                self.timed.set(kind, task.items, retry_at)
+        self.timed.save()
+
+    def _finish(self, result):
+        if self.on_finished is not None:
+            try:
+                self.on_finished(result)
+            except Exception as e:
+                print(f"[!] Protection task callback failed: {e}")
+
+    def _report_blocklist(self):
+        if self.on_blocklist is not None:
+            try:
+                self.on_blocklist(hosts_editor.get_blocked_domains(self.hosts_path))
+            except Exception as e:
+                print(f"[!] Could not read the blocklist: {e}")
+
+    # --- Hosts file ---
+
+    def _run_hosts(self, tasks):
+        index = hosts_editor.get_index(self.hosts_path)
+        original = {key: entry.domain for key, entry in index.entries.items()}
+        blocked = dict(original)  # The blocklist as it stands after each task, in order
+        timed = {}  # Expiry after each task of the domains the batch touches; None is permanent
+        expiry = lambda key: timed[key] if key in timed else self.timed.expiry(DOMAIN, key)
+        outcomes = []
+        for task in tasks:
+            if task.kind == BLOCK_DOMAINS:
+                added, already = [], []
+                for domain in task.items:
+                    key = domain.lower()
+                    if key not in blocked:
+                        blocked[key] = domain
+                        timed[key] = task.expires
+                        added.append(domain)
+                    elif expiry(key) is not None and expiry(key) != task.expires:
+                        # A temporary block is extended, shortened or made permanent
+                        timed[key] = task.expires
+                        added.append(domain)
+                    else:
+                        already.append(domain)
+                outcomes.append((task, added, already))
+                continue
+            if task.kind == CLEAR_DOMAINS:
+                targets = list(blocked.values())
+            else:
+                # Unblock patterns and expired names; expired names hold no wildcards
+                targets = []
+                for item in task.items:
+                    if "*" in item or "?" in item:
+                        targets.extend(entry.domain for entry in index.match(item))
+                    else:
+                        targets.append(item)
+            removed = [blocked.pop(domain.lower()) for domain in targets if domain.lower() in blocked]
+            for domain in targets:
+                timed[domain.lower()] = None
+            outcomes.append((task, removed, None))
+
+        # Only the net change reaches the file, in one transaction
+        block = [domain for key, domain in blocked.items() if key not in original]
+        unblock = [domain for key, domain in original.items() if key not in blocked]
+        success, message, _ = hosts_editor.apply_changes(block=block, unblock=unblock, path=self.hosts_path)
+        if not success:
+            self._retry_expired(DOMAIN, tasks)
+        else:
+            self._record_expiry(DOMAIN, timed, tasks)
+        for task, changed, already in outcomes:
+            if not success:
+                self._finish(TaskResult(task.id, task.kind, False, message))
+            else:
+                self._finish(self._hosts_outcome(task, changed, already))
+
+    @staticmethod
+    def _hosts_outcome(task, changed, already):
+        single = len(task.items) == 1 and not ("*" in task.items[0] or "?" in task.items[0])
+        if task.kind == BLOCK_DOMAINS:
+            until = f" until {_format_time(task.expires)}" if task.expires is not None else ""
+            if single and already:
+                return TaskResult(task.id, task.kind, False, f"Domain {task.items[0]} is already blocked.")
+            if single:
+                return TaskResult(task.id, task.kind, True, f"Successfully blocked {task.items[0]}{until}.")
+            message = f"Blocked {_plural(len(changed), 'domain')}{until}"
+            if already:
+                message += f" ({len(already)} already blocked)"
+            return TaskResult(task.id, task.kind, True, message + ".")
+
+        if task.kind == EXPIRE_DOMAINS:
+            return TaskResult(task.id, task.kind, True,
+                              f"Temporary block expired on {_plural(len(changed), 'domain')}.")
+
+        if task.kind == CLEAR_DOMAINS:
+            return TaskResult(task.id, task.kind, True, f"Successfully unblocked {_plural(len(changed), 'domain')}.")
+        if single and not changed:
+            return TaskResult(task.id, task.kind, False, f"Domain {task.items[0]} was not found in the blocklist.")
+        if single:
+            return TaskResult(task.id, task.kind, True, f"Successfully unblocked {task.items[0]}.")
+        if not changed:
+            return TaskResult(task.id, task.kind, False, f"No blocked domains match {', '.join(task.items)}.")
+        return TaskResult(task.id, task.kind, True, f"Successfully unblocked {_plural(len(changed), 'domain')}.")
+
+    def _run_import(self, task):
+        progress = None
+        if self.on_progress is not None:
+            progress = lambda stage, done, total: self.on_progress(task.id, stage, done, total)
+        success, message, _ = hosts_editor.import_blocklist(task.items[0], path=self.hosts_path, progress=progress)
+        self._finish(TaskResult(task.id, task.kind, success, message))
+
+    # --- Firewall ---
+
+    def _run_firewall(self, tasks):
+        state = self._firewall_state or firewall_manager.get_state()
+        try:
+            desired = state.blocked()
+        except (RuntimeError, OSError, ValueError) as e:
+            self._retry_expired(IP, tasks)
+            for task in tasks:
+                self._finish(TaskResult(task.id, task.kind, False,
+                                        f"Error: Could not read the firewall rules. Reason: {e}"))
+            return
+
+        outcomes = []
+        timed = {}  # Expiry after each task of the networks the batch touches; None is permanent
+        expiry = lambda key: timed[key] if key in timed else self.timed.expiry(IP, key)
+
+        def temporary(exclude=()):
+            keys = {name for kind, name in self.timed.expires if kind == IP} | set(timed)
+            return [key for key in keys if key not in exclude and expiry(key) is not None]
+
+        # Temporary blocks never cover a permanent address (see below), so
+        # whatever no temporary block accounts for is blocked for good.
+        expiring = [item for task in tasks if task.kind == EXPIRE_IPS for item in task.items]
+        permanent = firewall_manager.subtract_networks(
+            desired, firewall_manager.collapse_ips(temporary() + expiring)[0])
+        for task in tasks:
+            networks, invalid = firewall_manager.collapse_ips(task.items)
+            if task.kind == BLOCK_IPS:
+                changed = False
+                for network in networks:
+                    if firewall_manager.subtract_networks([network], desired):
+                        changed = True
+                    if task.expires is None:
+                        # A permanent block disarms the temporary blocks it covers;
+                        # the parts of them outside it keep their expiry
+                        for key in temporary():
+                            covered = firewall_manager.collapse_ips([key])[0]
+                            if not firewall_manager.overlaps(covered, [network]):
+                                continue
+                            for rest in firewall_manager.subtract_networks(covered, [network]):
+                                timed[str(rest)] = expiry(key)
+                            timed[key] = None
+                            changed = True
+                        permanent = firewall_manager.collapse_ips(permanent + [network])[0]
+                    else:
+                        # Only the addresses not blocked for good become temporary
+                        for part in firewall_manager.subtract_networks([network], permanent):
+                            if expiry(str(part)) != task.expires:
+                                # New, or a temporary block extended or shortened
+                                timed[str(part)] = task.expires
+                                changed = True
+                desired = firewall_manager.collapse_ips(desired + networks)[0]
+            elif task.kind == EXPIRE_IPS:
+                # Blocks re-armed or disarmed earlier in the batch no longer expire, and
+                # addresses another block still holds stay blocked
+                items = [item for item in task.items if item not in timed]
+                held = permanent + firewall_manager.collapse_ips(temporary(exclude=task.items))[0]
+                lifted = firewall_manager.subtract_networks(firewall_manager.collapse_ips(items)[0], held)
+                changed = firewall_manager.overlaps(lifted, desired)
+                desired = firewall_manager.subtract_networks(desired, lifted)
+                for item in items:
+                    timed[item] = None
+            else:
+                changed = firewall_manager.overlaps(networks, desired)
+                desired = firewall_manager.subtract_networks(desired, networks)
+                permanent = firewall_manager.subtract_networks(permanent, networks)
+                for network in networks:
+                    timed[str(network)] = None
+            outcomes.append((task, networks, invalid, changed))
+
+        # One sync applies the net change of the whole batch
+        success, message, _ = state.sync(desired)
+        if not success:
+            self._retry_expired(IP, tasks)
+        else:
+            if any(task.kind == UNBLOCK_IPS for task in tasks):
+                # Unblocking a range also ends the temporary blocks left without any address
+                for name in temporary():
+                    if not firewall_manager.overlaps(firewall_manager.collapse_ips([name])[0], desired):
+                        timed[name] = None
+            self._record_expiry(IP, timed, tasks)
+            if self.on_firewall is not None:
+                try:
+                    self.on_firewall(desired)
+                except Exception as e:
+                    print(f"[!] Firewall change callback failed: {e}")
+        for task, networks, invalid, changed in outcomes:
+            if not success:
+                self._finish(TaskResult(task.id, task.kind, False, message))
+            elif invalid and not networks:
+                self._finish(TaskResult(task.id, task.kind, False,
+                                        f"Error: {', '.join(map(str, invalid))} is not a valid IP address."))
+            else:
+                self._finish(self._firewall_outcome(task, networks, changed))
+
+    @staticmethod
+    def _firewall_outcome(task, networks, changed):
+        label = task.items[0] if len(task.items) == 1 else _plural(len(networks), "network")
+        if task.kind == BLOCK_IPS:
+            until = f" until {_format_time(task.expires)}" if task.expires is not None else ""
+            if not changed:
+                return TaskResult(task.id, task.kind, True, f"{label} {'is' if len(task.items) == 1 else 'are'} already blocked.")
+            if len(task.items) == 1:
+                return TaskResult(task.id, task.kind, True, f"Successfully created firewall rule to block {label}{until}.")
+            return TaskResult(task.id, task.kind, True, f"Blocked {label} with the firewall{until}.")
+        if task.kind == EXPIRE_IPS:
+            return TaskResult(task.id, task.kind, True, f"Temporary firewall block expired on {label}.")
+        if not changed:
+            return TaskResult(task.id, task.kind, False, f"{label} {'is' if len(task.items) == 1 else 'are'} not blocked by DoormaNet.")
+        return TaskResult(task.id, task.kind, True, f"Successfully removed the firewall block on {label}.")
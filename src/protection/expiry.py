@@ -0,0 +1,212 @@
+# src/protection/expiry.py
+
+import json
+import math
+import os
+import time
+
+from core import config, logger
+
+EXPIRY_PATH = os.path.join(logger.LOGS_DIR, "timed_blocks.json")
+
+# Kinds of timed blocks; keys in the wheel are (kind, name) pairs.
+DOMAIN = "domain"
+IP = "ip"
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel.
+
+    Level 0 has one slot per tick; each slot of level n spans `slots` slots of
+    level n - 1. A timer goes into the coarsest level that still resolves its
+    deadline, and when the lower level wraps around, the matching slot of the
+    level above is cascaded down. Scheduling and cancelling are O(1), and an
+    advance costs O(1) per tick plus the timers that fall due or cascade;
+    timers beyond the top level wait in an overflow bucket that is re-sorted
+    once per full turn of the wheel.
+    """
+    def __init__(self, tick=1.0, slots=64, levels=4, now=None):
+        self.tick = tick
+        self.slots = slots
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow = {}
+        self._where = {}  # key -> (deadline tick, bucket holding it)
+        self._current = self._tick_of(time.time() if now is None else now)
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def _tick_of(self, when):
+        return math.floor(when / self.tick)
+
+    def _place(self, key, due_tick):
+        delta = due_tick - self._current
+        span = self.slots
+        for wheel in self._wheels:
+            if delta < span:
+                bucket = wheel[(due_tick // (span // self.slots)) % self.slots]
+                break
+            span *= self.slots
+        else:
+            bucket = self._overflow
+        bucket[key] = due_tick
+        self._where[key] = (due_tick, bucket)
+
+    def schedule(self, key, deadline):
+        """Fires `key` at the first tick at or after `deadline` (seconds); replaces any earlier timer."""
+        self.cancel(key)
+        # Deadlines already passed fire on the next tick
+        self._place(key, max(math.ceil(deadline / self.tick), self._current + 1))
+
+    def cancel(self, key):
+        """Removes the timer for `key`; returns True if there was one."""
+        entry = self._where.pop(key, None)
+        if entry is None:
+            return False
+        del entry[1][key]
+        return True
+
+    def advance(self, now=None):
+        """Moves the wheel to `now` and returns the keys that fell due, in tick order."""
+        target = self._tick_of(time.time() if now is None else now)
+        due = []
+        if target - self._current > self.slots ** len(self._wheels):
+            # After a long pause (sleep, restart) re-sorting once beats stepping every tick
+            self._current = target
+            for key, (due_tick, bucket) in list(self._where.items()):
+                del bucket[key]
+                if due_tick <= target:
+                    due.append((due_tick, key))
+                    del self._where[key]
+                else:
+                    self._place(key, due_tick)
+            due.sort()
+            return [key for _, key in due]
+
+        while self._current < target:
+            self._current += 1
+            self._cascade()
+            bucket = self._wheels[0][self._current % self.slots]
+            if bucket:
+                for key in list(bucket):
+                    del self._where[key]
+                due.extend(bucket)
+                bucket.clear()
+        return due
+
+    def _cascade(self):
+        # Highest level first, so timers can drop more than one level in a tick
+        span = self.slots ** len(self._wheels)
+        if self._current % span == 0 and self._overflow:
+            self._redistribute(self._overflow)
+        for level in range(len(self._wheels) - 1, 0, -1):
+            span = self.slots ** level
+            if self._current % span == 0:
+                self._redistribute(self._wheels[level][(self._current // span) % self.slots])
+
+    def _redistribute(self, bucket):
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, due_tick in entries:
+            self._place(key, due_tick)
+
+
+class TimedBlocks:
+    """
+    Expiry times of temporary domain and IP blocks.
+
+    The expiry times (wall-clock seconds) are written to `path` whenever
+    they change and read back on start, so blocks made before a restart
+    still expire on time; blocks that expired while DoormaNet was not
+    running are lifted on the first tick. A single TimerWheel tracks every
+    deadline, so there are no per-block timers. Not thread-safe: the
+    protection executor owns it.
+    """
+    def __init__(self, path=None, tick=None, now=None):
+        self.path = path or EXPIRY_PATH
+        self.wheel = TimerWheel(config.EXPIRY_TICK if tick is None else tick, now=now)
+        self.expires = {}  # (kind, name) -> expiry time
+        self._load()
+
+    def __len__(self):
+        return len(self.expires)
+
+    @property
+    def tick(self):
+        return self.wheel.tick
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (IOError, ValueError) as e:
+            print(f"[!] Ignoring unreadable timed block file {self.path}: {e}")
+            return
+        for kind in (DOMAIN, IP):
+            for name, expires in state.get(kind, {}).items():
+                self.expires[(kind, name)] = expires
+                self.wheel.schedule((kind, name), expires)
+
+    def save(self):
+        """Writes the expiry times with a temp file and rename, like the scan checkpoints."""
+        state = {DOMAIN: {}, IP: {}}
+        for (kind, name), expires in self.expires.items():
+            state[kind][name] = expires
+        directory = os.path.dirname(self.path)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            print(f"[!] Error: Could not save timed blocks. Reason: {e}")
+
+    def expiry(self, kind, name):
+        """Returns when the block on `name` expires, or None if it is permanent or absent."""
+        return self.expires.get((kind, name))
+
+    def set(self, kind, names, expires):
+        """Makes the blocks on `names` expire at `expires`; returns True if anything changed."""
+        changed = False
+        for name in names:
+            if self.expires.get((kind, name)) != expires:
+                self.expires[(kind, name)] = expires
+                self.wheel.schedule((kind, name), expires)
+                changed = True
+        return changed
+
+    def discard(self, kind, names):
+        """Forgets the expiry of `names` (made permanent or unblocked); returns True if any had one."""
+        changed = False
+        for name in names:
+            if self.expires.pop((kind, name), None) is not None:
+                self.wheel.cancel((kind, name))
+                changed = True
+        return changed
+
+    def clear(self, kind):
+        """Forgets every expiry of one kind."""
+        return self.discard(kind, [name for k, name in self.expires if k == kind])
+
+    def due(self, now=None):
+        """
+        Advances the wheel and returns ({kind: [names]}) whose blocks have expired.
+
+        The returned blocks are forgotten; the caller lifts them and then
+        calls save().
+        """
+        expired = {DOMAIN: [], IP: []}
+        for key in self.wheel.advance(now):
+            if self.expires.pop(key, None) is not None:
+                expired[key[0]].append(key[1])
+        return expired
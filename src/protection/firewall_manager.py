@@ -1,45 +1,720 @@
+import os
+import json
 import ctypes
+import datetime
+import ipaddress
 import subprocess
+import tempfile
+import threading
+from collections import namedtuple
+from core import config
+
+# Result of a batch block: the rules (netsh) or set entries (nftables) created, the collapsed
+# networks they cover and the entries that were not valid addresses.
+BatchResult = namedtuple("BatchResult", "rules networks invalid")
+
+# Outcome of a FirewallState sync: networks added and removed, the commands
+# run (or, in a dry run, that would run) and the (name, value) entries created.
+SyncResult = namedtuple("SyncResult", "added removed commands rules")
+
+# Hook priority of the nftables input chain: just ahead of the usual filter chains.
+NFT_CHAIN_PRIORITY = -10
 
 def is_admin():
-    """Check if the script is running with administrator privileges."""
+    """Check if the script is running with administrator (root) privileges."""
+    if os.name != "nt":
+        return os.geteuid() == 0
     try:
         return ctypes.windll.shell32.IsUserAnAdmin()
     except:
         return False
 
-def block_ip(ip_address):
+def run_command(args):
+    """
+    Default command runner: runs `args` without a shell.
+
+    Returns:
+        A (returncode, output) tuple, with stderr merged into the output.
+    """
+    try:
+        completed = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except OSError as e:
+        return 127, str(e)  # The tool is missing (e.g. netsh off Windows) or could not start
+    return completed.returncode, completed.stdout.decode('utf-8', errors='ignore').strip()
+
+class DryRunRunner:
+    """
+    Command runner that records the commands instead of running them.
+
+    netsh and nft scripts passed with -f are read at call time, so `commands` holds
+    every firewall command that would have run, in order. Useful to preview
+    a batch and to exercise this module where netsh does not exist.
+    """
+    def __init__(self):
+        self.invocations = []
+        self.commands = []
+
+    def __call__(self, args):
+        self.invocations.append(list(args))
+        if "-f" not in args:
+            return 0, ""  # A query of the current rules: report that there are none
+        with open(args[args.index("-f") + 1], 'r') as f:
+            commands = [line.strip() for line in f if line.strip()]
+        self.commands.extend(commands)
+        return 0, "\n".join("Ok." for _ in commands)
+
+def collapse_ips(ips):
+    """
+    Collapses IP addresses and CIDR ranges into the fewest covering networks.
+
+    Returns:
+        A (networks, invalid) tuple: IPv4 then IPv6 networks in address order,
+        and the entries that could not be parsed.
+    """
+    v4, v6, invalid = [], [], []
+    for ip in ips:
+        try:
+            network = ipaddress.ip_network(str(ip).strip(), strict=False)
+        except ValueError:
+            invalid.append(ip)
+            continue
+        (v4 if network.version == 4 else v6).append(network)
+    networks = list(ipaddress.collapse_addresses(v4)) + list(ipaddress.collapse_addresses(v6))
+    return networks, invalid
+
+def _address_token(network):
+    # Single hosts are written without the /32 (/128) to keep the lists short
+    if network.num_addresses == 1:
+        return str(network.network_address)
+    return str(network)
+
+def _parse_address_token(token):
+    """Parses "a.b.c.d", "net/len", "net/mask" or "first-last" into networks."""
+    token = token.strip()
+    if "-" in token:
+        first, last = (ipaddress.ip_address(part) for part in token.split("-", 1))
+        return list(ipaddress.summarize_address_range(first, last))
+    return [ipaddress.ip_network(token, strict=False)]
+
+def _intervals(networks):
+    """Merges networks into sorted, disjoint (first, last) integer ranges per IP version."""
+    ranges = {4: [], 6: []}
+    for network in networks:
+        ranges[network.version].append((int(network.network_address), int(network.broadcast_address)))
+    merged = {}
+    for version, spans in ranges.items():
+        result = []
+        for first, last in sorted(spans):
+            if result and first <= result[-1][1] + 1:
+                if last > result[-1][1]:
+                    result[-1][1] = last
+            else:
+                result.append([first, last])
+        merged[version] = result
+    return merged
+
+def _networks(version, spans):
+    address = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+    networks = []
+    for first, last in spans:
+        networks.extend(ipaddress.summarize_address_range(address(first), address(last)))
+    return networks
+
+def subtract_networks(networks, removed):
+    """Returns the minimal networks covering the addresses of `networks` not in `removed`."""
+    keep, drop = _intervals(networks), _intervals(removed)
+    result = []
+    for version in (4, 6):
+        spans = []
+        cuts = drop[version]
+        i = 0
+        for first, last in keep[version]:
+            while i < len(cuts) and cuts[i][1] < first:
+                i += 1
+            j = i
+            while j < len(cuts) and cuts[j][0] <= last:
+                if cuts[j][0] > first:
+                    spans.append((first, cuts[j][0] - 1))
+                first = max(first, cuts[j][1] + 1)
+                j += 1
+            if first <= last:
+                spans.append((first, last))
+        result.extend(_networks(version, spans))
+    return result
+
+def overlaps(networks, others):
+    """True if any address of `networks` is also in `others`."""
+    # Both sides are minimal CIDR covers, so any overlap changes the result
+    return subtract_networks(networks, others) != collapse_ips(networks)[0]
+
+def pack_remoteip_lists(networks, max_length=None):
+    """
+    Packs networks into comma-separated remoteip values no longer than
+    `max_length` characters each, so every value fits in one rule.
+    """
+    max_length = max_length or config.FIREWALL_REMOTEIP_MAX_LENGTH
+    lists = []
+    current = []
+    length = 0
+    for network in networks:
+        token = _address_token(network)
+        added = len(token) + (1 if current else 0)
+        if current and length + added > max_length:
+            lists.append(",".join(current))
+            current, length, added = [], 0, len(token)
+        current.append(token)
+        length += added
+    if current:
+        lists.append(",".join(current))
+    return lists
+
+def run_script(tool, commands, runner=None):
+    """
+    Runs a list of commands through `tool -f <script>` with one process launch.
+
+    Returns:
+        The runner's (returncode, output) tuple.
+    """
+    runner = runner or run_command
+    fd, script_path = tempfile.mkstemp(prefix="doormanet-", suffix=f".{tool}", text=True)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write("\n".join(commands) + "\n")
+        return runner([tool, "-f", script_path])
+    finally:
+        os.remove(script_path)
+
+class FirewallBackend:
+    """
+    Interface of the firewall backends.
+
+    A backend turns a batch of networks into the commands of one transaction
+    (render_block / render_unblock, which never touch the system and so
+    double as a dry-run preview) and runs them with a single invocation of
+    its tool through the pluggable command runner.
+    """
+    name = None
+
+    def __init__(self, runner=None):
+        self.runner = runner or run_command
+
+    def render_block(self, networks, rules=None):
+        """Returns the commands that block `networks` (as the `rules` from describe(), if given)."""
+        raise NotImplementedError
+
+    def render_unblock(self, networks):
+        """Returns the commands that remove the blocks on `networks`."""
+        raise NotImplementedError
+
+    def describe(self, networks):
+        """Returns the rules or set entries a block of `networks` creates."""
+        raise NotImplementedError
+
+    def run(self, commands):
+        """Runs `commands` as one transaction; returns (success, output)."""
+        raise NotImplementedError
+
+    def load(self):
+        """
+        Reads what DoormaNet currently blocks as {rule or set name: [networks]}.
+        Raises RuntimeError if the firewall could not be queried.
+        """
+        raise NotImplementedError
+
+    def render_sync(self, current, desired):
+        """
+        Returns (commands, new_state) that take the firewall from `current`
+        (as returned by load()) to blocking exactly the `desired` networks,
+        touching as few rules or set elements as possible.
+        """
+        raise NotImplementedError
+
+    def block(self, networks):
+        """Blocks `networks` in one transaction; returns (success, output)."""
+        return self.run(self.render_block(networks))
+
+    def unblock(self, networks):
+        """Unblocks `networks` in one transaction; returns (success, output)."""
+        return self.run(self.render_unblock(networks))
+
+class NetshBackend(FirewallBackend):
+    """
+    Windows Defender Firewall through netsh.
+
+    A batch becomes inbound block rules whose remoteip lists are packed up to
+    FIREWALL_REMOTEIP_MAX_LENGTH characters; all rules of a batch are created
+    by one `netsh -f` script. A single address keeps the per-IP rule name
+    block_ip() has always used, so it can be unblocked by name.
+    """
+    name = "netsh"
+
+    def __init__(self, runner=None, max_length=None):
+        super().__init__(runner)
+        self.max_length = max_length
+
+    SHOW_RULES = ["netsh", "advfirewall", "firewall", "show", "rule", "name=all", "dir=in"]
+
+    def describe(self, networks, taken=()):
+        if len(networks) == 1 and networks[0].num_addresses == 1:
+            address = _address_token(networks[0])
+            name = f"{config.FIREWALL_RULE_PREFIX}-{address}"
+            if name not in taken:
+                return [(name, address)]
+        # One timestamp per batch keeps rule names unique across batches
+        batch = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+        rules = []
+        number = 0
+        for remoteip in pack_remoteip_lists(networks, self.max_length):
+            number += 1
+            while f"{config.FIREWALL_RULE_PREFIX}-{batch}-{number}" in taken:
+                number += 1
+            rules.append((f"{config.FIREWALL_RULE_PREFIX}-{batch}-{number}", remoteip))
+        return rules
+
+    @staticmethod
+    def add_rule_command(name, remoteip):
+        return f"advfirewall firewall add rule name={name} dir=in action=block remoteip={remoteip}"
+
+    @staticmethod
+    def delete_rule_command(name):
+        return f"advfirewall firewall delete rule name={name}"
+
+    def render_block(self, networks, rules=None):
+        rules = rules if rules is not None else self.describe(networks)
+        return [self.add_rule_command(name, remoteip) for name, remoteip in rules]
+
+    def render_unblock(self, networks):
+        # Only per-address rules can be removed by name here; rules holding a
+        # packed list are rewritten as a whole by whoever tracks their contents.
+        return [self.delete_rule_command(f"{config.FIREWALL_RULE_PREFIX}-{_address_token(network)}")
+                for network in networks]
+
+    def run(self, commands):
+        if not commands:
+            return True, ""
+        returncode, output = run_script("netsh", commands, self.runner)
+        # netsh -f stops at the first command that fails and exits non-zero; its
+        # replies ("Ok.") are translated into the display language, so only the
+        # exit status says whether the script succeeded
+        return returncode == 0, output
+
+    def load(self):
+        returncode, output = self.runner(self.SHOW_RULES)
+        if returncode != 0:
+            # "No rules match the specified criteria." is a one-line reply in any display language
+            if returncode != 127 and len(output.strip().splitlines()) == 1:
+                return {}
+            raise RuntimeError(output or f"netsh exited with status {returncode}")
+        return parse_netsh_rules(output)
+
+    def render_sync(self, current, desired):
+        desired = collapse_ips(desired)[0]
+        removed = subtract_networks([n for nets in current.values() for n in nets], desired)
+        # A rule holding any removed address is deleted and its other addresses re-added
+        stale = [name for name, nets in current.items() if removed and overlaps(nets, removed)]
+        kept = {name: nets for name, nets in current.items() if name not in stale}
+        missing = subtract_networks(desired, [n for nets in kept.values() for n in nets])
+        new_rules = self.describe(missing, taken=kept) if missing else []
+
+        commands = [self.delete_rule_command(name) for name in stale]
+        commands += [self.add_rule_command(name, remoteip) for name, remoteip in new_rules]
+        new_state = dict(kept)
+        for name, remoteip in new_rules:
+            new_state[name] = [net for token in remoteip.split(",") for net in _parse_address_token(token)]
+        return commands, new_state
+
+def parse_netsh_rules(output):
     """
-    Creates a new inbound rule in Windows Defender Firewall to block an IP address.
+    Extracts {rule name: [networks]} for the DoormaNet rules in the output of
+    `netsh advfirewall firewall show rule`.
+
+    netsh translates its field names into the display language, so fields
+    are recognised by their values instead: rules are separated by blank
+    lines, a DoormaNet rule is one whose first field starts with
+    FIREWALL_RULE_PREFIX, and its remote addresses are the field whose
+    value is a list of addresses (LocalIP is always "Any" for our rules).
+    """
+    rules = {}
+    name = None
+    first_field = True
+    for line in output.splitlines():
+        if not line.strip():
+            name, first_field = None, True
+            continue
+        _, separator, value = line.partition(":")
+        if not separator:
+            continue  # The dashed line under the rule name
+        value = value.strip()
+        if first_field:
+            first_field = False
+            name = value if value.startswith(config.FIREWALL_RULE_PREFIX) else None
+            continue
+        if name is None or not value:
+            continue
+        try:
+            networks = [network for token in value.split(",") for network in _parse_address_token(token)]
+        except ValueError:
+            continue  # Not an address field, or keywords such as "Any" or "LocalSubnet"
+        rules.setdefault(name, []).extend(networks)
+    return rules
+
+class NftablesBackend(FirewallBackend):
+    """
+    Linux nftables.
+
+    Blocked addresses live in two nft sets (IPv4 and IPv6) with the interval
+    flag, matched by one drop rule each in an input-hook chain of a private
+    table, so a lookup is a kernel tree search however many addresses are
+    blocked. Each batch is one `nft -f` script, which nft applies as a
+    single atomic transaction: the table, sets and chain are (re)declared,
+    the chain's two rules are flushed and re-added, and the elements are
+    added or deleted. Any failure leaves the previous ruleset untouched.
+    """
+    name = "nftables"
+    ELEMENTS_PER_LINE = 1000  # Keeps single script lines at a manageable length
+
+    def __init__(self, runner=None, table=None):
+        super().__init__(runner)
+        self.table = table or config.NFT_TABLE
+
+    def _set_name(self, version):
+        return "blocked_v4" if version == 4 else "blocked_v6"
+
+    def render_base(self):
+        """Commands that (re)create the table, sets and chain without touching set contents."""
+        table = f"inet {self.table}"
+        return [
+            f"add table {table}",
+            f"add set {table} blocked_v4 {{ type ipv4_addr; flags interval; auto-merge; }}",
+            f"add set {table} blocked_v6 {{ type ipv6_addr; flags interval; auto-merge; }}",
+            f"add chain {table} input {{ type filter hook input priority {NFT_CHAIN_PRIORITY}; policy accept; }}",
+            f"flush chain {table} input",
+            f"add rule {table} input ip saddr @blocked_v4 counter drop",
+            f"add rule {table} input ip6 saddr @blocked_v6 counter drop",
+        ]
+
+    def _render_elements(self, verb, networks):
+        commands = []
+        for version in (4, 6):
+            tokens = [_address_token(network) for network in networks if network.version == version]
+            for start in range(0, len(tokens), self.ELEMENTS_PER_LINE):
+                chunk = ", ".join(tokens[start:start + self.ELEMENTS_PER_LINE])
+                commands.append(f"{verb} element inet {self.table} {self._set_name(version)} {{ {chunk} }}")
+        return commands
+
+    def describe(self, networks):
+        return [(self._set_name(network.version), _address_token(network)) for network in networks]
+
+    def render_block(self, networks, rules=None):
+        return self.render_base() + self._render_elements("add", networks)
+
+    def render_unblock(self, networks):
+        # Deleting an element that is not in the set fails the whole transaction
+        return self.render_base() + self._render_elements("delete", networks)
+
+    def run(self, commands):
+        if not commands:
+            return True, ""
+        returncode, output = run_script("nft", commands, self.runner)
+        return returncode == 0, output
+
+    def load(self):
+        returncode, output = self.runner(["nft", "-j", "list", "table", "inet", self.table])
+        if returncode != 0:
+            if returncode != 127 and "No such file or directory" in output:
+                return {}  # nft itself ran, but the table has not been created yet
+            raise RuntimeError(output or f"nft exited with status {returncode}")
+        if not output.strip():
+            return {}
+        state = {}
+        for item in json.loads(output).get("nftables", []):
+            nft_set = item.get("set")
+            if nft_set and nft_set.get("name") in ("blocked_v4", "blocked_v6"):
+                state[nft_set["name"]] = [network for element in nft_set.get("elem", [])
+                                          for network in _nft_element_networks(element)]
+        return state
+
+    def render_sync(self, current, desired):
+        desired = collapse_ips(desired)[0]
+        commands = []
+        new_state = {}
+        for version in (4, 6):
+            set_name = self._set_name(version)
+            want = [network for network in desired if network.version == version]
+            have = current.get(set_name, [])
+            if subtract_networks(have, want):
+                # Removing part of a merged interval is not portable across nft
+                # versions, so the set is flushed and refilled in the same transaction.
+                commands.append(f"flush set inet {self.table} {set_name}")
+                commands += self._render_elements("add", want)
+            else:
+                commands += self._render_elements("add", subtract_networks(want, have))
+            new_state[set_name] = want
+        if commands:
+            commands = self.render_base() + commands
+        return commands, new_state
+
+def _nft_element_networks(element):
+    """Converts one element of `nft -j` set output into networks."""
+    if isinstance(element, str):
+        return [ipaddress.ip_network(element)]
+    if "elem" in element:
+        return _nft_element_networks(element["elem"]["val"])
+    if "prefix" in element:
+        prefix = element["prefix"]
+        return [ipaddress.ip_network(f"{prefix['addr']}/{prefix['len']}")]
+    if "range" in element:
+        first, last = (ipaddress.ip_address(address) for address in element["range"])
+        return list(ipaddress.summarize_address_range(first, last))
+    return []
+
+BACKENDS = {backend.name: backend for backend in (NetshBackend, NftablesBackend)}
+
+def get_backend(name=None, runner=None):
+    """
+    Returns the firewall backend named `name`, config.FIREWALL_BACKEND, or
+    the platform default (netsh on Windows, nftables elsewhere).
+    """
+    name = name or config.FIREWALL_BACKEND or ("netsh" if os.name == "nt" else "nftables")
+    try:
+        return BACKENDS[name](runner=runner)
+    except KeyError:
+        raise ValueError(f"Unknown firewall backend: {name}") from None
+
+class FirewallState:
+    """
+    Cached view of the DoormaNet firewall rules with diff-based updates.
+
+    The backend is queried once; afterwards the cache is updated from the
+    commands this object runs itself. Every change is expressed as a desired
+    block set: the minimal add/remove diff against the cache is rendered
+    and run as one transaction, and a sync that changes nothing runs no
+    command at all. A failed apply drops the cache so the next call re-reads
+    the real rules. Safe to share between threads.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend or get_backend()
+        self._rules = None
+        self._lock = threading.RLock()
+
+    def rules(self):
+        """Returns {rule or set name: [networks]} for what DoormaNet blocks."""
+        with self._lock:
+            if self._rules is None:
+                self._rules = self.backend.load()
+            return dict(self._rules)
+
+    def invalidate(self):
+        """Forgets the cached rules, e.g. after they were edited outside DoormaNet."""
+        with self._lock:
+            self._rules = None
+
+    def blocked(self):
+        """Returns the blocked networks, collapsed."""
+        return collapse_ips(network for networks in self.rules().values() for network in networks)[0]
+
+    def is_blocked(self, ip):
+        """True if every address of `ip` (an address or CIDR range) is blocked."""
+        network = ipaddress.ip_network(str(ip).strip(), strict=False)
+        return not subtract_networks([network], self.blocked())
+
+    def sync(self, desired, dry_run=False):
+        """
+        Makes the firewall block exactly the `desired` networks.
+
+        Returns:
+            A (success, message, SyncResult) tuple; with dry_run=True the
+            commands are returned without being run.
+        """
+        desired = collapse_ips(desired)[0]
+        with self._lock:
+            try:
+                current = self.rules()
+            except (RuntimeError, OSError, ValueError) as e:
+                return False, f"Error: Could not read the firewall rules. Reason: {e}", None
+            blocked = collapse_ips(network for networks in current.values() for network in networks)[0]
+            added = subtract_networks(desired, blocked)
+            removed = subtract_networks(blocked, desired)
+            if not added and not removed:
+                return True, "Firewall rules are already up to date.", SyncResult([], [], [], [])
+
+            commands, new_state = self.backend.render_sync(current, desired)
+            # Sets left empty (e.g. no IPv6 addresses) create nothing worth reporting
+            created = [(name, ",".join(_address_token(n) for n in networks))
+                       for name, networks in new_state.items()
+                       if networks and (name not in current
+                                        or collapse_ips(networks)[0] != collapse_ips(current[name])[0])]
+            result = SyncResult(added, removed, commands, created)
+            if dry_run:
+                return True, f"Dry run: {len(commands)} commands would run.", result
+
+            success, output = self.backend.run(commands)
+            if not success:
+                self._rules = None  # Partially applied or changed elsewhere: re-read next time
+                return False, f"Error: Could not update the firewall rules. Reason: {output}", result
+            self._rules = new_state
+        return True, f"Blocked {len(added)} and unblocked {len(removed)} networks.", result
+
+    def block(self, ips, dry_run=False):
+        """Adds `ips` to the block set; returns sync()'s tuple."""
+        networks, _ = collapse_ips(ips)
+        with self._lock:
+            try:
+                blocked = self.blocked()
+            except (RuntimeError, OSError, ValueError) as e:
+                return False, f"Error: Could not read the firewall rules. Reason: {e}", None
+            return self.sync(blocked + networks, dry_run)
+
+    def unblock(self, ips, dry_run=False):
+        """Removes `ips` from the block set; returns sync()'s tuple."""
+        networks, _ = collapse_ips(ips)
+        with self._lock:
+            try:
+                blocked = self.blocked()
+            except (RuntimeError, OSError, ValueError) as e:
+                return False, f"Error: Could not read the firewall rules. Reason: {e}", None
+            return self.sync(subtract_networks(blocked, networks), dry_run)
+
+    def clear(self, dry_run=False):
+        """Removes every DoormaNet block."""
+        return self.sync([], dry_run)
+
+_state = None
+
+def get_state():
+    """Returns the shared FirewallState of the configured backend."""
+    global _state
+    if _state is None:
+        _state = FirewallState()
+    return _state
+
+def _state_for(runner=None, backend=None, max_length=None):
+    if runner is None and backend is None and max_length is None:
+        return get_state()
+    backend = backend or get_backend(runner=runner)
+    if max_length is not None and isinstance(backend, NetshBackend):
+        backend.max_length = max_length
+    return FirewallState(backend)
+
+def block_ip(ip_address, runner=None, backend=None):
+    """
+    Blocks inbound traffic from one IP address with the platform's firewall.
     Returns True if successful, False otherwise, along with a message.
+    Blocking an address that is already blocked changes nothing.
     """
-    # Note: This command requires administrator privileges to run successfully.
+    # Note: This requires administrator (root) privileges to run successfully.
     # Your final .exe will need to be run "As Administrator" for this to work.
-    
-    rule_name = f"DoormaNet-Block-{ip_address}"
-    command = (
-        f'netsh advfirewall firewall add rule name="{rule_name}" dir=in action=block remoteip={ip_address}'
-    )
-    
     try:
-        # We use check_output to run the command and capture its output.
-        # stderr=subprocess.STDOUT is used to capture error messages as well.
-        # shell=True is sometimes needed on Windows for commands like netsh
-        subprocess.check_output(command, stderr=subprocess.STDOUT, shell=True)
-        message = f"Successfully created firewall rule to block {ip_address}."
+        network = ipaddress.ip_network(ip_address.strip())
+    except ValueError:
+        message = f"Error: {ip_address} is not a valid IP address."
         print(message)
-        return True, message
-    except subprocess.CalledProcessError as e:
+        return False, message
+
+    success, output, result = _state_for(runner, backend).block([network])
+    if not success:
         # This error is often caused by not having administrator privileges.
-        error_message = e.output.decode('utf-8', errors='ignore').strip()
-        message = f"Error: Could not block {ip_address}. Reason: {error_message}"
+        message = f"Error: Could not block {ip_address}. Reason: {output}"
         print(message)
         return False, message
+    if not result.added:
+        return True, f"{ip_address} is already blocked."
+    message = f"Successfully created firewall rule to block {ip_address}."
+    print(message)
+    return True, message
 
-# --- Example Usage (requires running this script in an Admin terminal) ---
+def unblock_ip(ip_address, runner=None, backend=None):
+    """Removes the DoormaNet block on an IP address (rewriting the rule that holds it)."""
+    try:
+        network = ipaddress.ip_network(ip_address.strip())
+    except ValueError:
+        return False, f"Error: {ip_address} is not a valid IP address."
+
+    success, output, result = _state_for(runner, backend).unblock([network])
+    if not success:
+        message = f"Error: Could not unblock {ip_address}. Reason: {output}"
+        print(message)
+        return False, message
+    if not result.removed:
+        return False, f"{ip_address} is not blocked by DoormaNet."
+    message = f"Successfully removed the firewall block on {ip_address}."
+    print(message)
+    return True, message
+
+def block_ips(ips, runner=None, max_length=None, backend=None):
+    """
+    Blocks many IP addresses or CIDR ranges with as few firewall rules as possible.
+
+    The addresses are collapsed into the minimal set of CIDR networks, and
+    only those not blocked yet are handed to the backend as one batch: netsh
+    packs them into remoteip lists that fit the per-rule length limit,
+    nftables adds them to its interval sets. Either way the whole batch is a
+    single invocation.
+
+    Returns:
+        A (success, message, BatchResult) tuple; BatchResult.networks holds
+        the newly blocked networks.
+    """
+    networks, invalid = collapse_ips(ips)
+    if not networks:
+        return False, "No valid IP addresses to block.", BatchResult([], [], invalid)
+
+    state = _state_for(runner, backend, max_length)
+    success, output, result = state.block(networks)
+    if not success:
+        message = f"Error: Could not block {len(networks)} networks. Reason: {output}"
+        print(message)
+        return False, message, BatchResult([], [], invalid)
+
+    batch = BatchResult(result.rules, result.added, invalid)
+    if not result.added:
+        message = f"All {len(networks)} networks are already blocked."
+    elif isinstance(state.backend, NetshBackend):
+        message = (f"Blocked {len(result.added)} networks with {len(result.rules)} firewall "
+                   f"rule{'s' if len(result.rules) != 1 else ''}.")
+    else:
+        message = f"Blocked {len(result.added)} networks with the {state.backend.name} firewall."
+    if invalid:
+        message += f" Skipped {len(invalid)} invalid entries."
+    print(message)
+    return True, message, batch
+
+def list_blocked(runner=None, backend=None):
+    """Returns the networks DoormaNet currently blocks."""
+    return _state_for(runner, backend).blocked()
+
+# --- Example Usage (requires running this script in an Admin/root terminal) ---
 if __name__ == '__main__':
-    # You must run this from a command prompt with "Run as administrator"
-    test_ip = "192.168.1.254" # An example IP to block
-    print(f"Attempting to block IP: {test_ip}")
-    success, msg = block_ip(test_ip)
-    print(msg)
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Block IP addresses with the platform firewall.")
+    parser.add_argument("ips", nargs="*", default=["192.168.1.254"], # An example IP to block
+                        help="addresses or CIDR ranges to block")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None,
+                        help="firewall backend (default: the platform's)")
+    parser.add_argument("--unblock", action="store_true", help="remove the blocks instead")
+    parser.add_argument("--list", action="store_true", help="list what DoormaNet currently blocks")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the generated script instead of running it (no privileges needed)")
+    args = parser.parse_args()
+
+    backend = get_backend(args.backend)
+    networks, invalid = collapse_ips(args.ips)
+    for entry in invalid:
+        print(f"[!] Skipping invalid address: {entry}")
+    if args.list:
+        try:
+            for network in list_blocked(backend=backend):
+                print(network)
+        except RuntimeError as e:
+            print(f"[!] Could not read the firewall rules: {e}")
+    elif args.dry_run:
+        render = backend.render_unblock if args.unblock else backend.render_block
+        print("\n".join(render(networks)))
+    elif args.unblock:
+        success, msg, _ = FirewallState(backend).unblock(networks)
+        print(msg)
+    else:
+        # You must run this from a command prompt with "Run as administrator" (or as root)
+        print(f"Attempting to block: {', '.join(args.ips)}")
+        success, msg, _ = block_ips(args.ips, backend=backend)
+        print(msg)
@@ -1,73 +1,473 @@
 import os
+import re
+import ipaddress
+import time
+import shutil
+import hashlib
+import tempfile
 import datetime
+from collections import namedtuple
+from contextlib import contextmanager
 from core import config
-# The path to the hosts file on Windows
-HOSTS_FILE_PATH = r"C:\Windows\System32\drivers\etc\hosts"
+from protection.domain_trie import DomainTrie
 
-def get_blocked_domains():
-    """Reads the hosts file and returns a list of domains blocked by this tool with timestamps."""
-    blocked = []
-    try:
-        with open(HOSTS_FILE_PATH, 'r') as f:
-            for line in f.readlines():
-                if f"# Blocked by DoormaNet" in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        domain = parts[1]
-                        # Extract timestamp if present
-                        timestamp = "Unknown date"
-                        if "on" in line:
-                            try:
-                                # Find the timestamp in the comment
-                                comment_part = line.split("# Blocked by DoormaNet")[1]
-                                if "on" in comment_part:
-                                    timestamp = comment_part.split("on")[1].strip()
-                            except:
-                                timestamp = "Unknown date"
-                        blocked.append({"domain": domain, "timestamp": timestamp})
-    except FileNotFoundError:
-        pass # File doesn't exist, so no domains are blocked
-    return blocked
-
-def block_domain(domain):
-    """Adds a domain to the hosts file to block it with timestamp."""
+try:
+    import fcntl  # POSIX file locking
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt  # Windows file locking
+except ImportError:
+    msvcrt = None
+
+# The path to the hosts file (config.HOSTS_FILE_PATH overrides the system default)
+if os.name == "nt":
+    SYSTEM_HOSTS_PATH = r"C:\Windows\System32\drivers\etc\hosts"
+else:
+    SYSTEM_HOSTS_PATH = "/etc/hosts"
+HOSTS_FILE_PATH = config.HOSTS_FILE_PATH or SYSTEM_HOSTS_PATH
+
+# Comment that marks the lines written by this tool
+BLOCK_MARKER = "# Blocked by DoormaNet"
+
+# "<ip> <domain> # Blocked by DoormaNet on <timestamp>"; the timestamp is optional
+BLOCK_LINE_RE = re.compile(r"^\s*(\S+)\s+(\S+)\s*# Blocked by DoormaNet(?:\s+on\s+(.*?))?\s*$")
+
+BlockEntry = namedtuple("BlockEntry", "domain ip line_number timestamp")
+
+# Outcome of apply_changes: lists of domain names
+ChangeResult = namedtuple("ChangeResult", "blocked unblocked already_blocked not_found")
+
+# Outcome of import_blocklist: counts
+ImportResult = namedtuple("ImportResult", "lines added duplicates invalid")
+
+# Two or more dot-separated labels of letters, digits, hyphens and underscores,
+# 1-63 characters each with no hyphen at either end
+DOMAIN_RE = re.compile(r"(?:(?!-)[a-z0-9_-]{1,63}(?<!-)\.)+(?!-)[a-z0-9_-]{1,63}(?<!-)")
+
+# Sink addresses used by hosts-format feeds, checked before a full address parse
+SINK_ADDRESSES = {"0.0.0.0", "127.0.0.1", "::", "::1"}
+
+# Names that hosts-format feeds map to themselves and must never be blocked
+RESERVED_NAMES = {"localhost", "localhost.localdomain", "local", "broadcasthost",
+                  "ip6-localhost", "ip6-loopback", "ip6-localnet", "ip6-mcastprefix",
+                  "ip6-allnodes", "ip6-allrouters", "ip6-allhosts", "0.0.0.0"}
+
+# Lines read between two progress reports while importing
+IMPORT_PROGRESS_LINES = 10000
+
+
+class BlocklistIndex:
+    """
+    Parsed view of the DoormaNet entries in a hosts file.
+
+    Entries are keyed by lower-cased domain, so "is X blocked" is a dict
+    lookup; a reversed-label trie over the same entries, built on first use,
+    answers parent-domain and wildcard queries. The (mtime, size) of the
+    file at parse time is kept so callers can tell whether the index is
+    still current without re-reading it.
+    """
+    def __init__(self, path, entries, mtime_ns, size):
+        self.path = path
+        self.entries = entries
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._domain_list = None
+        self._trie = None
+
+    @classmethod
+    def parse(cls, path):
+        """Reads `path` once and indexes its DoormaNet lines."""
+        entries = {}
+        try:
+            with open(path, 'r') as f:
+                stat = os.fstat(f.fileno())
+                for line_number, line in enumerate(f):
+                    if BLOCK_MARKER not in line:
+                        continue
+                    match = BLOCK_LINE_RE.match(line)
+                    if match is None:
+                        continue
+                    ip, domain, timestamp = match.groups()
+                    entries[domain.lower()] = BlockEntry(domain, ip, line_number, timestamp or "Unknown date")
+            return cls(path, entries, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return cls(path, entries, None, None)
+
+    def is_current(self):
+        """True if the file still has the mtime and size it had when parsed."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self.mtime_ns is None
+        return (stat.st_mtime_ns, stat.st_size) == (self.mtime_ns, self.size)
+
+    def __contains__(self, domain):
+        return domain.lower() in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, domain):
+        return self.entries.get(domain.lower())
+
+    @property
+    def trie(self):
+        if self._trie is None:
+            self._trie = DomainTrie(self.entries.items())
+        return self._trie
+
+    def covering(self, domain):
+        """Returns the BlockEntry of `domain` or of its closest blocked parent domain."""
+        match = self.trie.covering(domain)
+        return match[1] if match is not None else None
+
+    def match(self, pattern):
+        """Returns the BlockEntries matching a wildcard pattern such as "*.example.com"."""
+        return [entry for _, entry in self.trie.expand(pattern)]
+
+    def domain_list(self):
+        """Returns [{"domain", "timestamp"}] in file order; built once per index."""
+        if self._domain_list is None:
+            self._domain_list = [{"domain": entry.domain, "timestamp": entry.timestamp}
+                                 for entry in self.entries.values()]
+        return self._domain_list
+
+
+_index = None
+
+
+def get_index(path=None):
+    """
+    Returns the blocklist index of the hosts file, re-parsing it only if the
+    file's mtime or size changed since the last call.
+    """
+    global _index
+    path = path or HOSTS_FILE_PATH
+    # One read of the global: another thread may invalidate it meanwhile
+    index = _index
+    if index is None or index.path != path or not index.is_current():
+        index = _index = BlocklistIndex.parse(path)
+    return index
+
+
+def invalidate_index():
+    """Drops the cached index; called after this module writes the hosts file."""
+    global _index
+    _index = None
+
+
+def is_blocked(domain, path=None, include_parents=False):
+    """
+    Returns True if `domain` has a DoormaNet entry in the hosts file.
+
+    With include_parents=True a blocked parent domain also counts, e.g.
+    "cdn.ads.com" when "ads.com" is blocked. The hosts file itself only
+    matches exact names; the parent check is for resolvers that use the
+    blocklist as a zone list.
+    """
+    index = get_index(path)
+    if include_parents:
+        return index.covering(domain) is not None
+    return domain in index
+
+
+def find_blocked(pattern, path=None):
+    """Returns the blocked domains matching a wildcard pattern such as "*.example.com"."""
+    return [entry.domain for entry in get_index(path).match(pattern)]
+
+
+def get_blocked_domains(path=None):
+    """Returns the domains blocked by this tool with timestamps, from the cached index."""
+    return get_index(path).domain_list()
+
+@contextmanager
+def hosts_lock(path=None, timeout=None):
+    """
+    Holds an exclusive lock against other DoormaNet processes writing `path`.
+
+    The lock is taken on a side file in the temp directory, because the
+    hosts file itself is replaced (and its inode changes) on every write.
+    """
+    path = os.path.abspath(path or HOSTS_FILE_PATH)
+    timeout = config.HOSTS_LOCK_TIMEOUT if timeout is None else timeout
+    name = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+    lock_path = os.path.join(tempfile.gettempdir(), f"doormanet-hosts-{name}.lock")
+    with open(lock_path, 'a+') as lock_file:
+        fd = lock_file.fileno()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    lock_file.seek(0)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for the lock on {path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomically(path, lines):
+    """Writes `lines` to a temp file next to `path`, fsyncs it and renames it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".hosts-", suffix=".tmp", dir=directory)
     try:
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(HOSTS_FILE_PATH, 'a') as f:
-            f.write(f"\n{config.HOSTS_REDIRECT_IP}\t{domain}\t# Blocked by DoormaNet on {timestamp}\n")
-        return True, f"Successfully blocked {domain}."
-    except PermissionError:
-        return False, "Permission denied. Please run as administrator."
-    except Exception as e:
-        return False, f"An error occurred: {e}"
+        with os.fdopen(fd, 'w') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)  # Keep the hosts file readable by everyone
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _block_line(domain, timestamp):
+    return f"{config.HOSTS_REDIRECT_IP}\t{domain}\t{BLOCK_MARKER} on {timestamp}\n"
 
-def unblock_domain(domain):
-    """Removes a domain from the hosts file to unblock it."""
+
+def apply_changes(block=(), unblock=(), path=None):
+    """
+    Applies any mix of block and unblock operations in one transaction.
+
+    The hosts file is read once under the writer lock, edited in memory and
+    written back with a single atomic rename, so a crash leaves either the
+    old or the new file, never a truncated one. Domains are matched exactly
+    (case-insensitive); other lines of the file are preserved as they are.
+
+    Args:
+        block (iterable): Domains to add.
+        unblock (iterable): Domains whose DoormaNet entries are removed.
+        path (str): Hosts file to edit; defaults to HOSTS_FILE_PATH.
+
+    Returns:
+        A (success, message, ChangeResult) tuple.
+    """
+    path = path or HOSTS_FILE_PATH
+    unblock_keys = {domain.lower(): domain for domain in unblock}
     try:
-        with open(HOSTS_FILE_PATH, 'r') as f:
-            lines = f.readlines()
-        
-        # Write the file back, excluding the line with the domain to unblock
-        with open(HOSTS_FILE_PATH, 'w') as f:
-            found = False
+        with hosts_lock(path):
+            try:
+                with open(path, 'r') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                lines = []
+
+            kept = []
+            existing = set()
+            unblocked = []
             for line in lines:
-                if domain in line and "# Blocked by DoormaNet" in line:
-                    found = True
-                    continue # Skip writing this line to the file
-                f.write(line)
-        
-        if found:
-            return True, f"Successfully unblocked {domain}."
-        else:
-            return False, f"Domain {domain} was not found in the blocklist."
+                if BLOCK_MARKER in line:
+                    match = BLOCK_LINE_RE.match(line)
+                    if match is not None:
+                        key = match.group(2).lower()
+                        if key in unblock_keys:
+                            unblocked.append(match.group(2))
+                            continue  # Skip writing this line to the file
+                        existing.add(key)
+                kept.append(line)
 
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            blocked = []
+            already_blocked = []
+            for domain in block:
+                key = domain.lower()
+                if key in existing:
+                    already_blocked.append(domain)
+                    continue
+                existing.add(key)
+                blocked.append(domain)
+            if blocked:
+                if kept and not kept[-1].endswith("\n"):
+                    kept[-1] += "\n"
+                kept.extend(_block_line(domain, timestamp) for domain in blocked)
+
+            removed = {domain.lower() for domain in unblocked}
+            not_found = [domain for key, domain in unblock_keys.items() if key not in removed]
+            if blocked or unblocked:
+                _write_atomically(path, kept)
+                invalidate_index()
     except PermissionError:
-        return False, "Permission denied. Please run as administrator."
+        return False, "Permission denied. Please run as administrator.", None
     except Exception as e:
-        return False, f"An error occurred: {e}"
+        return False, f"An error occurred: {e}", None
+
+    result = ChangeResult(blocked, unblocked, already_blocked, not_found)
+    return True, f"Blocked {len(blocked)}, unblocked {len(unblocked)} domains.", result
+
+
+def block_domain(domain, path=None):
+    """Adds a domain to the hosts file to block it with timestamp."""
+    success, message, result = apply_changes(block=[domain], path=path)
+    if not success:
+        return False, message
+    if result.already_blocked:
+        return False, f"Domain {domain} is already blocked."
+    return True, f"Successfully blocked {domain}."
+
+
+def unblock_domain(domain, path=None):
+    """
+    Removes a domain from the hosts file to unblock it.
+
+    A wildcard pattern such as "*.example.com" unblocks every matching entry
+    in the same transaction.
+    """
+    if "*" in domain or "?" in domain:
+        matches = find_blocked(domain, path)
+        if not matches:
+            return False, f"No blocked domains match {domain}."
+        success, message, result = apply_changes(unblock=matches, path=path)
+        if not success:
+            return False, message
+        return True, f"Successfully unblocked {len(result.unblocked)} domains matching {domain}."
+
+    success, message, result = apply_changes(unblock=[domain], path=path)
+    if not success:
+        return False, message
+    if result.not_found:
+        return False, f"Domain {domain} was not found in the blocklist."
+    return True, f"Successfully unblocked {domain}."
+
+
+def clear_all_blocks(path=None):
+    """Removes every DoormaNet entry with a single rewrite of the hosts file."""
+    domains = [entry.domain for entry in get_index(path).entries.values()]
+    return apply_changes(unblock=domains, path=path)
+
+
+def normalize_domain(value):
+    """
+    Normalises a domain from a blocklist feed.
+
+    Lower-cases it, strips URL schemes, paths, ports, a trailing dot and
+    adblock-style "||...^" wrappers, and converts internationalised names to
+    their IDNA form.
+
+    Returns:
+        The normalised domain, or None if it is not a valid hostname.
+    """
+    domain = value.strip().lower()
+    if domain.startswith("||"):
+        domain = domain[2:]
+    domain = domain.split("^", 1)[0]
+    if "://" in domain:
+        domain = domain.split("://", 1)[1]
+    domain = domain.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+    if not domain or domain in RESERVED_NAMES:
+        return None
+    if not domain.isascii():
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            return None
+    if len(domain) > 253 or DOMAIN_RE.fullmatch(domain) is None:
+        return None
+    if domain.rsplit(".", 1)[1].isdigit():
+        return None  # An IPv4 address, not a name
+    return domain
+
+
+def parse_blocklist_line(line):
+    """
+    Yields the raw domain fields of one blocklist line.
+
+    Accepts hosts format ("0.0.0.0 a.com b.com"), plain domain lists and
+    adblock-style "||a.com^" rules; comments and blank lines yield nothing.
+    """
+    line = line.split("#", 1)[0].strip()
+    if not line or line.startswith("!"):
+        return
+    fields = line.split()
+    if len(fields) > 1 and _is_address(fields[0]):
+        fields = fields[1:]  # Hosts format: drop the target address
+    yield from fields
+
+
+def _is_address(value):
+    if value in SINK_ADDRESSES:
+        return True
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
+def import_blocklist(source, path=None, progress=None):
+    """
+    Streams a blocklist file into the hosts file in one transaction.
+
+    The feed is read line by line; only the unique new domains are kept in
+    memory (deduplicated against the current blocklist with a set), so peak
+    memory follows the number of domains added, not the size of the feed.
+    They are then written with a single apply_changes() call.
+
+    Args:
+        source (str): Path of a hosts-format, domain-list or adblock-style file.
+        path (str): Hosts file to edit; defaults to HOSTS_FILE_PATH.
+        progress (callable): Called as progress(stage, done, total), with stage
+            "parsing" (done/total in bytes) or "writing" (done/total in domains).
+
+    Returns:
+        A (success, message, ImportResult) tuple.
+    """
+    seen = set(get_index(path).entries)
+    new_domains = []
+    lines = duplicates = invalid = 0
+    try:
+        total_bytes = os.path.getsize(source)
+        with open(source, 'rb') as f:
+            for raw_line in f:
+                lines += 1
+                for field in parse_blocklist_line(raw_line.decode("utf-8", errors="replace")):
+                    domain = normalize_domain(field)
+                    if domain is None:
+                        invalid += 1
+                    elif domain in seen:
+                        duplicates += 1
+                    else:
+                        seen.add(domain)
+                        new_domains.append(domain)
+                if progress is not None and lines % IMPORT_PROGRESS_LINES == 0:
+                    progress("parsing", f.tell(), total_bytes)
+    except OSError as e:
+        return False, f"Could not read {source}: {e}", None
+    if progress is not None:
+        progress("parsing", total_bytes, total_bytes)
+    del seen
+
+    if new_domains:
+        if progress is not None:
+            progress("writing", 0, len(new_domains))
+        success, message, _ = apply_changes(block=new_domains, path=path)
+        if not success:
+            return False, message, None
+        if progress is not None:
+            progress("writing", len(new_domains), len(new_domains))
+
+    result = ImportResult(lines, len(new_domains), duplicates, invalid)
+    return True, (f"Imported {result.added} new domains from {lines} lines "
+                  f"({duplicates} duplicates, {invalid} invalid entries skipped)."), result
 
 
-def get_blocked_domains_simple():
+def get_blocked_domains_simple(path=None):
     """Returns a simple list of blocked domain names (for backward compatibility)."""
-    blocked_data = get_blocked_domains()
+    blocked_data = get_blocked_domains(path)
     return [item["domain"] if isinstance(item, dict) else item for item in blocked_data]
\ No newline at end of file
@@ -0,0 +1,350 @@
+# src/protection/policy.py
+
+import bisect
+import ipaddress
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from core import config
+from core.settings import parse_ports
+from protection import firewall_manager
+
+# Rule actions
+BLOCK = "block"
+ALERT = "alert"
+ACTIONS = (BLOCK, ALERT)
+
+# One policy decision: `rule` matched `port` on `ip`; dry_run means nothing was changed.
+PolicyAction = namedtuple("PolicyAction", "rule ip port action ttl dry_run")
+
+
+def _parse_networks(values, what):
+    if values is not None and not isinstance(values, (list, tuple)):
+        raise ValueError(f"The {what} must be a list of addresses or CIDRs, not {values!r}")
+    networks = []
+    for value in values or ():
+        try:
+            networks.append(ipaddress.ip_network(str(value).strip(), strict=False))
+        except ValueError:
+            raise ValueError(f"Invalid {what} entry: {value}")
+    return firewall_manager.collapse_ips(networks)[0]
+
+
+def _in_networks(address, networks):
+    return any(address.version == network.version and address in network for network in networks)
+
+
+class PolicyRule:
+    """
+    One declarative response rule.
+
+    A rule matches a finding (ip, port, banner) when the port is one of its
+    `ports` (any port if omitted), the banner matches its `banner` regex (if
+    given), the host is inside its `networks` (if given) and not in its
+    `allow` list. Its `action` is "block" (firewall block of the host,
+    temporary when `ttl` seconds are given) or "alert".
+    """
+    def __init__(self, name, action=BLOCK, ports=None, banner=None, networks=None, allow=None, ttl=None):
+        if action not in ACTIONS:
+            raise ValueError(f"Policy rule {name!r}: unknown action {action!r} (expected one of {', '.join(ACTIONS)})")
+        if ports is None and banner is None:
+            raise ValueError(f"Policy rule {name!r}: a rule needs ports, a banner pattern or both")
+        if ttl is not None and (isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0):
+            raise ValueError(f"Policy rule {name!r}: ttl must be a positive number of seconds, not {ttl!r}")
+        self.name = name
+        self.action = action
+        if isinstance(ports, int) and not isinstance(ports, bool):
+            ports = [ports]
+        try:
+            self.ports = frozenset(parse_ports(ports)) if ports is not None else None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Policy rule {name!r}: invalid ports {ports!r}: {e}")
+        try:
+            self.banner = re.compile(banner, re.IGNORECASE) if banner is not None else None
+        except re.error as e:
+            raise ValueError(f"Policy rule {name!r}: invalid banner pattern: {e}")
+        self.networks = _parse_networks(networks, "network")
+        self.allow = _parse_networks(allow, "allowlist")
+        self.ttl = ttl
+
+    @classmethod
+    def from_dict(cls, data, index=0):
+        """Builds a rule from its dict form, as written in config.RESPONSE_POLICY or a policy file."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Rule {index + 1} must be an object, not {data!r}")
+        data = dict(data)
+        name = data.pop("name", f"Rule {index + 1}")
+        unknown = set(data) - {"action", "ports", "banner", "networks", "allow", "ttl"}
+        if unknown:
+            raise ValueError(f"Policy rule {name!r}: unknown keys {', '.join(sorted(unknown))}")
+        return cls(name, **data)
+
+    def matches(self, address, port, banner):
+        if self.ports is not None and port not in self.ports:
+            return False
+        if self.networks and not _in_networks(address, self.networks):
+            return False
+        if self.allow and _in_networks(address, self.allow):
+            return False
+        if self.banner is not None and not self.banner.search(banner or ""):
+            return False
+        return True
+
+
+class Policy:
+    """
+    An ordered set of PolicyRules plus a global allowlist.
+
+    Rules are indexed by port, so evaluating a finding only looks at the
+    rules for that port and the port-less (banner-only) rules.
+    """
+    def __init__(self, rules, allowlist=()):
+        self.rules = list(rules)
+        self.allowlist = _parse_networks(allowlist, "allowlist")
+        self._by_port = {}
+        self._any_port = []
+        for rule in self.rules:
+            if rule.ports is None:
+                self._any_port.append(rule)
+            else:
+                for port in rule.ports:
+                    self._by_port.setdefault(port, []).append(rule)
+
+    def __len__(self):
+        return len(self.rules)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a policy from {"rules": [...], "allowlist": [...]}; raises ValueError if malformed."""
+        if not isinstance(data, dict):
+            raise ValueError('A response policy must be an object with "rules" and "allowlist"')
+        if not isinstance(data.get("rules", []), (list, tuple)):
+            raise ValueError('The "rules" of a response policy must be a list')
+        rules = [PolicyRule.from_dict(rule, index) for index, rule in enumerate(data.get("rules", []))]
+        return cls(rules, data.get("allowlist", []))
+
+    def evaluate(self, ip, port, banner=None):
+        """Returns the rules matching one finding, in policy order."""
+        candidates = self._by_port.get(port, [])
+        if self._any_port:
+            candidates = [rule for rule in self.rules if rule in candidates or rule.ports is None]
+        if not candidates:
+            return []
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return []
+        # Loopback and allowlisted hosts are never actioned
+        if address.is_loopback or _in_networks(address, self.allowlist):
+            return []
+        return [rule for rule in candidates if rule.matches(address, port, banner)]
+
+
+def load_policy(path=None):
+    """
+    Loads the response policy from a JSON file (`path` or config.POLICY_FILE)
+    or from config.RESPONSE_POLICY and config.POLICY_ALLOWLIST.
+
+    Returns:
+        A (success, message, Policy) tuple; the Policy is None if there are
+        no rules or the policy could not be loaded.
+    """
+    path = path or config.POLICY_FILE
+    try:
+        if path:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        else:
+            data = {"rules": config.RESPONSE_POLICY, "allowlist": config.POLICY_ALLOWLIST}
+        policy = Policy.from_dict(data)
+    except FileNotFoundError:
+        return False, f"Response policy file not found: {path}", None
+    except (IOError, ValueError) as e:
+        return False, f"Ignoring invalid response policy: {e}", None
+    if not policy.rules:
+        return True, "No response policy rules configured.", None
+    return True, f"Loaded {len(policy)} response policy rules.", policy
+
+
+class PolicyEngine:
+    """
+    Applies a Policy to streaming scan findings.
+
+    observe() can be called from any thread with each batch of findings; it
+    only evaluates the rules and queues the resulting actions, so it does
+    not slow the scan down. A background thread flushes the queue every
+    `flush_interval` seconds: at most `batch_size` hosts per flush, and no
+    more than `max_per_minute` per minute (a token bucket), go to the
+    ProtectionExecutor as one block request per TTL, which it applies as a
+    single firewall sync. Each host is blocked at most once while its block
+    lasts: firewall_changed() forgets the hosts whose block has expired or
+    was lifted, so a later scan that finds them exposed blocks them again.
+
+    In dry-run mode nothing is submitted; the flush reports the actions and
+    the backend commands that would have run.
+
+    on_flush(actions, summary) runs on the engine thread after each flush
+    that did something, and on_status(message) when a flush fails or queued
+    blocks are dropped on stop().
+    """
+    def __init__(self, policy, executor=None, on_flush=None, dry_run=None, batch_size=None,
+                 flush_interval=None, max_per_minute=None, backend=None, on_status=None):
+        self.policy = policy
+        self.executor = executor
+        self.on_flush = on_flush
+        self.on_status = on_status
+        self.dry_run = config.POLICY_DRY_RUN if dry_run is None else dry_run
+        if executor is None and not self.dry_run:
+            raise ValueError("A policy engine that blocks hosts needs a ProtectionExecutor")
+        self.batch_size = batch_size or config.POLICY_BATCH_SIZE
+        self.flush_interval = config.POLICY_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.max_per_minute = max_per_minute or config.POLICY_MAX_BLOCKS_PER_MINUTE
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()  # ip -> PolicyAction waiting for a flush
+        self._alerts = []
+        self._seen = {}  # ip -> names of the rules already actioned on it
+        self._blocked = set()  # Hosts queued or submitted for a block, until it ends
+        self._tokens = float(self.batch_size)
+        self._refilled = time.monotonic()
+        self.task_ids = set()  # Executor tasks submitted by this engine
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="policy-engine", daemon=True)
+        self._thread.start()
+
+    @property
+    def queued(self):
+        with self._lock:
+            return len(self._pending)
+
+    def claim(self, task_id):
+        """True if the executor task `task_id` was submitted by this engine; forgets it."""
+        with self._lock:
+            if task_id in self.task_ids:
+                self.task_ids.discard(task_id)
+                return True
+            return False
+
+    def observe(self, findings):
+        """Evaluates a batch of (ip, port, banner) findings and queues the matching actions."""
+        # The rules are read-only, so only the queueing needs the lock
+        matches = [(rule, ip, port) for ip, port, banner in findings
+                   for rule in self.policy.evaluate(ip, port, banner)]
+        if not matches:
+            return
+        with self._lock:
+            for rule, ip, port in matches:
+                seen = self._seen.setdefault(ip, set())
+                if rule.name in seen:
+                    continue
+                seen.add(rule.name)
+                action = PolicyAction(rule.name, ip, port, rule.action, rule.ttl, self.dry_run)
+                if rule.action == ALERT:
+                    self._alerts.append(action)
+                elif ip not in self._blocked:
+                    # The first matching block rule decides the TTL
+                    self._blocked.add(ip)
+                    self._pending[ip] = action
+
+    def firewall_changed(self, blocked):
+        """
+        Takes the networks the firewall blocks after a sync and forgets the
+        submitted hosts no longer among them. A host whose block task has
+        not run yet may be forgotten early; blocking it again is harmless.
+        """
+        if self.dry_run:
+            return  # Nothing was blocked; dry-run findings are reported once
+        starts = {4: [], 6: []}
+        ends = {4: [], 6: []}
+        for network in firewall_manager.collapse_ips(blocked)[0]:
+            starts[network.version].append(int(network.network_address))
+            ends[network.version].append(int(network.broadcast_address))
+        with self._lock:
+            for ip in list(self._blocked):
+                if ip in self._pending:
+                    continue
+                address = ipaddress.ip_address(ip)
+                index = bisect.bisect_right(starts[address.version], int(address)) - 1
+                if index < 0 or ends[address.version][index] < int(address):
+                    self._blocked.discard(ip)
+                    self._seen.pop(ip, None)
+
+    def stop(self):
+        """
+        Stops the flush thread and returns the number of queued blocks that
+        were dropped; they are not forced through past the rate limit.
+        """
+        self._stop.set()
+        self._thread.join(5)
+        with self._lock:
+            dropped = len(self._pending)
+            self._pending.clear()
+        if dropped:
+            self._status(f"Dropped {dropped} queued response policy blocks.")
+        return dropped
+
+    def _status(self, message):
+        if self.on_status is not None:
+            try:
+                self.on_status(message)
+            except Exception as e:
+                print(f"[!] Response policy callback failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self._status(f"Response policy flush failed: {e}")
+
+    def _take(self):
+        """Removes the next batch from the queue, within the rate limit."""
+        now = time.monotonic()
+        self._tokens = min(float(self.batch_size),
+                           self._tokens + (now - self._refilled) * self.max_per_minute / 60.0)
+        self._refilled = now
+        count = min(len(self._pending), self.batch_size, int(self._tokens))
+        batch = [self._pending.popitem(last=False)[1] for _ in range(count)]
+        self._tokens = max(0.0, self._tokens - count)
+        alerts, self._alerts = self._alerts, []
+        return batch, alerts, len(self._pending)
+
+    def flush(self):
+        """Sends the next batch of queued blocks; returns the actions reported."""
+        with self._lock:
+            batch, alerts, remaining = self._take()
+        if not batch and not alerts:
+            return []
+
+        by_ttl = OrderedDict()
+        for action in batch:
+            by_ttl.setdefault(action.ttl, []).append(action.ip)
+        if self.dry_run:
+            backend = self._backend or firewall_manager.get_backend()
+            commands = sum((backend.render_block(firewall_manager.collapse_ips(ips)[0])
+                            for ips in by_ttl.values()), [])
+            summary = f"Dry run: would block {len(batch)} hosts with {len(commands)} firewall commands"
+        else:
+            for ttl, ips in by_ttl.items():
+                # Recorded before the task is queued, so claim() knows it however soon it finishes
+                task_id = self.executor.reserve_id()
+                with self._lock:
+                    self.task_ids.add(task_id)
+                self.executor.block_ips(ips, ttl, task_id=task_id)
+            summary = f"Blocking {len(batch)} hosts"
+        if not batch:
+            summary = f"{len(alerts)} policy alerts"
+        elif alerts:
+            summary += f" and {len(alerts)} policy alerts"
+        if remaining:
+            summary += f" ({remaining} queued)"
+        actions = alerts + batch
+        if self.on_flush is not None:
+            try:
+                self.on_flush(actions, summary + ".")
+            except Exception as e:
+                print(f"[!] Response policy callback failed: {e}")
+        return actions
@@ -1,31 +1,41 @@
 import socket
-from core import config
+from core import config, metrics
+from core.resources import RESOURCE_ERRNOS, ResourceExhaustedError
 
-def grab_banner(target_ip, port):
+def grab_banner(target_ip, port, timeout=None):
     """
     Connects to a port and grabs the service banner.
 
     Args:
         target_ip (str): The IP address of the target.
         port (int): The port number to connect to.
+        timeout (float): Socket timeout in seconds; defaults to config.BANNER_TIMEOUT.
 
     Returns:
         The service banner as a string, or None if it fails.
     """
+    sock = None
     try:
-        sock = socket.socket()
-        sock.settimeout(config.BANNER_TIMEOUT)
-        sock.connect((target_ip, port))
-        # Try a simple HTTP request first; many services reply with a banner or error
-        sock.sendall(b"GET / HTTP/1.0\r\nHost: %b\r\n\r\n" % target_ip.encode())
-        banner = sock.recv(1024)
+        with metrics.BANNER_LATENCY.time():
+            sock = socket.socket()
+            sock.settimeout(timeout if timeout is not None else config.BANNER_TIMEOUT)
+            sock.connect((target_ip, port))
+            # Try a simple HTTP request first; many services reply with a banner or error
+            sock.sendall(b"GET / HTTP/1.0\r\nHost: %b\r\n\r\n" % target_ip.encode())
+            banner = sock.recv(1024)
         return banner.decode('utf-8', errors='ignore').strip() or None
     
+    except OSError as e:
+        if e.errno in RESOURCE_ERRNOS:
+            raise ResourceExhaustedError(e.errno, str(e))
+        return None
+
     except Exception as e:
         return None
     
     finally:
-        sock.close()
+        if sock is not None:
+            sock.close()
 
 
 if __name__ == "__main__":
@@ -1,36 +1,96 @@
+import errno
 import socket
-from core import config
+import time
+from core import config, metrics
+from core.resources import RESOURCE_ERRNOS, ResourceExhaustedError
 from datetime import datetime
 
-def scan_port(target_ip, port):
+# connect_ex() error codes that mean the target actively refused the connection.
+REFUSED_ERRNOS = {errno.ECONNREFUSED, 10061}  # 10061 = WSAECONNREFUSED on Windows
+
+# connect_ex() error codes returned when the socket timeout expires.
+TIMEOUT_ERRNOS = {errno.EAGAIN, errno.EWOULDBLOCK, errno.ETIMEDOUT, 10035, 10060}
+
+def probe_port(target_ip, port, timeout=None):
     """
-    Scans a single port on a target IP.
-    Returns True if the port is open, False otherwise.
+    Probes a single TCP port and classifies the result.
+
+    Args:
+        target_ip (str): The IP address of the target.
+        port (int): The port number to probe.
+        timeout (float): Connect timeout in seconds; defaults to config.TCP_TIMEOUT.
+
+    Returns:
+        "open" if the connection succeeded, "closed" if it was refused,
+        or "filtered" if there was no answer or the probe failed.
+
+    Raises:
+        ResourceExhaustedError: If the local machine ran out of descriptors,
+            ephemeral ports or buffers, so the port state is unknown.
     """
+    metrics.PROBES_SENT.inc()
+    metrics.IN_FLIGHT.inc()
+    start = time.perf_counter() if metrics.REGISTRY.enabled else 0.0
+    sock = None
     try:
         # 1. Create a new socket object using IPv4 and TCP protocols.
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         
-        # 2. Set a 1-second timeout to avoid getting stuck on a non-responsive port.
-        sock.settimeout(config.TCP_TIMEOUT)
+        # 2. Set a timeout to avoid getting stuck on a non-responsive port.
+        sock.settimeout(timeout if timeout is not None else config.TCP_TIMEOUT)
         
         # 3. Attempt to connect. connect_ex() returns 0 on success.
         result = sock.connect_ex((target_ip, port))
         
         # 4. Check the result of the connection attempt.
         if result == 0:
-            return True # Port is open
+            metrics.PORTS_OPEN.inc()
+            return "open"
+        if result in REFUSED_ERRNOS:
+            metrics.PORTS_CLOSED.inc()
+            return "closed"
+        if result in RESOURCE_ERRNOS:
+            raise ResourceExhaustedError(result, f"Local socket resources exhausted probing {target_ip}:{port}")
+        if result in TIMEOUT_ERRNOS:
+            metrics.PROBE_TIMEOUTS.inc()
+            metrics.PORTS_FILTERED.inc()
         else:
-            return False # Port is closed
+            # An error such as "host unreachable": an answer, not silence
+            metrics.PROBE_ERRORS.inc()
+        return "filtered"
             
+    except ResourceExhaustedError:
+        metrics.PROBE_ERRORS.inc()
+        raise
+
+    except socket.timeout:
+        metrics.PROBE_TIMEOUTS.inc()
+        metrics.PORTS_FILTERED.inc()
+        return "filtered"
+
     except socket.error as e:
         # Handle potential network errors gracefully.
+        metrics.PROBE_ERRORS.inc()
+        if e.errno in RESOURCE_ERRNOS:
+            # Not a property of the target: let the engine back off and retry
+            raise ResourceExhaustedError(e.errno, str(e))
         print(f"Socket error while scanning {target_ip}:{port} - {e}")
-        return False
+        return "filtered"
         
     finally:
         # 5. Ensure the socket is always closed to release resources.
-        sock.close()
+        if sock is not None:
+            sock.close()
+        metrics.IN_FLIGHT.dec()
+        if start:
+            metrics.CONNECT_LATENCY.observe(time.perf_counter() - start)
+
+def scan_port(target_ip, port, timeout=None):
+    """
+    Scans a single port on a target IP.
+    Returns True if the port is open, False otherwise.
+    """
+    return probe_port(target_ip, port, timeout) == "open"
 
 # --- Example Usage (for testing this file directly) ---
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+import asyncio
+import ipaddress
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protection import dns_sinkhole
+from protection.dns_sinkhole import DNSSinkhole, StubUpstream, build_query
+from protection.domain_trie import DomainTrie
+
+
+def rcode(response):
+    return dns_sinkhole.HEADER.unpack_from(response)[1] & 0xF
+
+
+def answer_address(response):
+    assert dns_sinkhole.HEADER.unpack_from(response)[3] == 1
+    return str(ipaddress.ip_address(response[-4:]))
+
+
+class DNSSinkholeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        loop = asyncio.get_running_loop()
+        self.stub_transport, self.stub = await loop.create_datagram_endpoint(
+            lambda: StubUpstream("192.0.2.1"), local_addr=("127.0.0.1", 0))
+        self.sinkhole = DNSSinkhole(listen=("127.0.0.1", 0),
+                                    upstream=self.stub_transport.get_extra_info("sockname")[:2],
+                                    blocklist=DomainTrie([("ads.example.com", True)]),
+                                    redirect_ip="0.0.0.0", timeout=2)
+        await self.sinkhole.start()
+
+    async def asyncTearDown(self):
+        await self.sinkhole.stop()
+        self.stub_transport.close()
+
+    async def test_blocked_names_never_reach_the_upstream(self):
+        for name in ("ads.example.com", "cdn.ads.example.com", "ADS.Example.com"):
+            response = await self.sinkhole.resolve(build_query(name, query_id=7))
+            self.assertEqual(rcode(response), dns_sinkhole.RCODE_NOERROR)
+            self.assertEqual(answer_address(response), "0.0.0.0")
+        self.assertEqual(self.stub.queries, 0)
+        self.assertEqual(self.sinkhole.stats["blocked"], 3)
+
+        self.sinkhole.block_response = "nxdomain"
+        response = await self.sinkhole.resolve(build_query("ads.example.com"))
+        self.assertEqual(rcode(response), dns_sinkhole.RCODE_NXDOMAIN)
+
+    async def test_other_names_are_forwarded_once_then_cached(self):
+        first = await self.sinkhole.resolve(build_query("www.example.com", query_id=1))
+        second = await self.sinkhole.resolve(build_query("www.example.com", query_id=2))
+        self.assertEqual(answer_address(first), "192.0.2.1")
+        self.assertEqual(answer_address(second), "192.0.2.1")
+        self.assertEqual(dns_sinkhole.HEADER.unpack_from(second)[0], 2)
+        self.assertEqual(self.stub.queries, 1)
+        self.assertEqual(self.sinkhole.stats["cached"], 1)
+
+    async def test_udp_and_tcp_clients(self):
+        loop = asyncio.get_running_loop()
+        received = loop.create_future()
+
+        class Client(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                received.set_result(data)
+
+        transport, _ = await loop.create_datagram_endpoint(Client, remote_addr=self.sinkhole.address)
+        try:
+            transport.sendto(build_query("www.example.org"))
+            self.assertEqual(answer_address(await asyncio.wait_for(received, 2)), "192.0.2.1")
+        finally:
+            transport.close()
+
+        reader, writer = await asyncio.open_connection(*self.sinkhole.address)
+        query = build_query("cdn.ads.example.com")
+        writer.write(dns_sinkhole.LENGTH_PREFIX.pack(len(query)) + query)
+        length, = dns_sinkhole.LENGTH_PREFIX.unpack(await reader.readexactly(2))
+        self.assertEqual(answer_address(await reader.readexactly(length)), "0.0.0.0")
+        writer.close()
+
+    async def test_stop_closes_idle_tcp_connections(self):
+        reader, writer = await asyncio.open_connection(*self.sinkhole.address)
+        await asyncio.sleep(0.05)  # Let the server pick the connection up
+        self.assertEqual(len(self.sinkhole._tasks), 1)
+        await asyncio.wait_for(self.sinkhole.stop(), 2)
+        self.assertEqual(self.sinkhole._tasks, set())
+        self.assertEqual(await asyncio.wait_for(reader.read(), 2), b"")
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protection.domain_trie import DomainTrie
+
+
+class DomainTrieTest(unittest.TestCase):
+    def test_empty_label_does_not_collide_with_stored_values(self):
+        trie = DomainTrie([("com", 1), ("b.com", 2)])
+        trie.add("a..com", 5)
+        self.assertEqual(sorted(trie), ["a..com", "b.com", "com"])
+        self.assertEqual(len(trie), 3)
+        self.assertEqual(trie.get("com"), 1)
+        self.assertEqual(trie.get("a..com"), 5)
+        self.assertEqual(sorted(trie.expand("*.com")), [("a..com", 5), ("b.com", 2)])
+
+        self.assertTrue(trie.discard("a..com"))
+        self.assertEqual(sorted(trie), ["b.com", "com"])
+        self.assertEqual(trie.covering("x.b.com"), ("b.com", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protection import executor, firewall_manager
+from protection.expiry import TimedBlocks
+
+
+class ProtectionExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.hosts = os.path.join(self.directory, "hosts")
+        with open(self.hosts, 'w') as f:
+            f.write("127.0.0.1 localhost\n")
+        self.results = {}
+        self.finished = threading.Condition()
+        timed = TimedBlocks(path=os.path.join(self.directory, "timed_blocks.json"), tick=0.1)
+        self.firewall = firewall_manager.FirewallState(
+            firewall_manager.NftablesBackend(runner=firewall_manager.DryRunRunner()))
+        self.executor = executor.ProtectionExecutor(on_finished=self._on_finished, hosts_path=self.hosts,
+                                                    firewall_state=self.firewall, timed_blocks=timed,
+                                                    coalesce_window=0.01)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def _on_finished(self, result):
+        with self.finished:
+            self.results[result.task_id] = result
+            self.finished.notify_all()
+
+    def wait_for(self, predicate, timeout=5):
+        with self.finished:
+            self.assertTrue(self.finished.wait_for(predicate, timeout))
+
+    def wait_result(self, task_id):
+        self.wait_for(lambda: task_id in self.results)
+        return self.results[task_id]
+
+    def hosts_text(self):
+        with open(self.hosts) as f:
+            return f.read()
+
+    def test_block_unblock_expire(self):
+        block = self.executor.block_domains(["a.com", "b.com"])
+        self.assertTrue(self.wait_result(block).success)
+
+        # An unblock running as the first task of its own batch
+        unblock = self.executor.unblock_domains(["a.com"])
+        result = self.wait_result(unblock)
+        self.assertTrue(result.success, result.message)
+        self.assertNotIn("a.com", self.hosts_text())
+        self.assertIn("b.com", self.hosts_text())
+
+        timed = self.executor.block_domains(["c.com"], ttl=0.2)
+        self.assertTrue(self.wait_result(timed).success)
+        self.assertIn("c.com", self.hosts_text())
+        self.wait_for(lambda: any(r.kind == executor.EXPIRE_DOMAINS for r in self.results.values()))
+        self.assertNotIn("c.com", self.hosts_text())
+        self.assertIn("b.com", self.hosts_text())
+
+    def test_unblock_after_block_in_one_batch(self):
+        block = self.executor.block_domains(["a.com"])
+        unblock = self.executor.unblock_domains(["*.example.com", "a.com"])
+        self.assertTrue(self.wait_result(block).success)
+        self.assertTrue(self.wait_result(unblock).success)
+        self.assertNotIn("a.com", self.hosts_text())
+
+    def test_permanent_range_outlives_covered_temporary_block(self):
+        timed = self.executor.block_ips(["10.0.0.5"], ttl=0.3)
+        self.assertTrue(self.wait_result(timed).success)
+        permanent = self.executor.block_ips(["10.0.0.0/24"])
+        self.assertTrue(self.wait_result(permanent).success)
+
+        time.sleep(0.6)
+        self.executor.refresh_blocklist()  # Anything queued wakes the executor past the deadline
+        time.sleep(0.3)
+        self.assertFalse(any(r.kind == executor.EXPIRE_IPS for r in self.results.values()))
+        self.assertTrue(self.firewall.is_blocked("10.0.0.0/24"))
+        self.assertEqual(len(self.executor.timed), 0)
+
+    def test_expiry_keeps_addresses_of_a_permanent_block_inside(self):
+        timed = self.executor.block_ips(["10.0.0.0/24"], ttl=0.3)
+        self.assertTrue(self.wait_result(timed).success)
+        permanent = self.executor.block_ips(["10.0.0.5"])
+        self.assertTrue(self.wait_result(permanent).success)
+
+        self.wait_for(lambda: any(r.kind == executor.EXPIRE_IPS for r in self.results.values()))
+        self.assertTrue(self.firewall.is_blocked("10.0.0.5"))
+        self.assertFalse(self.firewall.is_blocked("10.0.0.4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import ipaddress
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protection import firewall_manager
+from protection.firewall_manager import DryRunRunner, FirewallState, NetshBackend, NftablesBackend
+
+# `netsh advfirewall firewall show rule name=all dir=in` on a German Windows
+GERMAN_RULES = """
+Regelname:                            Core Networking - DHCP (DHCP-In)
+----------------------------------------------------------------------
+Aktiviert:                            Ja
+Richtung:                             Eingehend
+Lokale IP:                            Beliebig
+Remote-IP:                            Beliebig
+Aktion:                               Zulassen
+
+Regelname:                            DoormaNet-Block-20240101120000-1
+----------------------------------------------------------------------
+Aktiviert:                            Ja
+Richtung:                             Eingehend
+Profile:                              Domäne,Privat,Öffentlich
+Lokale IP:                            Beliebig
+Remote-IP:                            10.0.0.1/32,10.0.1.0/255.255.255.0
+Protokoll:                            Beliebig
+Aktion:                               Blockieren
+
+Regelname:                            DoormaNet-Block-192.168.1.7
+----------------------------------------------------------------------
+Aktiviert:                            Ja
+Richtung:                             Eingehend
+Lokale IP:                            Beliebig
+Remote-IP:                            192.168.1.7/32
+Aktion:                               Blockieren
+"""
+
+
+class LocalizedNetsh(DryRunRunner):
+    """Records the commands like DryRunRunner, but answers in German."""
+    def __init__(self, rules="", returncode=0):
+        super().__init__()
+        self.rules = rules
+        self.returncode = returncode
+
+    def __call__(self, args):
+        returncode, output = super().__call__(args)
+        if "-f" not in args:
+            return 0, self.rules
+        return self.returncode, output.replace("Ok.", "OK.") if self.returncode == 0 else "Fehler."
+
+
+def networks(*values):
+    return [ipaddress.ip_network(value) for value in values]
+
+
+class NetshBackendTest(unittest.TestCase):
+    def test_load_localized_rules(self):
+        state = FirewallState(NetshBackend(runner=LocalizedNetsh(GERMAN_RULES)))
+        self.assertEqual(state.rules(), {
+            "DoormaNet-Block-20240101120000-1": networks("10.0.0.1/32", "10.0.1.0/24"),
+            "DoormaNet-Block-192.168.1.7": networks("192.168.1.7/32"),
+        })
+
+    def test_sync_rewrites_only_the_rules_that_change(self):
+        runner = LocalizedNetsh(GERMAN_RULES)
+        state = FirewallState(NetshBackend(runner=runner))
+        desired = networks("10.0.1.0/24", "192.168.1.7/32", "172.16.0.5/32")
+        success, message, result = state.sync(desired)
+        self.assertTrue(success, message)
+        self.assertEqual(result.added, networks("172.16.0.5/32"))
+        self.assertEqual(result.removed, networks("10.0.0.1/32"))
+        # The packed rule holding the removed address is rebuilt; the per-IP rule stays
+        self.assertIn("advfirewall firewall delete rule name=DoormaNet-Block-20240101120000-1",
+                      runner.commands)
+        self.assertFalse(any("192.168.1.7" in command for command in runner.commands))
+        self.assertEqual(firewall_manager.collapse_ips(state.blocked())[0],
+                         firewall_manager.collapse_ips(desired)[0])
+
+        # Nothing left to change: no netsh run at all
+        runs = len(runner.invocations)
+        self.assertTrue(state.sync(desired)[0])
+        self.assertEqual(len(runner.invocations), runs)
+
+    def test_block_ips_packs_one_script(self):
+        runner = LocalizedNetsh()
+        ips = [f"10.1.{i // 256}.{i % 256}" for i in range(0, 1024, 2)]
+        success, message, batch = firewall_manager.block_ips(ips, runner=runner, max_length=200,
+                                                             backend=NetshBackend(runner=runner))
+        self.assertTrue(success, message)
+        self.assertEqual(len(batch.networks), len(ips))
+        self.assertEqual(sum(1 for args in runner.invocations if "-f" in args), 1)
+        self.assertEqual(len(runner.commands), len(batch.rules))
+        self.assertTrue(all(len(remoteip) <= 200 for _, remoteip in batch.rules))
+
+    def test_failed_script_drops_the_cache(self):
+        runner = LocalizedNetsh(GERMAN_RULES, returncode=1)
+        state = FirewallState(NetshBackend(runner=runner))
+        success, message, _ = state.sync(networks("10.9.9.9/32"))
+        self.assertFalse(success)
+        self.assertIn("Fehler.", message)
+        self.assertIsNone(state._rules)
+
+
+class NftTable(DryRunRunner):
+    """Records the commands like DryRunRunner, answering `nft -j list` with `elements`."""
+    def __init__(self, elements=None):
+        super().__init__()
+        self.elements = elements
+
+    def __call__(self, args):
+        if "-j" in args and self.elements is not None:
+            sets = [{"set": {"name": name, "elem": elem}} for name, elem in self.elements.items()]
+            return 0, json.dumps({"nftables": sets})
+        return super().__call__(args)
+
+
+class NftablesBackendTest(unittest.TestCase):
+    def test_missing_table_is_empty(self):
+        runner = lambda args: (1, "Error: No such file or directory; did you mean table 'filter'?")
+        self.assertEqual(NftablesBackend(runner=runner).load(), {})
+
+    def test_load_elements(self):
+        runner = NftTable({"blocked_v4": ["10.0.0.1", {"prefix": {"addr": "10.0.1.0", "len": 24}},
+                                          {"range": ["10.0.2.0", "10.0.2.255"]}],
+                           "blocked_v6": [{"elem": {"val": "2001:db8::1"}}]})
+        self.assertEqual(NftablesBackend(runner=runner).load(), {
+            "blocked_v4": networks("10.0.0.1/32", "10.0.1.0/24", "10.0.2.0/24"),
+            "blocked_v6": networks("2001:db8::1/128"),
+        })
+
+    def test_sync_adds_only_missing_elements(self):
+        runner = NftTable({"blocked_v4": ["10.0.0.1"]})
+        state = FirewallState(NftablesBackend(runner=runner, table="test"))
+        success, message, result = state.sync(networks("10.0.0.1/32", "10.0.0.2/32", "2001:db8::/64"))
+        self.assertTrue(success, message)
+        self.assertEqual(result.added, networks("10.0.0.2/32", "2001:db8::/64"))
+        self.assertEqual(result.removed, [])
+        # One atomic script: the base declarations plus the new elements only
+        self.assertEqual(sum(1 for args in runner.invocations if "-f" in args), 1)
+        self.assertEqual(runner.commands[:len(state.backend.render_base())], state.backend.render_base())
+        self.assertIn("add element inet test blocked_v4 { 10.0.0.2 }", runner.commands)
+        self.assertIn("add element inet test blocked_v6 { 2001:db8::/64 }", runner.commands)
+        self.assertFalse(any("flush set" in command for command in runner.commands))
+
+    def test_sync_removal_refills_the_set(self):
+        runner = NftTable({"blocked_v4": ["10.0.0.1", "10.0.0.2"]})
+        state = FirewallState(NftablesBackend(runner=runner, table="test"))
+        success, message, result = state.sync(networks("10.0.0.2/32"))
+        self.assertTrue(success, message)
+        self.assertEqual(result.removed, networks("10.0.0.1/32"))
+        self.assertEqual(runner.commands[-2:], ["flush set inet test blocked_v4",
+                                                "add element inet test blocked_v4 { 10.0.0.2 }"])
+        # The untouched (empty) IPv6 set is neither rewritten nor reported
+        self.assertEqual([name for name, _ in result.rules], ["blocked_v4"])
+
+    def test_dry_run_renders_without_running(self):
+        runner = NftTable({})
+        state = FirewallState(NftablesBackend(runner=runner, table="test"))
+        success, message, result = state.sync(networks("10.0.0.0/24"), dry_run=True)
+        self.assertTrue(success, message)
+        self.assertIn("add element inet test blocked_v4 { 10.0.0.0/24 }", result.commands)
+        self.assertEqual(runner.commands, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
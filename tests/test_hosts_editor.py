@@ -0,0 +1,98 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protection import hosts_editor
+
+HOSTS = """127.0.0.1 localhost
+::1 localhost ip6-localhost
+192.168.1.10 nas.lan  # my NAS"""
+
+
+class HostsEditorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.hosts = os.path.join(self.directory, "hosts")
+        with open(self.hosts, 'w') as f:
+            f.write(HOSTS)  # No trailing newline, as some editors leave it
+
+    def hosts_lines(self):
+        with open(self.hosts) as f:
+            return f.read().splitlines()
+
+    def test_apply_changes_in_one_transaction(self):
+        success, message, result = hosts_editor.apply_changes(block=["a.com", "B.com", "b.com"],
+                                                              path=self.hosts)
+        self.assertTrue(success, message)
+        self.assertEqual(result.blocked, ["a.com", "B.com"])
+        self.assertEqual(result.already_blocked, ["b.com"])
+        lines = self.hosts_lines()
+        self.assertEqual(lines[:3], HOSTS.splitlines())
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[3].startswith(f"{hosts_editor.config.HOSTS_REDIRECT_IP}\ta.com\t"))
+
+        success, message, result = hosts_editor.apply_changes(block=["c.com"], unblock=["A.COM", "x.com"],
+                                                              path=self.hosts)
+        self.assertTrue(success, message)
+        self.assertEqual(result.blocked, ["c.com"])
+        self.assertEqual(result.unblocked, ["a.com"])
+        self.assertEqual(result.not_found, ["x.com"])
+        self.assertEqual(sorted(hosts_editor.get_blocked_domains_simple(self.hosts)), ["B.com", "c.com"])
+        # Only the hosts file is left in the directory: the temp file was renamed over it
+        self.assertEqual(os.listdir(self.directory), ["hosts"])
+
+    def test_nothing_to_change_leaves_the_file_alone(self):
+        before = os.stat(self.hosts).st_mtime_ns
+        success, _, result = hosts_editor.apply_changes(unblock=["a.com"], path=self.hosts)
+        self.assertTrue(success)
+        self.assertEqual(result.not_found, ["a.com"])
+        self.assertEqual(os.stat(self.hosts).st_mtime_ns, before)
+
+    def test_clear_and_wildcard_unblock(self):
+        hosts_editor.apply_changes(block=["ads.example.com", "cdn.example.com", "other.net"], path=self.hosts)
+        success, message = hosts_editor.unblock_domain("*.example.com", path=self.hosts)
+        self.assertTrue(success, message)
+        self.assertEqual(hosts_editor.get_blocked_domains_simple(self.hosts), ["other.net"])
+
+        success, _, result = hosts_editor.clear_all_blocks(path=self.hosts)
+        self.assertTrue(success)
+        self.assertEqual(result.unblocked, ["other.net"])
+        self.assertEqual(self.hosts_lines(), HOSTS.splitlines())
+
+    def test_import_blocklist(self):
+        hosts_editor.apply_changes(block=["known.com"], path=self.hosts)
+        feed = os.path.join(self.directory, "feed.txt")
+        with open(feed, 'w') as f:
+            f.write("# A mixed feed\n"
+                    "0.0.0.0 ads.example.com tracker.example.com\n"
+                    "||Pixel.Example.org^\n"
+                    "known.com\n"
+                    "ads.example.com\n"
+                    "localhost\n"
+                    "not_a-domain-\n"
+                    "http://cdn.bad.net/path\n")
+        stages = []
+        success, message, result = hosts_editor.import_blocklist(
+            feed, path=self.hosts, progress=lambda stage, done, total: stages.append((stage, done, total)))
+        self.assertTrue(success, message)
+        self.assertEqual(result, hosts_editor.ImportResult(lines=8, added=4, duplicates=2, invalid=2))
+        self.assertEqual(sorted(hosts_editor.get_blocked_domains_simple(self.hosts)),
+                         ["ads.example.com", "cdn.bad.net", "known.com", "pixel.example.org",
+                          "tracker.example.com"])
+        self.assertEqual(stages[-2:], [("writing", 0, 4), ("writing", 4, 4)])
+        self.assertEqual(sorted(os.listdir(self.directory)), ["feed.txt", "hosts"])
+
+    def test_import_missing_file(self):
+        success, message, result = hosts_editor.import_blocklist(os.path.join(self.directory, "missing"),
+                                                                 path=self.hosts)
+        self.assertFalse(success)
+        self.assertIsNone(result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.metrics import MetricsRegistry
+
+
+class MetricsWindowTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry(enabled=True)
+        self.probes = self.registry.counter("probes_total", "Probes.")
+        self.in_flight = self.registry.gauge("in_flight", "Sockets.")
+        self.latency = self.registry.histogram("latency_seconds", "Latency.")
+
+    def test_a_new_scan_does_not_reset_a_running_one(self):
+        first = self.registry.window()
+        self.probes.inc(3)
+        self.latency.observe(0.02)
+        with self.registry.stage("port_scan"):
+            pass
+
+        second = self.registry.window()
+        self.probes.inc(2)
+        self.latency.observe(2.0)
+
+        self.assertEqual(self.probes.value, 5)  # Cumulative, as exported
+        self.assertEqual(first.count(self.probes), 5)
+        self.assertEqual(second.count(self.probes), 2)
+        self.assertEqual(first.histogram(self.latency).count, 2)
+        self.assertEqual(second.histogram(self.latency).quantile(0.5), 2.0)
+        self.assertIn("port_scan", first.stage_seconds())
+        self.assertEqual(second.stage_seconds(), {})
+        self.assertIn("probes_total 5", self.registry.render_prometheus())
+
+    def test_gauge_peaks_per_window(self):
+        self.in_flight.inc(10)
+        self.in_flight.dec(10)
+        window = self.registry.window()
+        self.in_flight.inc(4)
+        self.in_flight.dec(4)
+        self.assertEqual(window.peak(self.in_flight), 4)
+        self.assertEqual(self.in_flight.peak, 10)
+
+        window.close()
+        self.in_flight.inc(7)
+        self.assertEqual(window.peak(self.in_flight), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
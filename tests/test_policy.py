@@ -0,0 +1,115 @@
+import ipaddress
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protection.policy import Policy, PolicyEngine, load_policy
+
+
+class FakeExecutor:
+    def __init__(self, on_submit=None):
+        self.blocked = []
+        self.ids = iter(range(1, 1000))
+        self.on_submit = on_submit
+
+    def reserve_id(self):
+        return next(self.ids)
+
+    def block_ips(self, ips, ttl=None, task_id=None):
+        self.blocked.append(list(ips))
+        if self.on_submit is not None:
+            self.on_submit(task_id)
+        return task_id
+
+
+class PolicyTest(unittest.TestCase):
+    def test_malformed_policies_raise_value_error(self):
+        for data in ([], {"rules": "x"}, {"rules": ["x"]},
+                     {"rules": [{"ports": "23", "ttl": "60"}]},
+                     {"rules": [{"ports": "23", "ttl": -1}]},
+                     {"rules": [{"ports": {"a": 1}}]},
+                     {"rules": [{"ports": 23}], "allowlist": 5}):
+            with self.assertRaises(ValueError, msg=data):
+                Policy.from_dict(data)
+
+    def test_int_ports(self):
+        policy = Policy.from_dict({"rules": [{"ports": 23}], "allowlist": ["10.0.0.9"]})
+        self.assertEqual(len(policy.evaluate("10.0.0.1", 23)), 1)
+        self.assertEqual(policy.evaluate("10.0.0.9", 23), [])
+        self.assertEqual(policy.evaluate("10.0.0.1", 22), [])
+
+    def test_host_blocked_again_after_its_block_ends(self):
+        executor = FakeExecutor()
+        engine = PolicyEngine(Policy.from_dict({"rules": [{"ports": 23}]}), executor,
+                              dry_run=False, flush_interval=60)
+        try:
+            engine.observe([("10.0.0.5", 23, "")])
+            engine.flush()
+            engine.observe([("10.0.0.5", 23, "")])
+            engine.flush()
+            self.assertEqual(executor.blocked, [["10.0.0.5"]])
+
+            # Still blocked: nothing is forgotten
+            engine.firewall_changed([ipaddress.ip_network("10.0.0.0/24")])
+            engine.observe([("10.0.0.5", 23, "")])
+            engine.flush()
+            self.assertEqual(len(executor.blocked), 1)
+
+            # The block expired or was lifted: the next finding blocks it again
+            engine.firewall_changed([])
+            engine.observe([("10.0.0.5", 23, "")])
+            engine.flush()
+            self.assertEqual(executor.blocked, [["10.0.0.5"], ["10.0.0.5"]])
+        finally:
+            engine.stop()
+
+    def test_task_finishing_before_flush_returns_is_claimed(self):
+        claimed = []
+        executor = FakeExecutor()
+        engine = PolicyEngine(Policy.from_dict({"rules": [{"ports": 23}]}), executor,
+                              dry_run=False, flush_interval=60)
+        # The executor finishes the task before block_ips() even returns
+        executor.on_submit = lambda task_id: claimed.append(engine.claim(task_id))
+        try:
+            engine.observe([("10.0.0.5", 23, "")])
+            engine.flush()
+            self.assertEqual(claimed, [True])
+            self.assertEqual(engine.task_ids, set())
+        finally:
+            engine.stop()
+
+    def test_stop_reports_dropped_blocks(self):
+        messages = []
+        engine = PolicyEngine(Policy.from_dict({"rules": [{"ports": 23}]}), FakeExecutor(),
+                              dry_run=False, flush_interval=60, on_status=messages.append)
+        engine.observe([("10.0.0.5", 23, ""), ("10.0.0.6", 23, "")])
+        self.assertEqual(engine.stop(), 2)
+        self.assertEqual(messages, ["Dropped 2 queued response policy blocks."])
+
+    def test_load_policy(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "policy.json")
+        with open(path, 'w') as f:
+            json.dump({"rules": [{"ports": [23, 2323], "ttl": 3600}]}, f)
+        success, message, policy = load_policy(path)
+        self.assertTrue(success, message)
+        self.assertEqual(len(policy), 1)
+
+        with open(path, 'w') as f:
+            json.dump({"rules": [{"ports": 23, "action": "nuke"}]}, f)
+        success, message, policy = load_policy(path)
+        self.assertFalse(success)
+        self.assertIn("nuke", message)
+        self.assertIsNone(policy)
+
+        success, message, policy = load_policy(os.path.join(directory, "missing.json"))
+        self.assertFalse(success)
+        self.assertIsNone(policy)
+
+
+if __name__ == "__main__":
+    unittest.main()